@@ -0,0 +1,388 @@
+"""
+Microbenchmarks of the Python side of every public `Health` method, sync and async.
+
+Calls go to a `FakeHealthBackend` with no latency, so the timings measure what runs in Python:
+argument building and validation, payload encoding, result decoding (plus the fake's own
+request parsing; read responses are generated once per case and reused).
+
+Each case runs in a separate process so its peak RSS can be reported.
+
+Usage:
+    python benchmarks/bench_health.py                       # sizes 1, 1k and 100k
+    python benchmarks/bench_health.py --sizes all           # adds 1M points (several GB of RAM)
+    python benchmarks/bench_health.py -k get_health_data    # only the cases matching a regex
+    python benchmarks/bench_health.py --save main           # stores benchmarks/baselines/main.json
+    python benchmarks/bench_health.py --compare main        # diffs against a stored baseline
+"""
+
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from pathlib import Path
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional, Any, List, Dict, Tuple, Callable, NamedTuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from flet_health import (  # noqa: E402
+    Health,
+    HealthDataTypeAndroid,
+    HealthWorkoutActivityType,
+    HealthDataRecord,
+    HealthReadQuery,
+    MealType,
+    MenstrualFlow,
+    FakeHealthBackend,
+)
+from flet_health.health_data_types import InsulinDeliveryReason  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+SIZES = (1, 1_000, 100_000, 1_000_000)
+DEFAULT_SIZES = (1, 1_000, 100_000)
+BASELINES = Path(__file__).resolve().parent / "baselines"
+
+START = datetime(2024, 1, 1)
+STEPS = HealthDataTypeAndroid.STEPS
+HEART_RATE = HealthDataTypeAndroid.HEART_RATE
+
+
+class _Backend(FakeHealthBackend):
+    """Fake backend generating each read response once and discarding writes, so repeated runs stay comparable."""
+
+    def __init__(self, **kwargs):
+        super().__init__(sample_interval=timedelta(seconds=1), **kwargs)
+        self.calls = deque(maxlen=16)
+        self._responses: Dict[str, str] = {}
+
+    def _get_health_data(self, data: dict) -> str:
+        key = json.dumps(data, sort_keys=True)
+        if key not in self._responses:
+            self._responses[key] = super()._get_health_data(data)
+        return self._responses[key]
+
+    def _store(self, *args, **kwargs) -> None:
+        pass
+
+
+class Context(NamedTuple):
+    health: Health
+    size: int
+    start: datetime
+    end: datetime  # `size` points of a single type lie in [start, end)
+    points: List[dict]
+
+
+class Case(NamedTuple):
+    """
+    A benchmark case. `args` builds the positional and keyword arguments of `method` (and of
+    `method + "_async"`) once per case; `run` replaces the method call for cases needing more.
+    """
+
+    name: str
+    method: Optional[str] = None
+    args: Optional[Callable[[Context], Tuple[tuple, dict]]] = None
+    run: Optional[Callable[[Context], Any]] = None
+    is_async: bool = False
+    sized: bool = False
+    platform: str = "android"
+    needs_points: bool = False
+
+
+def _window(ctx: Context) -> tuple:
+    return [STEPS], ctx.start, ctx.end
+
+
+def _records(ctx: Context) -> List[HealthDataRecord]:
+    return [HealthDataRecord(value=i, start_time=ctx.start, end_time=ctx.start, types=STEPS) for i in range(ctx.size)]
+
+
+async def _iter_health_data(ctx: Context) -> int:
+    count = 0
+    async for _ in ctx.health.iter_health_data([STEPS], ctx.start, ctx.end):
+        count += 1
+    return count
+
+
+async def _gather_reads(ctx: Context) -> Dict:
+    middle = ctx.start + (ctx.end - ctx.start) / 2
+    queries = [HealthReadQuery([STEPS], ctx.start, middle), HealthReadQuery([HEART_RATE], middle, ctx.end)]
+    return await ctx.health.gather_reads(queries)
+
+
+def _batch(ctx: Context) -> None:
+    with ctx.health.batch() as batch:
+        for i in range(ctx.size):
+            batch.has_permissions([STEPS])
+
+
+async def _batch_async(ctx: Context) -> None:
+    async with ctx.health.batch() as batch:
+        for i in range(ctx.size):
+            batch.has_permissions([STEPS])
+
+
+def _write_behind(ctx: Context) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        queue = ctx.health.write_behind(str(Path(directory) / "journal.jsonl"), max_batch=max(ctx.size, 1), flush_interval=60)
+        for i in range(ctx.size):
+            queue.write_health_data(i, ctx.start, ctx.start, STEPS)
+        queue.close()
+
+
+# Methods with a `_async` twin get a sync and an async case each.
+_METHODS: List[Case] = [
+    Case("has_permissions", args=lambda c: (([STEPS, HEART_RATE],), {})),
+    Case("request_authorization", args=lambda c: (([STEPS, HEART_RATE],), {})),
+    Case("prefetch_permissions", args=lambda c: (([STEPS, HEART_RATE],), {})),
+    Case("is_health_connect_available", args=lambda c: ((), {})),
+    Case("is_health_data_history_available", args=lambda c: ((), {})),
+    Case("is_health_data_history_authorized", args=lambda c: ((), {})),
+    Case("is_health_data_in_background_available", args=lambda c: ((), {})),
+    Case("request_health_data_history_authorization", args=lambda c: ((), {})),
+    Case("request_health_data_in_background_authorization", args=lambda c: ((), {})),
+    Case("get_health_connect_sdk_status", args=lambda c: ((), {})),
+    Case("get_total_steps_in_interval", args=lambda c: ((c.start, c.end), {}), sized=True),
+    Case("get_health_data_from_types", args=lambda c: (_window(c), {}), sized=True),
+    Case("get_health_data_from_types[as_points]", args=lambda c: (_window(c), {"as_points": True}), sized=True),
+    Case("get_health_data_from_types[columnar]", args=lambda c: (_window(c), {"wire_format": "columnar", "as_series": True}), sized=True),
+    Case("get_health_interval_data_from_types", args=lambda c: ((c.start, c.end, [STEPS], 60), {}), sized=True),
+    Case("get_health_aggregate_data_from_types", args=lambda c: (_window(c), {}), sized=True),
+    Case("write_health_data", args=lambda c: ((1, c.start, c.start, STEPS), {})),
+    Case("write_health_data_many", args=lambda c: ((_records(c),), {}), sized=True),
+    Case("write_blood_oxygen", args=lambda c: ((0.97, c.start, c.start), {})),
+    Case("write_blood_pressure", args=lambda c: ((120, 80, c.start), {})),
+    Case("write_workout_data", args=lambda c: ((HealthWorkoutActivityType.RUNNING, c.start, c.end), {"total_distance": 5000})),
+    Case("write_meal", args=lambda c: ((MealType.LUNCH, c.start, c.end), {"calories_consumed": 600, "protein": 30, "name": "Lunch"})),
+    Case("write_menstruation_flow", args=lambda c: ((MenstrualFlow.LIGHT, c.start, c.end, True), {})),
+    Case("write_audiogram", args=lambda c: (([1000.0, 2000.0], [10.0, 12.0], [11.0, 13.0], c.start, c.end), {}), platform="ios"),
+    Case("write_insulin_delivery", args=lambda c: ((2.5, InsulinDeliveryReason.BOLUS, c.start, c.end), {}), platform="ios"),
+    Case("remove_duplicates", args=lambda c: ((c.points + c.points,), {}), sized=True, needs_points=True),
+    Case("remove_duplicates[native]", args=lambda c: ((c.points + c.points,), {"local": False}), sized=True, needs_points=True),
+    Case("delete", args=lambda c: ((STEPS, c.start, c.end), {})),
+    Case("delete_by_uuid", args=lambda c: (("STEPS-0", STEPS), {})),
+    Case("invoke_batch", args=lambda c: (([("has_permissions", {"data": '{"types": ["STEPS"]}'})] * c.size,), {}), sized=True),
+]
+
+
+def _twins(case: Case) -> List[Case]:
+    base, _, variant = case.name.partition("[")
+    suffix = f"[{variant}" if variant else ""
+    method = case.method or base
+    return [
+        case._replace(method=method),
+        case._replace(name=f"{base}_async{suffix}", method=f"{method}_async", is_async=True),
+    ]
+
+
+CASES: List[Case] = [twin for case in _METHODS for twin in _twins(case)]
+
+CASES += [
+    Case("install_health_connect", method="install_health_connect", args=lambda c: ((), {})),
+    Case("revoke_permissions", method="revoke_permissions", args=lambda c: ((), {})),
+    Case("metrics", method="metrics", args=lambda c: ((), {})),
+    Case("batch", run=_batch, sized=True),
+    Case("batch_async", run=_batch_async, is_async=True, sized=True),
+    Case("write_behind", run=_write_behind, sized=True),
+    Case("iter_health_data", run=_iter_health_data, is_async=True, sized=True),
+    Case("gather_reads", run=_gather_reads, is_async=True, sized=True),
+]
+
+
+def _context(case: Case, size: int) -> Context:
+    backend = _Backend(platform=case.platform)
+    health = backend.attach(Health())
+    end = START + timedelta(seconds=size)
+    points = backend.points([STEPS], int(START.timestamp() * 1000), int(end.timestamp() * 1000)) if case.needs_points else []
+    return Context(health, size, START, end, points)
+
+
+def _peak_rss() -> Optional[int]:
+    """Peak resident set size of this process, in bytes."""
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _percentile(timings: List[float], q: float) -> float:
+    return timings[min(len(timings) - 1, int(q * len(timings)))]
+
+
+def measure(case: Case, size: int, min_time: float, min_runs: int, max_runs: int) -> Dict[str, Any]:
+    """Runs one case repeatedly in this process and returns its statistics."""
+
+    ctx = _context(case, size)
+
+    if case.run is not None:
+        call = lambda: case.run(ctx)  # noqa: E731
+    else:
+        args, kwargs = case.args(ctx)
+        method = getattr(ctx.health, case.method)
+        call = lambda: method(*args, **kwargs)  # noqa: E731
+
+    timings: List[float] = []
+    rss_before = _peak_rss()
+
+    def done(started: float) -> bool:
+        runs = len(timings)
+        return runs >= max_runs or (runs >= min_runs and time.perf_counter() - started >= min_time)
+
+    if case.is_async:
+        async def loop():
+            await call()  # warm-up
+            started = time.perf_counter()
+            while not done(started):
+                t = time.perf_counter()
+                await call()
+                timings.append(time.perf_counter() - t)
+
+        asyncio.run(loop())
+    else:
+        call()  # warm-up
+        started = time.perf_counter()
+        while not done(started):
+            t = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - t)
+
+    timings.sort()
+    peak = _peak_rss()
+
+    return {
+        "case": case.name,
+        "size": size,
+        "runs": len(timings),
+        "ops_per_sec": len(timings) / sum(timings) if sum(timings) else None,
+        "p50_ms": _percentile(timings, 0.5) * 1e3,
+        "p99_ms": _percentile(timings, 0.99) * 1e3,
+        "peak_rss_mb": peak / 2 ** 20 if peak is not None else None,
+        "rss_growth_mb": (peak - rss_before) / 2 ** 20 if peak is not None else None,
+    }
+
+
+def run_isolated(case: Case, size: int, options: argparse.Namespace) -> Dict[str, Any]:
+    command = [
+        sys.executable, __file__, "--child", case.name, str(size),
+        "--min-time", str(options.min_time), "--min-runs", str(options.min_runs), "--max-runs", str(options.max_runs),
+    ]
+    process = subprocess.run(command, capture_output=True, text=True)
+
+    if process.returncode != 0:
+        lines = process.stderr.strip().splitlines()
+        return {"case": case.name, "size": size, "error": lines[-1] if lines else f"exit code {process.returncode}"}
+
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def _key(result: Dict[str, Any]) -> str:
+    return f"{result['case']}[{result['size']}]"
+
+
+def _format(value: Optional[float], digits: int = 3) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def report(results: List[Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]] = None, threshold: float = 0.1) -> int:
+    """Prints the results, with the change from `baseline`. Returns the number of regressions."""
+
+    header = f"{'case':<56} {'size':>8} {'runs':>6} {'ops/s':>12} {'p50 ms':>10} {'p99 ms':>10} {'peak MB':>8}"
+    if baseline is not None:
+        header += f" {'p50 vs base':>12}"
+    print(header)
+
+    regressions = 0
+    for result in results:
+        if "error" in result:
+            print(f"{result['case']:<56} {result['size']:>8} error: {result['error']}")
+            continue
+
+        line = (
+            f"{result['case']:<56} {result['size']:>8} {result['runs']:>6} {_format(result['ops_per_sec'], 1):>12} "
+            f"{_format(result['p50_ms']):>10} {_format(result['p99_ms']):>10} {_format(result['peak_rss_mb'], 1):>8}"
+        )
+
+        base = (baseline or {}).get(_key(result))
+        if base is not None and "error" not in base and base["p50_ms"]:
+            change = result["p50_ms"] / base["p50_ms"] - 1
+            line += f" {change:>+11.1%}"
+            if change > threshold:
+                line += "  REGRESSION"
+                regressions += 1
+
+        print(line)
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", "--filter", help="Only run the cases whose name matches this regular expression.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma separated point counts, or 'all'.")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum measuring time of a case, in seconds.")
+    parser.add_argument("--min-runs", type=int, default=3)
+    parser.add_argument("--max-runs", type=int, default=10_000)
+    parser.add_argument("--in-process", action="store_true", help="Run every case in this process (no per-case peak RSS).")
+    parser.add_argument("--save", metavar="NAME", help="Store the results as a baseline.")
+    parser.add_argument("--compare", metavar="NAME", help="Compare the p50 of each case with a stored baseline.")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown reported as a regression (0.1 = 10%%).")
+    parser.add_argument("--child", nargs=2, metavar=("CASE", "SIZE"), help=argparse.SUPPRESS)
+    options = parser.parse_args(argv)
+
+    cases = {case.name: case for case in CASES}
+
+    if options.child:
+        name, size = options.child
+        print(json.dumps(measure(cases[name], int(size), options.min_time, options.min_runs, options.max_runs)))
+        return 0
+
+    sizes = SIZES if options.sizes == "all" else tuple(int(s) for s in options.sizes.split(","))
+    selected = [case for case in CASES if not options.filter or re.search(options.filter, case.name)]
+
+    baseline = None
+    if options.compare:
+        baseline = json.loads((BASELINES / f"{options.compare}.json").read_text())["results"]
+
+    results = []
+    for case in selected:
+        for size in (sizes if case.sized else (1,)):
+            if options.in_process:
+                try:
+                    result = measure(case, size, options.min_time, options.min_runs, options.max_runs)
+                except Exception as error:
+                    result = {"case": case.name, "size": size, "error": f"{type(error).__name__}: {error}"}
+            else:
+                result = run_isolated(case, size, options)
+            results.append(result)
+
+    regressions = report(results, baseline, options.threshold)
+
+    if options.save:
+        BASELINES.mkdir(exist_ok=True)
+        path = BASELINES / f"{options.save}.json"
+        path.write_text(json.dumps({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "results": {_key(r): r for r in results},
+        }, indent=2))
+        print(f"Baseline saved to {path}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
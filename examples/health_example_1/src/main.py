@@ -940,20 +940,19 @@ class WeightPage(ft.View):
             data = await self.health.get_health_data_from_types_async(
                 types=[fh.HealthDataTypeAndroid.WEIGHT],
                 start_time=start,
-                end_time=end
+                end_time=end,
+                as_points=True
             )
 
-            data.sort(key=lambda d: d.get("dateFrom", ""), reverse=True)
+            data.sort(key=lambda p: p.date_from or 0, reverse=True)
 
             self.history_list.controls = []
 
-            for d in data:
-                weight = d.get("value", {}).get("numericValue", 0)
-                timestamp = d.get("dateFrom")
+            for point in data:
+                weight = point.numeric_value
 
-                if weight and timestamp:
-                    dt = datetime.fromisoformat(timestamp.split(".")[0])
-                    formatted_date = dt.strftime("%d de %B de %Y %H:%M:%S")
+                if weight and point.date_from:
+                    formatted_date = point.start_time.strftime("%d de %B de %Y %H:%M:%S")
                     self.history_list.controls.append(
                         ft.Text(f"{weight:.1f} kilograms {formatted_date}")
                     )
@@ -968,19 +967,18 @@ class WeightPage(ft.View):
             start = datetime.now() - timedelta(days=7)
             end = datetime.now()
 
-            data = await self.health.get_health_data_from_types_async(
-                types=[fh.HealthDataTypeAndroid.WEIGHT],
-                start_time=start,
-                end_time=end
+            stats = await fh.HealthStatsAccumulator().consume(
+                self.health.iter_health_data(
+                    types=[fh.HealthDataTypeAndroid.WEIGHT],
+                    start_time=start,
+                    end_time=end,
+                    chunk=timedelta(days=7),  # a week of weights fits in a single read
+                    as_points=True
+                )
             )
 
-            weights = [
-                d.get("value", {}).get("numericValue", 0)
-                for d in data if d.get("value", {}).get("numericValue")
-            ]
-            if weights:
-                avg = sum(weights) / len(weights)
-                self.average_text.value = f"{avg:.1f} Kg"
+            if stats.count:
+                self.average_text.value = f"{stats.mean:.1f} Kg"
             else:
                 self.average_text.value = "No recent data"
 
@@ -1002,7 +1000,7 @@ def main(page: ft.Page):
     )
     debug_icon = DebugNotificationIcon(page, show_console_log)
     setattr(page, "debug_icon", debug_icon)
-    health = fh.Health()
+    health = fh.Health(permission_cache=fh.HealthPermissionCache())
     snackbar = ft.SnackBar(
         content=ft.Text(""),
         bgcolor=ft.Colors.BLUE_100,
@@ -1131,6 +1129,8 @@ def main(page: ft.Page):
         page.update()
 
     def on_app_lifecycle_change(e: ft.AppLifecycleStateChangeEvent):
+        health.permission_cache.on_app_lifecycle_state_change(e)
+
         if e.state == ft.AppLifecycleState.RESUME and page.route == "/startup":
             page.run_task(startup_page.check_health_connect)
 
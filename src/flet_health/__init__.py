@@ -9,4 +9,18 @@ from .flet_health import (
     MealType,
     MenstrualFlow,
     HealthConnectSdkStatus
-)
\ No newline at end of file
+)
+from .health_batch import HealthBatch, HealthBatchCall
+from .health_data_point import HealthDataPoint, HealthDataRecord, HealthReadQuery, unique_points
+from .health_series import HealthSeries
+from .health_cache import HealthQueryCache
+from .health_planner import HealthQueryPlanner
+from .health_permissions import HealthPermissionCache
+from .health_store import HealthStore
+from .health_write_queue import HealthWriteQueue
+from .health_codec import HealthCodec, get_codec, set_codec
+from .health_stats import HealthStatsAccumulator, RunningStats, TDigest, HyperLogLog
+from .health_metrics import HealthMetrics, HealthCallMetric, Histogram
+from .health_fake_backend import FakeHealthBackend
+from .health_deadline import HealthDeadline
+from .health_blocking import HealthBlockingCallWarning, HealthBlockingCallError
@@ -1,12 +1,51 @@
-import json
-from datetime import datetime
+import asyncio
+import itertools
+from contextlib import nullcontext
+from collections import deque
+from datetime import datetime, timedelta
 from flet.core.ref import Ref
 from flet.core.control import Control
 from flet_health.health_data_types import *
-from typing import Optional, Any, List, Dict
+from flet_health.health_batch import HealthBatch, _batch_call, _recording, unknown_method
+from flet_health.health_data_point import HealthDataPoint, HealthDataRecord, HealthReadQuery, unique_points
+from flet_health.health_series import HealthSeries
+from flet_health.health_cache import HealthQueryCache
+from flet_health.health_planner import HealthQueryPlanner
+from flet_health.health_permissions import HealthPermissionCache
+from flet_health.health_single_flight import SingleFlight, flight_key, IDEMPOTENT_PREFIXES
+from flet_health.health_type_index import DATA_TYPE_VALUES, RECORDING_METHOD_VALUES, wire_value, encode_types, encode_recording_methods, encode_data_access, resolve_type, supported_values
+from flet_health.health_blocking import blocking_check_mode, check_blocking_call
+from flet_health.health_deadline import HealthDeadline, CANCELLABLE_PREFIXES, call_timeout
+from flet_health.health_metrics import HealthMetrics, measure_call, measure_call_async, take_encode_time, set_last_call, timed_encoder, timed_decoder
+from flet_health.health_codec import dumps, loads, decode_points
+from flet_health.health_wire import COLUMNAR, WIRE_FORMATS, is_columnar, decode_columnar
+from flet_health.health_write_queue import HealthWriteQueue
+from typing import Optional, Any, List, Dict, Tuple, Iterable, AsyncIterator
 from flet.core.types import OptionalControlEventCallable
 
 
+# Types whose cached reads are invalidated by the write methods that do not take a `types` argument.
+_WORKOUT_TYPES = (
+    "WORKOUT",
+    "ACTIVE_ENERGY_BURNED",
+    "TOTAL_CALORIES_BURNED",
+    "DISTANCE_DELTA",
+    "DISTANCE_WALKING_RUNNING",
+    "DISTANCE_SWIMMING",
+    "DISTANCE_CYCLING",
+)
+_MEAL_TYPES = ("NUTRITION", "WATER") + tuple(t.value for t in HealthDataTypeIOS if t.value.startswith("DIETARY_"))
+
+# Columns of the rows sent by `write_health_data_many`, named as the `write_health_data` payload keys.
+_RECORD_FIELDS = ["value", "types", "start_time", "end_time", "unit", "recording_method"]
+
+# Payload encoding and decoding is timed and attributed to the surrounding native call (see `Health.metrics`).
+dumps = timed_encoder(dumps)
+loads = timed_decoder(loads)
+decode_points = timed_decoder(decode_points)
+decode_columnar = timed_decoder(decode_columnar)
+
+
 class Health(Control):
     """
     A control that lets you read and write health data to and from Apple Health and Google Health Connect.
@@ -26,6 +65,13 @@ class Health(Control):
             ref: Optional[Ref] = None,
             data: Any = None,
             on_error: OptionalControlEventCallable = None,
+            query_cache: Optional[HealthQueryCache] = None,
+            query_planner: Optional[HealthQueryPlanner] = None,
+            permission_cache: Optional[HealthPermissionCache] = None,
+            single_flight: bool = True,
+            metrics: bool | HealthMetrics = True,
+            blocking_check: Optional[str] = None,
+            native_cancel: bool = False,
     ):
         Control.__init__(
             self,
@@ -34,10 +80,384 @@ class Health(Control):
         )
 
         self.on_error = on_error
+        self.query_cache = query_cache
+        self.query_planner = query_planner
+        self.permission_cache = permission_cache
+        # Identical read calls in progress at the same time share one native call.
+        self.single_flight = SingleFlight() if single_flight else None
+        if metrics is True:
+            metrics = HealthMetrics()
+        self.call_metrics: Optional[HealthMetrics] = metrics or None
+        # Reads carry a `request_id` and send a native "cancel" when cancelled or timed out. Needs a
+        # native side implementing "cancel": without it, cancelling only stops waiting and decoding.
+        self.native_cancel = native_cancel
+        self._request_ids = itertools.count(1)
+        # Cleared when the native side rejects `invoke_batch`, see `invoke_batch`.
+        self._batch_supported = True
+        self._write_many_supported = True
+        # Debug check of sync calls waiting for the native side on the event loop: 'warn', 'raise'
+        # or None (off). Defaults to the FLET_HEALTH_BLOCKING_CHECK environment variable.
+        self.blocking_check = blocking_check_mode(blocking_check)
 
     def _get_control_name(self):
         return "flet_health"
 
+    def invoke_method(
+            self,
+            method_name: str,
+            arguments: Optional[Dict[str, str]] = None,
+            wait_for_result: bool = False,
+            wait_timeout: Optional[float] = 5,
+    ) -> Optional[str]:
+        batch_call = _batch_call.get()
+
+        if batch_call is not None:
+            if arguments:
+                arguments = {k: str(v) for k, v in arguments.items() if v is not None}
+            return batch_call._capture(method_name, arguments)
+
+        if wait_for_result:
+            check_blocking_call(self.blocking_check, method_name)
+
+        encode_time = take_encode_time()
+        timeout = call_timeout(method_name, wait_timeout) if wait_for_result else wait_timeout
+        request_id = self._request_id(method_name, wait_for_result)
+
+        def call():
+            try:
+                return Control.invoke_method(
+                    self,
+                    method_name=method_name,
+                    arguments=self._with_request_id(arguments, request_id),
+                    wait_for_result=wait_for_result,
+                    wait_timeout=timeout,
+                )
+            except TimeoutError:
+                self._cancel_native_call(request_id)
+                raise
+
+        def invoke():
+            if self.call_metrics is None:
+                return call()
+            return measure_call(self.call_metrics, method_name, arguments, encode_time, call)
+
+        if self.single_flight is None or not wait_for_result:
+            result = invoke()
+        else:
+            result = self.single_flight.call(flight_key(method_name, arguments), invoke)
+
+        set_last_call(self.call_metrics, method_name)
+        return result
+
+    async def invoke_method_async(
+            self,
+            method_name: str,
+            arguments: Optional[Dict[str, str]] = None,
+            wait_for_result: bool = False,
+            wait_timeout: Optional[float] = 5,
+    ) -> Optional[str]:
+        encode_time = take_encode_time()
+        timeout = call_timeout(method_name, wait_timeout) if wait_for_result else wait_timeout
+        request_id = self._request_id(method_name, wait_for_result)
+
+        async def call():
+            try:
+                return await Control.invoke_method_async(
+                    self,
+                    method_name=method_name,
+                    arguments=self._with_request_id(arguments, request_id),
+                    wait_for_result=wait_for_result,
+                    wait_timeout=timeout,
+                )
+            except (asyncio.CancelledError, TimeoutError):
+                # The task was cancelled (e.g. the user left the screen) or timed out: as the exception
+                # propagates, the result is never decoded, and with `native_cancel` the query is aborted.
+                self._cancel_native_call(request_id)
+                raise
+
+        def invoke():
+            if self.call_metrics is None:
+                return call()
+            return measure_call_async(self.call_metrics, method_name, arguments, encode_time, call)
+
+        if self.single_flight is None or not wait_for_result:
+            result = await invoke()
+        else:
+            result = await self.single_flight.call_async(flight_key(method_name, arguments), invoke)
+
+        set_last_call(self.call_metrics, method_name)
+        return result
+
+    def _batch_unsupported(self, error: Any) -> None:
+        self._batch_supported = False
+        print(f"Error in invoke_batch: {error}. Sending the calls one at a time.")
+
+    def _request_id(self, method_name: str, wait_for_result: bool) -> Optional[str]:
+        # Identifies a read on the native side, so that it can be cancelled.
+        if self.native_cancel and wait_for_result and method_name.startswith(CANCELLABLE_PREFIXES):
+            return str(next(self._request_ids))
+        return None
+
+    @staticmethod
+    def _with_request_id(arguments: Optional[Dict[str, str]], request_id: Optional[str]) -> Optional[Dict[str, str]]:
+        if request_id is None:
+            return arguments
+        return {**(arguments or {}), "request_id": request_id}
+
+    def _cancel_native_call(self, request_id: Optional[str]) -> None:
+        # Fire and forget: the native side stops the query and drops its result.
+        if request_id is None or self.page is None:
+            return
+
+        try:
+            Control.invoke_method(self, method_name="cancel", arguments={"request_id": request_id})
+        except Exception as error:
+            print(f"Error in cancel: {error}")
+
+    def deadline(self, seconds: float) -> HealthDeadline:
+        """
+        Creates a `HealthDeadline`: a single time budget for all the calls made inside it, split
+        across them instead of giving each call its own `wait_timeout`.
+
+        Usage:
+            with health.deadline(10):
+                steps = await health.get_health_data_from_types_async(...)
+                sleep = await health.get_health_data_from_types_async(...)
+
+        :param seconds: Time budget, from the moment the deadline is entered.
+        :return: A context manager (`with` or `async with`). Calls that do not complete in time
+            raise `TimeoutError`, which the read methods report as an error.
+        """
+
+        return HealthDeadline(seconds)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns a snapshot of the native calls made so far, per method name: number of calls,
+        errors, timeouts and cancellations, and summaries (count, min, max, mean, p50, p90, p99,
+        p999) of the bridge wait time, payload encode / decode time (in milliseconds) and payload
+        sizes in and out (in bytes). Calls coalesced by single-flight or packed in a batch count once.
+
+        To forward every call to another system, set an exporter:
+            health = Health(metrics=HealthMetrics(exporter=lambda m: print(m.method_name, m.bridge_time)))
+
+        :return: An empty dictionary if metrics are disabled (`Health(metrics=False)`).
+        """
+
+        return self.call_metrics.snapshot() if self.call_metrics is not None else {}
+
+    def resolve_types(
+            self,
+            types: List[str | HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType]
+    ) -> List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType]:
+        """
+        Maps platform-neutral types to the enum of the current platform, dropping the ones it does not support.
+
+        Each element may be a type name ("STEPS"), a member of either platform's enum (resolved by name)
+        or a neutral name for a measurement each platform exposes under a different type:
+            "HEART_RATE_VARIABILITY" -> HEART_RATE_VARIABILITY_RMSSD (Android) / HEART_RATE_VARIABILITY_SDNN (iOS)
+            "DISTANCE" -> DISTANCE_DELTA (Android) / DISTANCE_WALKING_RUNNING (iOS)
+
+        Usage:
+            types = health.resolve_types(["STEPS", "HEART_RATE_VARIABILITY", "AUDIOGRAM"])
+            # Android: [HealthDataTypeAndroid.STEPS, HealthDataTypeAndroid.HEART_RATE_VARIABILITY_RMSSD]
+
+        :param types: A list of type names or HealthDataType enum values.
+        :return: The resolved types, in the same order.
+        """
+
+        platform = self.page.platform.value
+        resolved = [resolve_type(t, platform) for t in types]
+
+        return [t for t in resolved if t is not None]
+
+    def _supported_types(self, types_str: List[str]) -> List[str]:
+        # Types the platform does not have are dropped before the bridge call instead of failing the whole read.
+        return supported_values(types_str, self.page.platform.value if self.page is not None else None)
+
+    def _invalidate_query_cache(self, types: Optional[List[Any]] = None) -> None:
+        if self.query_cache is not None:
+            self.query_cache.invalidate(types)
+
+    def batch(self, wait_timeout: Optional[float] = 25) -> HealthBatch:
+        """
+        Creates a `HealthBatch` that packs several operations into a single native call.
+
+        Usage:
+            with health.batch() as batch:
+                steps = batch.write_health_data(value=10, types=HealthDataTypeAndroid.STEPS, ...)
+                has_access = batch.has_permissions([HealthDataTypeAndroid.STEPS])
+
+            print(steps.value, has_access.value)
+
+        :param wait_timeout: Maximum time to wait for the whole batch to complete.
+        :return: A `HealthBatch` to be used as a (async) context manager.
+        """
+
+        return HealthBatch(self, wait_timeout=wait_timeout)
+
+    def write_behind(
+            self,
+            journal_path: str,
+            max_batch: int = 50,
+            flush_interval: float = 2.0,
+            wait_timeout: Optional[float] = 25
+    ) -> HealthWriteQueue:
+        """
+        Creates a `HealthWriteQueue` that acknowledges `write_*` / `delete*` calls immediately and
+        sends them in batches in the background. Writes left in the journal by a previous run are replayed.
+
+        Usage:
+            queue = health.write_behind(os.path.join(os.getenv("FLET_APP_STORAGE_DATA"), "writes.jsonl"))
+            queue.write_meal(meal_type=MealType.LUNCH, ...)
+
+        :param journal_path: Path of the append-only journal file.
+        :param max_batch: Number of pending writes that triggers a flush.
+        :param flush_interval: Maximum time in seconds a write stays pending.
+        :param wait_timeout: Maximum time to wait for each batched native call.
+        :return: A running `HealthWriteQueue`; call `close()` to flush it before exiting.
+        """
+
+        return HealthWriteQueue(
+            self,
+            journal_path,
+            max_batch=max_batch,
+            flush_interval=flush_interval,
+            wait_timeout=wait_timeout,
+        )
+
+    def invoke_batch(
+            self,
+            calls: List[Tuple[str, Optional[Dict[str, str]]]],
+            wait_timeout: Optional[float] = 25
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Invokes several native methods in a single round-trip.
+
+        Native sides without an `invoke_batch` handler reject the call: the calls are then sent one at a
+        time, in order, and later batches go straight to the individual calls.
+
+        :param calls: A list of `(method_name, arguments)` pairs, as they would be given to `invoke_method`.
+        :param wait_timeout: Maximum time to wait for the whole batch to complete, also when its calls are
+            sent one at a time.
+
+        :return: A list of `(result, error)` pairs in the same order as `calls`.
+        :raises TimeoutError: If the batch, or one of the calls sent one at a time, timed out.
+        :raises Exception: If the native `invoke_batch` handler failed; the calls are not sent again.
+        """
+
+        if self._batch_supported:
+            data = dumps(
+                {
+                    "calls": [{"method_name": name, "arguments": arguments or {}} for name, arguments in calls],
+                }
+            )
+
+            try:
+                result = self.invoke_method(
+                    method_name="invoke_batch",
+                    arguments={'data': data},
+                    wait_for_result=True,
+                    wait_timeout=wait_timeout
+                )
+
+            except Exception as error:
+                # Only a native side without the handler surely applied none of the calls. After any other
+                # error (timeout, no page, a failure in the handler) sending them again could apply them twice.
+                if not unknown_method(error):
+                    raise
+                self._batch_unsupported(error)
+
+            else:
+                if result is not None:
+                    return [(r.get("result"), r.get("error")) for r in loads(result)]
+
+                # Flet extensions answer None to the methods they do not handle.
+                self._batch_unsupported("no handler on the native side")
+
+        results = []
+        # The calls share the time budget of the batch instead of getting `wait_timeout` each.
+        with HealthDeadline(wait_timeout) if wait_timeout is not None else nullcontext():
+            for name, arguments in calls:
+                try:
+                    results.append((self.invoke_method(name, arguments, wait_for_result=True, wait_timeout=wait_timeout), None))
+                except (TimeoutError, AssertionError):
+                    # Transport errors are raised as for a whole batch: the call may still be applied, so it
+                    # must not be reported as answered.
+                    raise
+                except Exception as error:
+                    results.append((None, str(error) or type(error).__name__))
+
+        return results
+
+    async def invoke_batch_async(
+            self,
+            calls: List[Tuple[str, Optional[Dict[str, str]]]],
+            wait_timeout: Optional[float] = 25
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Invokes several native methods in a single round-trip.
+
+        Native sides without an `invoke_batch` handler reject the call: the calls are then sent one at a
+        time, in order (concurrently if they are all reads), and later batches go straight to the
+        individual calls.
+
+        :param calls: A list of `(method_name, arguments)` pairs, as they would be given to `invoke_method`.
+        :param wait_timeout: Maximum time to wait for the whole batch to complete, also when its calls are
+            sent one at a time.
+
+        :return: A list of `(result, error)` pairs in the same order as `calls`.
+        :raises TimeoutError: If the batch, or one of the calls sent one at a time, timed out.
+        :raises Exception: If the native `invoke_batch` handler failed; the calls are not sent again.
+        """
+
+        if self._batch_supported:
+            data = dumps(
+                {
+                    "calls": [{"method_name": name, "arguments": arguments or {}} for name, arguments in calls],
+                }
+            )
+
+            try:
+                result = await self.invoke_method_async(
+                    method_name="invoke_batch",
+                    arguments={'data': data},
+                    wait_for_result=True,
+                    wait_timeout=wait_timeout
+                )
+
+            except Exception as error:
+                # Only a native side without the handler surely applied none of the calls. After any other
+                # error (timeout, no page, a failure in the handler) sending them again could apply them twice.
+                if not unknown_method(error):
+                    raise
+                self._batch_unsupported(error)
+
+            else:
+                if result is not None:
+                    return [(r.get("result"), r.get("error")) for r in loads(result)]
+
+                # Flet extensions answer None to the methods they do not handle.
+                self._batch_unsupported("no handler on the native side")
+
+        async def invoke(name: str, arguments: Optional[Dict[str, str]]) -> Tuple[Optional[str], Optional[str]]:
+            try:
+                return await self.invoke_method_async(name, arguments, wait_for_result=True, wait_timeout=wait_timeout), None
+            except (TimeoutError, AssertionError):
+                # Transport errors are raised as for a whole batch: the call may still be applied, so it
+                # must not be reported as answered.
+                raise
+            except Exception as error:
+                return None, str(error) or type(error).__name__
+
+        # The calls share the time budget of the batch instead of getting `wait_timeout` each.
+        with HealthDeadline(wait_timeout) if wait_timeout is not None else nullcontext():
+            if all(name.startswith(IDEMPOTENT_PREFIXES) for name, _ in calls):
+                # Reads do not depend on each other: they are sent concurrently.
+                return list(await asyncio.gather(*[invoke(name, arguments) for name, arguments in calls]))
+
+            return [await invoke(name, arguments) for name, arguments in calls]
+
     def request_health_data_history_authorization(self, wait_timeout: Optional[float] = 25) -> bool:
         """
         Requests the Health Data History permission.
@@ -126,8 +546,8 @@ class Health(Control):
         if platform == 'ios':
             return True
 
-        result = self.invoke_method(
-            method_name="is_health_data_history_available_async",
+        result = await self.invoke_method_async(
+            method_name="is_health_data_history_available",
             wait_for_result=True,
             wait_timeout=wait_timeout,
         )
@@ -175,7 +595,7 @@ class Health(Control):
         if platform == 'ios':
             return True
 
-        result = self.invoke_method_async(
+        result = await self.invoke_method_async(
             method_name="is_health_data_history_authorized",
             wait_for_result=True,
             wait_timeout=wait_timeout,
@@ -221,7 +641,7 @@ class Health(Control):
         if platform == 'ios':
             return True
 
-        result = self.invoke_method_async(
+        result = await self.invoke_method_async(
             method_name="is_health_data_in_background_available",
             wait_for_result=True,
             wait_timeout=wait_timeout,
@@ -273,6 +693,22 @@ class Health(Control):
 
         return result == 'true'
 
+    def _record_authorization(
+            self,
+            types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType],
+            data_access: List[DataAccess],
+            granted: bool
+    ) -> None:
+        if self.permission_cache is None or _recording():
+            return
+
+        # The permission state of the requested types has just changed.
+        self.permission_cache.invalidate(types)
+
+        # On iOS a successful request only means the dialog was shown.
+        if granted and self.page is not None and self.page.platform.value == 'android':
+            self.permission_cache.store(types, data_access, True)
+
     def request_authorization(
             self,
             types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType],
@@ -300,22 +736,18 @@ class Health(Control):
             READ or READ/WRITE permissions.
         """
 
-        if not all(isinstance(t, HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType) for t in types):
-            raise ValueError("All elements of 'types' must be instances of 'HealthDataTypeAndroid, HealthDataTypeIOS or HealthWorkoutActivityType'.")
+        types_str = encode_types(types)
 
         if data_access is None:
             data_access = [DataAccess.READ] * len(types)
 
-        else:
-            if not all(isinstance(da, DataAccess) for da in data_access):
-                raise ValueError("All elements of 'data_access' must be instances of 'DataAccess'.")
-            if len(data_access) != len(types):
-                raise ValueError("The 'data_access' list must be the same size as 'types'.")
+        elif len(data_access) != len(types):
+            raise ValueError("The 'data_access' list must be the same size as 'types'.")
 
-        data = json.dumps(
+        data = dumps(
             {
-                "types": [t.value for t in types],
-                "data_access": [da.value for da in data_access] if data_access else None,
+                "types": types_str,
+                "data_access": encode_data_access(data_access) if data_access else None,
             }
         )
 
@@ -326,6 +758,8 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
+        self._record_authorization(types, data_access, result == "true")
+
         return result == "true"
 
     async def request_authorization_async(
@@ -355,22 +789,18 @@ class Health(Control):
             READ or READ/WRITE permissions.
         """
 
-        if not all(isinstance(t, HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType) for t in types):
-            raise ValueError("All elements of 'types' must be instances of 'HealthDataTypeAndroid, HealthDataTypeIOS or HealthWorkoutActivityType'.")
+        types_str = encode_types(types)
 
         if data_access is None:
             data_access = [DataAccess.READ] * len(types)
 
-        else:
-            if not all(isinstance(da, DataAccess) for da in data_access):
-                raise ValueError("All elements of 'data_access' must be instances of 'DataAccess'.")
-            if len(data_access) != len(types):
-                raise ValueError("The 'data_access' list must be the same size as 'types'.")
+        elif len(data_access) != len(types):
+            raise ValueError("The 'data_access' list must be the same size as 'types'.")
 
-        data = json.dumps(
+        data = dumps(
             {
-                "types": [t.value for t in types],
-                "data_access": [da.value for da in data_access] if data_access else None,
+                "types": types_str,
+                "data_access": encode_data_access(data_access) if data_access else None,
             }
         )
 
@@ -381,6 +811,8 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
+        self._record_authorization(types, data_access, result == "true")
+
         return result == "true"
 
     def has_permissions(
@@ -408,25 +840,26 @@ class Health(Control):
             - None: if it is not possible to determine the permissions (as in iOS).
         """
 
-        if not all(isinstance(t, HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType) for t in types):
-            raise ValueError("All elements of 'types' must be instances of 'HealthDataTypeAndroid, HealthDataTypeIOS or HealthWorkoutActivityType'.")
+        types_str = encode_types(types)
 
         if data_access is None:
             data_access = [DataAccess.READ] * len(types)
 
-        else:
-            if not all(isinstance(da, DataAccess) for da in data_access):
-                raise ValueError("All elements of 'data_access' must be instances of 'DataAccess'.")
-            if len(data_access) != len(types):
-                raise ValueError("The 'data_access' list must be the same size as 'types'.")
+        elif len(data_access) != len(types):
+            raise ValueError("The 'data_access' list must be the same size as 'types'.")
 
-        data = json.dumps(
+        data = dumps(
             {
-                "types": [t.value for t in types],
-                "data_access": [da.value for da in data_access],
+                "types": types_str,
+                "data_access": encode_data_access(data_access),
             }
         )
 
+        if self.permission_cache is not None and not _recording():
+            hit, value = self.permission_cache.lookup(types, data_access)
+            if hit:
+                return value
+
         result = self.invoke_method(
             method_name="has_permissions",
             arguments={"data": data},
@@ -435,11 +868,16 @@ class Health(Control):
         )
 
         if result == "true":
-            return True
+            value = True
         elif result == "false":
-            return False
+            value = False
         else:
-            return None
+            value = None
+
+        if self.permission_cache is not None and not _recording():
+            self.permission_cache.store(types, data_access, value)
+
+        return value
 
     async def has_permissions_async(
             self,
@@ -466,25 +904,26 @@ class Health(Control):
             None: if it is not possible to determine the permissions (as in iOS).
         """
 
-        if not all(isinstance(t, HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType) for t in types):
-            raise ValueError("All elements of 'types' must be instances of 'HealthDataTypeAndroid, HealthDataTypeIOS or HealthWorkoutActivityType'.")
+        types_str = encode_types(types)
 
         if data_access is None:
             data_access = [DataAccess.READ] * len(types)
 
-        else:
-            if not all(isinstance(da, DataAccess) for da in data_access):
-                raise ValueError("All elements of 'data_access' must be instances of 'DataAccess'.")
-            if len(data_access) != len(types):
-                raise ValueError("The 'data_access' list must be the same size as 'types'.")
+        elif len(data_access) != len(types):
+            raise ValueError("The 'data_access' list must be the same size as 'types'.")
 
-        data = json.dumps(
+        data = dumps(
             {
-                "types": [t.value for t in types],
-                "data_access": [da.value for da in data_access],
+                "types": types_str,
+                "data_access": encode_data_access(data_access),
             }
         )
 
+        if self.permission_cache is not None and not _recording():
+            hit, value = self.permission_cache.lookup(types, data_access)
+            if hit:
+                return value
+
         result = await self.invoke_method_async(
             method_name="has_permissions",
             arguments={"data": data},
@@ -493,11 +932,82 @@ class Health(Control):
         )
 
         if result == "true":
-            return True
+            value = True
         elif result == "false":
-            return False
+            value = False
         else:
-            return None
+            value = None
+
+        if self.permission_cache is not None and not _recording():
+            self.permission_cache.store(types, data_access, value)
+
+        return value
+
+    def prefetch_permissions(
+            self,
+            types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType],
+            data_access: Optional[List[DataAccess]] = None,
+            wait_timeout: Optional[float] = 25
+    ) -> Dict[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType, Optional[bool]]:
+        """
+        Checks the permissions of each type separately, in a single native call, and fills
+        `permission_cache` with the results. Native sides without `invoke_batch` get one
+        `has_permissions` call per type instead (see `invoke_batch`).
+
+        :param types: List of health data types to be checked.
+        :param data_access: Optional list of 'DataAccess' corresponding to each 'type'. If 'None', 'READ' is assumed for all types.
+        :param wait_timeout: Maximum time to wait for all the checks to complete.
+
+        :return: A dictionary mapping each type to the result `has_permissions` gives for it alone.
+        """
+
+        if data_access is None:
+            data_access = [DataAccess.READ] * len(types)
+
+        elif len(data_access) != len(types):
+            raise ValueError("The 'data_access' list must be the same size as 'types'.")
+
+        if self.permission_cache is not None:
+            self.permission_cache.invalidate(types)
+
+        batch = self.batch(wait_timeout=wait_timeout)
+        calls = {t: batch.has_permissions([t], [da]) for t, da in zip(types, data_access)}
+        batch.commit()
+
+        return {t: call.value for t, call in calls.items()}
+
+    async def prefetch_permissions_async(
+            self,
+            types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType],
+            data_access: Optional[List[DataAccess]] = None,
+            wait_timeout: Optional[float] = 25
+    ) -> Dict[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType, Optional[bool]]:
+        """
+        Checks the permissions of each type separately, in a single native call, and fills
+        `permission_cache` with the results. Native sides without `invoke_batch` get one
+        `has_permissions` call per type instead, sent concurrently (see `invoke_batch_async`).
+
+        :param types: List of health data types to be checked.
+        :param data_access: Optional list of 'DataAccess' corresponding to each 'type'. If 'None', 'READ' is assumed for all types.
+        :param wait_timeout: Maximum time to wait for all the checks to complete.
+
+        :return: A dictionary mapping each type to the result `has_permissions` gives for it alone.
+        """
+
+        if data_access is None:
+            data_access = [DataAccess.READ] * len(types)
+
+        elif len(data_access) != len(types):
+            raise ValueError("The 'data_access' list must be the same size as 'types'.")
+
+        if self.permission_cache is not None:
+            self.permission_cache.invalidate(types)
+
+        batch = self.batch(wait_timeout=wait_timeout)
+        calls = {t: batch.has_permissions([t], [da]) for t, da in zip(types, data_access)}
+        await batch.commit_async()
+
+        return {t: call.value for t, call in calls.items()}
 
     def revoke_permissions(self) -> None:
         """
@@ -516,6 +1026,9 @@ class Health(Control):
                 method_name="revoke_permissions"
             )
 
+            if self.permission_cache is not None:
+                self.permission_cache.invalidate()
+
     def is_health_connect_available(self, wait_timeout: Optional[float] = 25) -> bool:
         """
         Is Google Health Connect available on this phone?
@@ -550,7 +1063,7 @@ class Health(Control):
         if platform == 'ios':
             return True
 
-        result = self.invoke_method_async(
+        result = await self.invoke_method_async(
             method_name="is_health_connect_available",
             wait_for_result=True,
             wait_timeout=wait_timeout,
@@ -648,7 +1161,7 @@ class Health(Control):
         start_time_ms = int(start_time.timestamp() * 1000)
         end_time_ms = int(end_time.timestamp() * 1000)
 
-        data = json.dumps(
+        data = dumps(
             {
                 "start_time": start_time_ms,
                 "end_time": end_time_ms,
@@ -681,7 +1194,7 @@ class Health(Control):
         start_time_ms = int(start_time.timestamp() * 1000)
         end_time_ms = int(end_time.timestamp() * 1000)
 
-        data = json.dumps(
+        data = dumps(
             {
                 "start_time": start_time_ms,
                 "end_time": end_time_ms,
@@ -711,16 +1224,15 @@ class Health(Control):
         Fetch a list of health data points based on [HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType]
         """
 
-        # Validate types
-        if not all(isinstance(t, HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType) for t in types):
-            raise ValueError("All elements of 'types' must be instances of 'HealthDataTypeAndroid, HealthDataTypeIOS or HealthWorkoutActivityType'.")
+        # Validate types and convert them to their string values
+        types_str = self._supported_types(encode_types(types))
+        if not types_str:
+            return []
 
-        # Convert types to their string values
-        types_str = [t.value for t in types]
         start_time_ms = int(start_time.timestamp() * 1000)
         end_time_ms = int(end_time.timestamp() * 1000)
 
-        data = json.dumps(
+        data = dumps(
             {
                 "types": types_str,
                 "start_time": start_time_ms,
@@ -737,7 +1249,7 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
-        return json.loads(result or "[]")
+        return loads(result or "[]")
 
     async def get_health_aggregate_data_from_types_async(
             self,
@@ -752,16 +1264,15 @@ class Health(Control):
         Fetch a list of health data points based on [HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType]
         """
 
-        # Validate types
-        if not all(isinstance(t, HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType) for t in types):
-            raise ValueError("All elements of 'types' must be instances of 'HealthDataTypeAndroid, HealthDataTypeIOS or HealthWorkoutActivityType'.")
+        # Validate types and convert them to their string values
+        types_str = self._supported_types(encode_types(types))
+        if not types_str:
+            return []
 
-        # Convert types to their string values
-        types_str = [t.value for t in types]
         start_time_ms = int(start_time.timestamp() * 1000)
         end_time_ms = int(end_time.timestamp() * 1000)
 
-        data = json.dumps(
+        data = dumps(
             {
                 "types": types_str,
                 "start_time": start_time_ms,
@@ -778,7 +1289,118 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
-        return json.loads(result or "[]")
+        return loads(result or "[]")
+
+    @staticmethod
+    def _decode_series(result: Optional[str]) -> HealthSeries:
+        # Native sides without columnar support answer with the usual JSON list.
+        if result and is_columnar(result):
+            return decode_columnar(result)
+
+        return HealthSeries.from_json(loads(result or "[]"))
+
+    @staticmethod
+    def _series_result(series: HealthSeries, as_points: bool, as_series: bool) -> list[Any] | HealthSeries:
+        if as_series:
+            return series
+
+        return list(series) if as_points else [point.to_json() for point in series]
+
+    def _decode_read(
+            self,
+            types: List[str],
+            start_time_ms: int,
+            end_time_ms: int,
+            result: Optional[str],
+            as_points: bool,
+            wire_format: str
+    ) -> list[dict] | list[HealthDataPoint] | HealthSeries:
+        if wire_format == COLUMNAR:
+            points = self._decode_series(result)
+        else:
+            points = decode_points(result or "[]") if as_points else loads(result or "[]")
+
+        # Nothing was read yet while a batch is being recorded.
+        if self.query_planner is not None and not _recording():
+            self.query_planner.observe_result(types, start_time_ms, end_time_ms, points, len(result or ""))
+
+        return points
+
+    def _read_health_data(
+            self,
+            types: List[str],
+            start_time_ms: int,
+            end_time_ms: int,
+            recording_method: List[str],
+            wait_timeout: Optional[float] = 25,
+            as_points: bool = False,
+            wire_format: str = "json"
+    ) -> list[dict] | list[HealthDataPoint] | HealthSeries:
+        request = {
+            "types": types,
+            "start_time": start_time_ms,
+            "end_time": end_time_ms,
+            "recording_method": recording_method,
+        }
+        if wire_format == COLUMNAR:
+            request["wire_format"] = COLUMNAR
+
+        data = dumps(request)
+
+        def read():
+            result = self.invoke_method(
+                method_name="get_health_data_from_types",
+                arguments={'data': data},
+                wait_for_result=True,
+                wait_timeout=wait_timeout
+            )
+
+            return self._decode_read(types, start_time_ms, end_time_ms, result, as_points, wire_format)
+
+        if self.single_flight is None or _batch_call.get() is not None:
+            return read()
+
+        # Identical reads in progress also share the decoded result.
+        key = (flight_key("get_health_data_from_types", {'data': data}), as_points)
+        return self.single_flight.call(key, read)
+
+    async def _read_health_data_async(
+            self,
+            types: List[str],
+            start_time_ms: int,
+            end_time_ms: int,
+            recording_method: List[str],
+            wait_timeout: Optional[float] = 25,
+            as_points: bool = False,
+            wire_format: str = "json"
+    ) -> list[dict] | list[HealthDataPoint] | HealthSeries:
+        request = {
+            "types": types,
+            "start_time": start_time_ms,
+            "end_time": end_time_ms,
+            "recording_method": recording_method,
+        }
+        if wire_format == COLUMNAR:
+            request["wire_format"] = COLUMNAR
+
+        data = dumps(request)
+
+        async def read():
+            result = await self.invoke_method_async(
+                method_name="get_health_data_from_types",
+                arguments={'data': data},
+                wait_for_result=True,
+                wait_timeout=wait_timeout
+            )
+
+            return self._decode_read(types, start_time_ms, end_time_ms, result, as_points, wire_format)
+
+        if self.single_flight is None or _batch_call.get() is not None:
+            return await read()
+
+        # Identical reads in progress also share the decoded result.
+        key = (flight_key("get_health_data_from_types", {'data': data}), as_points)
+        return await self.single_flight.call_async(key, read)
 
     def get_health_data_from_types(
             self,
@@ -786,8 +1408,12 @@ class Health(Control):
             start_time: datetime,
             end_time: datetime,
             recording_method: Optional[List[RecordingMethod]] = None,
-            wait_timeout: Optional[float] = 25
-    ) -> str | list[Any] | None:
+            wait_timeout: Optional[float] = 25,
+            *,
+            as_points: bool = False,
+            as_series: bool = False,
+            wire_format: str = "json"
+    ) -> str | list[Any] | HealthSeries | None:
         """
         Fetches a list of health data points based on types [HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType].
         You can also specify the [recording_methods_to_filter] to filter the data points.
@@ -798,46 +1424,69 @@ class Health(Control):
         :param start_time: The start time for the data query.
         :param end_time: The end time for the data query.
         :param recording_method: An optional list of RecordingMethod strings to filter by.  Valid values: 'unknown', 'active', 'automatic', 'manual'.
+        :param as_points: If True, returns a list of `HealthDataPoint` instead of dictionaries.
+        :param as_series: If True, returns a columnar `HealthSeries` instead of a list.
+        :param wire_format: 'json' (default) or 'columnar' to have the native side send a compact, dictionary-encoded
+            payload decoded straight into columns. Only numeric values are kept; best used with `as_series`.
 
         :return: A string representation of the health data, likely in JSON format.  The format will match what's returned by the Dart plugin.  Returns [] if no data found or an error occurred.
+            Raises `TimeoutError` if the native side does not answer within `wait_timeout` or the current `deadline`.
         """
 
         try:
 
-            # Validate recording methods
-            if recording_method and not all(isinstance(rc, RecordingMethod) for rc in recording_method):
-                raise ValueError("The 'recording_method' argument must be an instance of 'RecordingMethod'.")
+            if as_points and as_series:
+                raise ValueError("The 'as_points' and 'as_series' arguments cannot be used together.")
 
-            # Validate types
-            if not all(isinstance(t, HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType) for t in types):
-                raise ValueError("All elements of 'types' must be instances of 'HealthDataTypeAndroid, HealthDataTypeIOS or HealthWorkoutActivityType'.")
+            if wire_format not in WIRE_FORMATS:
+                raise ValueError(f"The 'wire_format' argument must be one of {WIRE_FORMATS}.")
 
-            # Convert types to their string values
-            types_str = [t.value for t in types]
+            # Validate types and convert them to their string values
+            types_str = self._supported_types(encode_types(types))
+            recording_method_str = encode_recording_methods(recording_method) if recording_method else []
+
+            if not types_str:
+                return self._series_result(HealthSeries.from_json([]), as_points, as_series)
 
             # Convert datetimes to milliseconds since epoch
             start_time_ms = int(start_time.timestamp() * 1000)
             end_time_ms = int(end_time.timestamp() * 1000)
 
-            # Prepare arguments for the invoke_method call
-            data = json.dumps(
-                {
-                    "types": types_str,
-                    "start_time": start_time_ms,
-                    "end_time": end_time_ms,
-                    "recording_method": [rm.value for rm in recording_method] if recording_method else [],
-                }
-            )
-
-            # Call the native method
-            result = self.invoke_method(
-                method_name="get_health_data_from_types",
-                arguments={'data': data},
-                wait_for_result=True,
-                wait_timeout=wait_timeout
-            )
-
-            return json.loads(result or "[]")
+            if wire_format == COLUMNAR:
+                # Columnar reads are not cached: the cache keeps the full dictionaries.
+                series = self._read_health_data(types_str, start_time_ms, end_time_ms, recording_method_str, wait_timeout, wire_format=wire_format)
+                return self._series_result(series, as_points, as_series)
+
+            if self.query_cache is None or _batch_call.get() is not None:
+                # Points are decoded straight from the payload, without intermediate dictionaries.
+                points = self._read_health_data(types_str, start_time_ms, end_time_ms, recording_method_str, wait_timeout, as_points=as_points)
+                if as_points:
+                    return points
+
+            else:
+                # Fetch only the sub-ranges not covered yet, one type at a time, and serve the rest from memory.
+                points = []
+                for t in types_str:
+                    key = HealthQueryCache.key(t, recording_method_str)
+                    while True:
+                        generation = self.query_cache.generation(key)
+                        for gap_start, gap_end in self.query_cache.missing(key, start_time_ms, end_time_ms):
+                            fetched = self._read_health_data([t], gap_start, gap_end, recording_method_str, wait_timeout)
+                            if not self.query_cache.add(key, gap_start, gap_end, fetched, generation):
+                                # A write invalidated the type while fetching: the cached part is gone too.
+                                break
+                        else:
+                            break
+                    points.extend(self.query_cache.get(key, start_time_ms, end_time_ms))
+
+            if as_series:
+                return HealthSeries.from_json(points)
+
+            return HealthDataPoint.from_json_list(points) if as_points else points
+
+        except TimeoutError:
+            # Not reported as an empty result: the data may exist, it was just not read in time.
+            raise
 
         except Exception as error:
             print(f"Error in get_health_data_from_types: {error}")
@@ -849,8 +1498,12 @@ class Health(Control):
             start_time: datetime,
             end_time: datetime,
             recording_method: Optional[List[RecordingMethod]] = None,
-            wait_timeout: Optional[float] = 25
-    ) -> str | list[Any] | None:
+            wait_timeout: Optional[float] = 25,
+            *,
+            as_points: bool = False,
+            as_series: bool = False,
+            wire_format: str = "json"
+    ) -> str | list[Any] | HealthSeries | None:
         """
         Fetches a list of health data points based on types [HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType].
         You can also specify the [recording_methods_to_filter] to filter the data points.
@@ -861,51 +1514,272 @@ class Health(Control):
         :param start_time: The start time for the data query.
         :param end_time: The end time for the data query.
         :param recording_method: An optional list of RecordingMethod strings to filter by.  Valid values: 'unknown', 'active', 'automatic', 'manual'.
+        :param as_points: If True, returns a list of `HealthDataPoint` instead of dictionaries.
+        :param as_series: If True, returns a columnar `HealthSeries` instead of a list.
+        :param wire_format: 'json' (default) or 'columnar' to have the native side send a compact, dictionary-encoded
+            payload decoded straight into columns. Only numeric values are kept; best used with `as_series`.
 
         :return: A string representation of the health data, likely in JSON format.  The format will match what's returned by the Dart plugin.  Returns [] if no data found or an error occurred.
+            Raises `TimeoutError` if the native side does not answer within `wait_timeout` or the current `deadline`.
         """
 
         try:
 
-            # Validate recording methods
-            if recording_method and not all(isinstance(rc, RecordingMethod) for rc in recording_method):
-                raise ValueError("The 'recording_method' argument must be an instance of 'RecordingMethod'.")
+            if as_points and as_series:
+                raise ValueError("The 'as_points' and 'as_series' arguments cannot be used together.")
 
-            # Validate types
-            if not all(isinstance(t, HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType) for t in types):
-                raise ValueError("All elements of 'types' must be instances of 'HealthDataTypeAndroid, HealthDataTypeIOS or HealthWorkoutActivityType'.")
+            if wire_format not in WIRE_FORMATS:
+                raise ValueError(f"The 'wire_format' argument must be one of {WIRE_FORMATS}.")
+
+            # Validate types and convert them to their string values
+            types_str = self._supported_types(encode_types(types))
+            recording_method_str = encode_recording_methods(recording_method) if recording_method else []
 
-            # Convert types to their string values
-            types_str = [t.value for t in types]
+            if not types_str:
+                return self._series_result(HealthSeries.from_json([]), as_points, as_series)
 
             # Convert datetimes to milliseconds since epoch
             start_time_ms = int(start_time.timestamp() * 1000)
             end_time_ms = int(end_time.timestamp() * 1000)
 
-            # Prepare arguments for the invoke_method call
-            data = json.dumps(
-                {
-                    "types": types_str,
-                    "start_time": start_time_ms,
-                    "end_time": end_time_ms,
-                    "recording_method": [rm.value for rm in recording_method] if recording_method else [],
-                }
-            )
-
-            # Call the native method
-            result = await self.invoke_method_async(
-                method_name="get_health_data_from_types",
-                arguments={'data': data},
-                wait_for_result=True,
-                wait_timeout=wait_timeout
-            )
-
-            return json.loads(result or "[]")
+            if wire_format == COLUMNAR:
+                # Columnar reads are not cached: the cache keeps the full dictionaries.
+                series = await self._read_health_data_async(types_str, start_time_ms, end_time_ms, recording_method_str, wait_timeout, wire_format=wire_format)
+                return self._series_result(series, as_points, as_series)
+
+            if self.query_cache is None or _batch_call.get() is not None:
+                # Points are decoded straight from the payload, without intermediate dictionaries.
+                points = await self._read_health_data_async(types_str, start_time_ms, end_time_ms, recording_method_str, wait_timeout, as_points=as_points)
+                if as_points:
+                    return points
+
+            else:
+                # Fetch only the sub-ranges not covered yet, one type at a time, and serve the rest from memory.
+                points = []
+                for t in types_str:
+                    key = HealthQueryCache.key(t, recording_method_str)
+                    while True:
+                        generation = self.query_cache.generation(key)
+                        for gap_start, gap_end in self.query_cache.missing(key, start_time_ms, end_time_ms):
+                            fetched = await self._read_health_data_async([t], gap_start, gap_end, recording_method_str, wait_timeout)
+                            if not self.query_cache.add(key, gap_start, gap_end, fetched, generation):
+                                # A write invalidated the type while fetching: the cached part is gone too.
+                                break
+                        else:
+                            break
+                    points.extend(self.query_cache.get(key, start_time_ms, end_time_ms))
+
+            if as_series:
+                return HealthSeries.from_json(points)
+
+            return HealthDataPoint.from_json_list(points) if as_points else points
+
+        except TimeoutError:
+            # Not reported as an empty result: the data may exist, it was just not read in time.
+            raise
 
         except Exception as error:
             print(f"Error in get_health_data_from_types: {error}")
             return []
 
+    async def iter_health_data(
+            self,
+            types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType],
+            start_time: datetime,
+            end_time: datetime,
+            chunk: Optional[timedelta] = timedelta(days=1),
+            recording_method: Optional[List[RecordingMethod]] = None,
+            max_concurrency: int = 4,
+            as_points: bool = False,
+            wait_timeout: Optional[float] = 25
+    ) -> AsyncIterator[dict | HealthDataPoint]:
+        """
+        Streams health data points for a long time range without loading the whole range at once.
+
+        The range is split into windows of size `chunk`, which are fetched with at most
+        `max_concurrency` native calls in flight. Points are yielded in window order, so memory
+        is bounded by `max_concurrency` windows rather than by the whole range.
+
+        Usage:
+            async for point in health.iter_health_data([HealthDataTypeAndroid.HEART_RATE], start, end):
+                ...
+
+        :param types: A list of HealthDataType enum values to retrieve data for.
+        :param start_time: The start time for the data query.
+        :param end_time: The end time for the data query.
+        :param chunk: The size of each window fetched from the native side. Defaults to one day. If None, each
+            window is sized by `query_planner` from the point density observed so far (a `HealthQueryPlanner`
+            is created if the control has none).
+        :param recording_method: An optional list of RecordingMethod to filter by.
+        :param max_concurrency: Maximum number of windows fetched at the same time.
+        :param as_points: If True, yields `HealthDataPoint` instead of dictionaries.
+        :param wait_timeout: Maximum time to wait for each window.
+
+        :return: An async iterator of HealthDataPoint dictionaries (or `HealthDataPoint` if `as_points` is True).
+            Raises `TimeoutError` if a window runs out of `wait_timeout` or of the current `HealthDeadline`, so
+            a timed-out stream is not mistaken for a range without data.
+        """
+
+        # Validate types
+        encode_types(types)
+
+        if chunk is not None and chunk <= timedelta(0):
+            raise ValueError("The 'chunk' argument must be a positive timedelta.")
+
+        if chunk is None and self.query_planner is None:
+            self.query_planner = HealthQueryPlanner()
+
+        if max_concurrency < 1:
+            raise ValueError("The 'max_concurrency' argument must be at least 1.")
+
+        def windows():
+            window_start = start_time
+            while window_start < end_time:
+                # Asked lazily, so the windows adapt as the earlier ones come back.
+                size = chunk if chunk is not None else self.query_planner.chunk_for(types)
+                window_end = min(window_start + size, end_time)
+                yield window_start, window_end
+                window_start = window_end
+
+        pending = deque()
+        window_iter = windows()
+
+        def schedule():
+            for window_start, window_end in window_iter:
+                pending.append(
+                    asyncio.ensure_future(
+                        self.get_health_data_from_types_async(
+                            types=types,
+                            start_time=window_start,
+                            end_time=window_end,
+                            recording_method=recording_method,
+                            as_points=as_points,
+                            wait_timeout=wait_timeout,
+                        )
+                    )
+                )
+                if len(pending) >= max_concurrency:
+                    break
+
+        # Points spanning a window edge are returned for both windows; skip the repeated ones.
+        previous_uuids = set()
+
+        try:
+            schedule()
+
+            while pending:
+                points = await pending.popleft()
+                schedule()
+
+                current_uuids = set()
+                for point in points:
+                    uuid = point.uuid if as_points else point.get("uuid")
+                    if uuid:
+                        current_uuids.add(uuid)
+                        if uuid in previous_uuids:
+                            continue
+                    yield point
+
+                previous_uuids = current_uuids
+                del points
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def gather_reads(
+            self,
+            queries: Iterable[HealthReadQuery | tuple],
+            max_concurrency: int = 4,
+            deadline: Optional[float] = None,
+            as_points: bool = False,
+            as_series: bool = False,
+            wire_format: str = "json",
+            wait_timeout: Optional[float] = 25
+    ) -> Dict[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType, Any]:
+        """
+        Runs several reads concurrently and returns their results keyed by type.
+
+        Each query is split into one `get_health_data_from_types_async` call per type, and at most
+        `max_concurrency` of them are in flight at the same time, so the total latency approaches
+        that of the slowest single read instead of the sum of all of them.
+
+        Usage:
+            results = await health.gather_reads(
+                [
+                    HealthReadQuery([HealthDataTypeAndroid.HEART_RATE, HealthDataTypeAndroid.STEPS], start, end),
+                    HealthReadQuery(HealthDataTypeAndroid.WEIGHT, start - timedelta(days=30), end),
+                ],
+                max_concurrency=3,
+                deadline=5,
+            )
+            steps = results.get(HealthDataTypeAndroid.STEPS, [])
+
+        :param queries: `HealthReadQuery` instances, or tuples of (types, start_time, end_time[, recording_method]).
+        :param max_concurrency: Maximum number of reads in flight at the same time.
+        :param deadline: Maximum time in seconds for all reads. Reads not finished by then are cancelled (on the native
+            side as well with `Health(native_cancel=True)`) and left out of the result.
+        :param as_points: If True, the results are lists of `HealthDataPoint` instead of dictionaries.
+        :param as_series: If True, the results are columnar `HealthSeries` instead of lists.
+        :param wire_format: 'json' (default) or 'columnar', see `get_health_data_from_types`.
+        :param wait_timeout: Maximum time to wait for each read.
+
+        :return: A dictionary mapping each type to the result of its read.
+            Raises `TimeoutError` if a read runs out of `wait_timeout` or of the current `HealthDeadline`.
+        """
+
+        if max_concurrency < 1:
+            raise ValueError("The 'max_concurrency' argument must be at least 1.")
+
+        planned: Dict[Any, tuple] = {}
+
+        for query in queries:
+            query = HealthReadQuery(*query)
+            types = query.types if isinstance(query.types, (list, tuple)) else [query.types]
+
+            # Validate types
+            encode_types(types)
+
+            for t in types:
+                single = (query.start_time, query.end_time, tuple(query.recording_method or ()))
+                if planned.setdefault(t, single) != single:
+                    raise ValueError(f"The type '{t.value}' appears in more than one query with different arguments.")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def read(t, start_time: datetime, end_time: datetime, recording_method: tuple):
+            async with semaphore:
+                return await self.get_health_data_from_types_async(
+                    types=[t],
+                    start_time=start_time,
+                    end_time=end_time,
+                    recording_method=list(recording_method) or None,
+                    as_points=as_points,
+                    as_series=as_series,
+                    wire_format=wire_format,
+                    wait_timeout=wait_timeout,
+                )
+
+        tasks = {asyncio.ensure_future(read(t, *args)): t for t, args in planned.items()}
+        if not tasks:
+            return {}
+
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+
+        for task in pending:
+            task.cancel()
+
+        if pending:
+            print(f"Error in gather_reads: deadline exceeded for {[tasks[task].value for task in pending]}")
+
+        # Reads timed out by their `wait_timeout` or the current `HealthDeadline` raise, instead of
+        # looking like types without data.
+        errors = [task.exception() for task in tasks if task in done and task.exception() is not None]
+        if errors:
+            raise errors[0]
+
+        return {tasks[task]: task.result() for task in tasks if task in done}
+
     def get_health_interval_data_from_types(
             self,
             start_time: datetime,
@@ -913,8 +1787,12 @@ class Health(Control):
             types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType],
             interval: int,
             recording_method: Optional[List[RecordingMethod]] = None,
-            wait_timeout: Optional[float] = 25
-    ) -> list[Any]:
+            wait_timeout: Optional[float] = 25,
+            *,
+            as_points: bool = False,
+            as_series: bool = False,
+            wire_format: str = "json"
+    ) -> list[Any] | HealthSeries:
         """
         Fetch a list of health data points based on types [HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType].
         You can also specify the [recordingMethodsToFilter] to filter the data points.
@@ -925,36 +1803,42 @@ class Health(Control):
         :param types: A list of HealthDataType enum values to retrieve data for.
         :param interval:
         :param recording_method: An optional list of RecordingMethod strings to filter by.  Valid values: 'unknown', 'active', 'automatic', 'manual'.
+        :param as_points: If True, returns a list of `HealthDataPoint` instead of dictionaries.
+        :param as_series: If True, returns a columnar `HealthSeries` instead of a list.
+        :param wire_format: 'json' (default) or 'columnar' to have the native side send a compact, dictionary-encoded
+            payload decoded straight into columns. Only numeric values are kept; best used with `as_series`.
         :param wait_timeout:
 
         :return: A string representation of the health data, likely in JSON format.  The format will match what's returned by the Dart plugin.  Returns [] if no data found or an error occurred.
+            Raises `TimeoutError` if the native side does not answer within `wait_timeout` or the current `deadline`.
         """
 
         try:
 
-            # Validate recording methods
-            if recording_method and not all(isinstance(rc, RecordingMethod) for rc in recording_method):
-                raise ValueError("The 'recording_method' argument must be an instance of 'RecordingMethod'.")
+            if as_points and as_series:
+                raise ValueError("The 'as_points' and 'as_series' arguments cannot be used together.")
 
-            # Validate types
-            if not all(isinstance(t, HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType) for t in types):
-                raise ValueError("All elements of 'types' must be instances of 'HealthDataTypeAndroid, HealthDataTypeIOS or HealthWorkoutActivityType'.")
+            if wire_format not in WIRE_FORMATS:
+                raise ValueError(f"The 'wire_format' argument must be one of {WIRE_FORMATS}.")
 
-            # Convert types to their string values
-            types_str = [t.value for t in types]
+            # Validate types and convert them to their string values
+            types_str = self._supported_types(encode_types(types))
+            if not types_str:
+                return self._series_result(HealthSeries.from_json([]), as_points, as_series)
 
             # Convert datetimes to milliseconds since epoch
             start_time_ms = int(start_time.timestamp() * 1000)
             end_time_ms = int(end_time.timestamp() * 1000)
 
             # Prepare arguments for the invoke_method call
-            data = json.dumps(
+            data = dumps(
                 {
                     "start_time": start_time_ms,
                     "end_time": end_time_ms,
                     "types": types_str,
                     "interval": interval,
-                    "recording_method": [rm.value for rm in recording_method] if recording_method else [],
+                    "recording_method": encode_recording_methods(recording_method) if recording_method else [],
+                    **({"wire_format": COLUMNAR} if wire_format == COLUMNAR else {}),
                 }
             )
 
@@ -966,7 +1850,19 @@ class Health(Control):
                 wait_timeout=wait_timeout
             )
 
-            return json.loads(result or "[]")
+            if wire_format == COLUMNAR:
+                return self._series_result(self._decode_series(result), as_points, as_series)
+
+            if as_points:
+                return decode_points(result or "[]")
+
+            points = loads(result or "[]")
+
+            return HealthSeries.from_json(points) if as_series else points
+
+        except TimeoutError:
+            # Not reported as an empty result: the data may exist, it was just not read in time.
+            raise
 
         except Exception as e:
             print(f"Error in get_health_interval_data_from_types: {e}")
@@ -979,8 +1875,12 @@ class Health(Control):
             types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType],
             interval: int,
             recording_method: Optional[List[RecordingMethod]] = None,
-            wait_timeout: Optional[float] = 25
-    ) -> list[Any]:
+            wait_timeout: Optional[float] = 25,
+            *,
+            as_points: bool = False,
+            as_series: bool = False,
+            wire_format: str = "json"
+    ) -> list[Any] | HealthSeries:
         """
         Fetch a list of health data points based on types [HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType].
         You can also specify the [recordingMethodsToFilter] to filter the data points.
@@ -991,36 +1891,42 @@ class Health(Control):
         :param types: A list of HealthDataType enum values to retrieve data for.
         :param interval:
         :param recording_method: An optional list of RecordingMethod strings to filter by.  Valid values: 'unknown', 'active', 'automatic', 'manual'.
+        :param as_points: If True, returns a list of `HealthDataPoint` instead of dictionaries.
+        :param as_series: If True, returns a columnar `HealthSeries` instead of a list.
+        :param wire_format: 'json' (default) or 'columnar' to have the native side send a compact, dictionary-encoded
+            payload decoded straight into columns. Only numeric values are kept; best used with `as_series`.
         :param wait_timeout:
 
         :return: A string representation of the health data, likely in JSON format.  The format will match what's returned by the Dart plugin.  Returns [] if no data found or an error occurred.
+            Raises `TimeoutError` if the native side does not answer within `wait_timeout` or the current `deadline`.
         """
 
         try:
 
-            # Validate recording methods
-            if recording_method and not all(isinstance(rc, RecordingMethod) for rc in recording_method):
-                raise ValueError("The 'recording_method' argument must be an instance of 'RecordingMethod'.")
+            if as_points and as_series:
+                raise ValueError("The 'as_points' and 'as_series' arguments cannot be used together.")
 
-            # Validate types
-            if not all(isinstance(t, HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType) for t in types):
-                raise ValueError("All elements of 'types' must be instances of 'HealthDataTypeAndroid, HealthDataTypeIOS or HealthWorkoutActivityType'.")
+            if wire_format not in WIRE_FORMATS:
+                raise ValueError(f"The 'wire_format' argument must be one of {WIRE_FORMATS}.")
 
-            # Convert types to their string values
-            types_str = [t.value for t in types]
+            # Validate types and convert them to their string values
+            types_str = self._supported_types(encode_types(types))
+            if not types_str:
+                return self._series_result(HealthSeries.from_json([]), as_points, as_series)
 
             # Convert datetimes to milliseconds since epoch
             start_time_ms = int(start_time.timestamp() * 1000)
             end_time_ms = int(end_time.timestamp() * 1000)
 
             # Prepare arguments for the invoke_method call
-            data = json.dumps(
+            data = dumps(
                 {
                     "start_time": start_time_ms,
                     "end_time": end_time_ms,
                     "types": types_str,
                     "interval": interval,
-                    "recording_method": [rm.value for rm in recording_method] if recording_method else [],
+                    "recording_method": encode_recording_methods(recording_method) if recording_method else [],
+                    **({"wire_format": COLUMNAR} if wire_format == COLUMNAR else {}),
                 }
             )
 
@@ -1032,7 +1938,19 @@ class Health(Control):
                 wait_timeout=wait_timeout
             )
 
-            return json.loads(result or "[]")
+            if wire_format == COLUMNAR:
+                return self._series_result(self._decode_series(result), as_points, as_series)
+
+            if as_points:
+                return decode_points(result or "[]")
+
+            points = loads(result or "[]")
+
+            return HealthSeries.from_json(points) if as_series else points
+
+        except TimeoutError:
+            # Not reported as an empty result: the data may exist, it was just not read in time.
+            raise
 
         except Exception as e:
             print(f"Error in get_health_interval_data_from_types: {e}")
@@ -1056,7 +1974,7 @@ class Health(Control):
         if recording_method and not isinstance(recording_method, RecordingMethod):
             raise ValueError(f"Invalid recording method: {recording_method}.")
 
-        data = json.dumps(
+        data = dumps(
             {
                 "saturation": saturation,
                 "start_time": int(start_time.timestamp() * 1000),
@@ -1071,6 +1989,9 @@ class Health(Control):
             wait_for_result=True,
             wait_timeout=wait_timeout
         )
+
+        self._invalidate_query_cache(["BLOOD_OXYGEN"])
+
         return result == "true"
 
     async def write_blood_oxygen_async(
@@ -1091,7 +2012,7 @@ class Health(Control):
         if recording_method and not isinstance(recording_method, RecordingMethod):
             raise ValueError(f"Invalid recording method: {recording_method}.")
 
-        data = json.dumps(
+        data = dumps(
             {
                 "saturation": saturation,
                 "start_time": int(start_time.timestamp() * 1000),
@@ -1106,6 +2027,9 @@ class Health(Control):
             wait_for_result=True,
             wait_timeout=wait_timeout
         )
+
+        self._invalidate_query_cache(["BLOOD_OXYGEN"])
+
         return result == "true"
 
     def write_health_data(
@@ -1144,7 +2068,7 @@ class Health(Control):
         :return: True if successful, False otherwise.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "value": value,
                 "types": types.value,
@@ -1162,6 +2086,8 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
+        self._invalidate_query_cache([types])
+
         return result == "true"
 
     async def write_health_data_async(
@@ -1200,7 +2126,7 @@ class Health(Control):
         :return: True if successful, False otherwise.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "value": value,
                 "types": types.value,
@@ -1218,8 +2144,179 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
+        self._invalidate_query_cache([types])
+
         return result == "true"
 
+    @staticmethod
+    def _health_data_records_payload(records: Iterable[HealthDataRecord | Dict[str, Any]]) -> Tuple[str, List[Any], List[list]]:
+        rows = []
+        types = []
+
+        for record in records:
+            if isinstance(record, dict):
+                record = HealthDataRecord(**record)
+
+            type_value = wire_value(DATA_TYPE_VALUES, record.types)
+            if type_value is None:
+                raise ValueError("The 'types' of every record must be an instance of 'HealthDataTypeAndroid' or 'HealthDataTypeIOS'.")
+
+            recording_method = wire_value(RECORDING_METHOD_VALUES, record.recording_method) if record.recording_method else RecordingMethod.UNKNOWN.value
+            if recording_method is None:
+                raise ValueError(f"Invalid recording method: {record.recording_method}.")
+
+            types.append(record.types)
+            rows.append(
+                [
+                    record.value,
+                    type_value,
+                    int(record.start_time.timestamp() * 1000),
+                    int(record.end_time.timestamp() * 1000),
+                    record.unit.value if record.unit else HealthDataUnit.NO_UNIT.value,
+                    recording_method,
+                ]
+            )
+
+        data = dumps(
+            {
+                "fields": _RECORD_FIELDS,
+                "records": rows,
+            }
+        )
+
+        return data, types, rows
+
+    @staticmethod
+    def _health_data_record_calls(rows: List[list]) -> List[Tuple[str, Dict[str, str]]]:
+        # One `write_health_data` call per record, for native sides without `write_health_data_many`.
+        return [("write_health_data", {'data': dumps(dict(zip(_RECORD_FIELDS, row)))}) for row in rows]
+
+    def _write_many_unsupported(self, error: Any) -> None:
+        self._write_many_supported = False
+        print(f"Error in write_health_data_many: {error}. Writing the records one at a time.")
+
+    def write_health_data_many(
+            self,
+            records: Iterable[HealthDataRecord | Dict[str, Any]],
+            wait_timeout: Optional[float] = 25
+    ) -> List[bool]:
+        """
+        Writes many generic health data values in a single native call.
+
+        Each record holds the arguments of `write_health_data` (value, start_time, end_time,
+        types, unit and recording_method), either as a `HealthDataRecord` or as a dictionary.
+        Records are sent as compact rows, in the order given by the `fields` list of the payload.
+
+        Native sides without a `write_health_data_many` handler reject the call: the records are then
+        sent as `write_health_data` calls through `invoke_batch`, and later calls skip the bulk method.
+        Any other failure is raised, since some of the records may already be stored. Inside a `batch()`
+        or a write queue the records are not split and the failure is reported as is.
+
+        :param records: The values to write.
+        :param wait_timeout: The maximum time to wait for the method to complete. Defaults to 25 seconds.
+
+        :return: A list with the success of each record, in the same order as `records`.
+        """
+
+        data, types, rows = self._health_data_records_payload(records)
+
+        if not types:
+            return []
+
+        if self._write_many_supported or _batch_call.get() is not None:
+            try:
+                result = self.invoke_method(
+                    method_name="write_health_data_many",
+                    arguments={'data': data},
+                    wait_for_result=True,
+                    wait_timeout=wait_timeout
+                )
+
+            except Exception as error:
+                # Writing the records again after any other error could store some of them twice.
+                if _batch_call.get() is not None or not unknown_method(error):
+                    raise
+                self._write_many_unsupported(error)
+
+            else:
+                # Nothing was written yet while a batch is being recorded; Flet extensions answer None
+                # to the methods they do not handle.
+                if result is not None or _batch_call.get() is not None:
+                    self._invalidate_query_cache(types)
+
+                    success = loads(result or "[]")
+
+                    return [bool(s) for s in success] + [False] * (len(types) - len(success))
+
+                self._write_many_unsupported("no handler on the native side")
+
+        results = self.invoke_batch(self._health_data_record_calls(rows), wait_timeout=wait_timeout)
+
+        self._invalidate_query_cache(types)
+
+        return [result == "true" for result, _ in results]
+
+    async def write_health_data_many_async(
+            self,
+            records: Iterable[HealthDataRecord | Dict[str, Any]],
+            wait_timeout: Optional[float] = 25
+    ) -> List[bool]:
+        """
+        Writes many generic health data values in a single native call.
+
+        Each record holds the arguments of `write_health_data` (value, start_time, end_time,
+        types, unit and recording_method), either as a `HealthDataRecord` or as a dictionary.
+        Records are sent as compact rows, in the order given by the `fields` list of the payload.
+
+        Native sides without a `write_health_data_many` handler reject the call: the records are then
+        sent as `write_health_data` calls through `invoke_batch`, and later calls skip the bulk method.
+        Any other failure is raised, since some of the records may already be stored. Inside a `batch()`
+        or a write queue the records are not split and the failure is reported as is.
+
+        :param records: The values to write.
+        :param wait_timeout: The maximum time to wait for the method to complete. Defaults to 25 seconds.
+
+        :return: A list with the success of each record, in the same order as `records`.
+        """
+
+        data, types, rows = self._health_data_records_payload(records)
+
+        if not types:
+            return []
+
+        if self._write_many_supported or _batch_call.get() is not None:
+            try:
+                result = await self.invoke_method_async(
+                    method_name="write_health_data_many",
+                    arguments={'data': data},
+                    wait_for_result=True,
+                    wait_timeout=wait_timeout
+                )
+
+            except Exception as error:
+                # Writing the records again after any other error could store some of them twice.
+                if _batch_call.get() is not None or not unknown_method(error):
+                    raise
+                self._write_many_unsupported(error)
+
+            else:
+                # Nothing was written yet while a batch is being recorded; Flet extensions answer None
+                # to the methods they do not handle.
+                if result is not None or _batch_call.get() is not None:
+                    self._invalidate_query_cache(types)
+
+                    success = loads(result or "[]")
+
+                    return [bool(s) for s in success] + [False] * (len(types) - len(success))
+
+                self._write_many_unsupported("no handler on the native side")
+
+        results = await self.invoke_batch_async(self._health_data_record_calls(rows), wait_timeout=wait_timeout)
+
+        self._invalidate_query_cache(types)
+
+        return [result == "true" for result, _ in results]
+
     def write_workout_data(
             self,
             activity_type: HealthWorkoutActivityType,
@@ -1239,7 +2336,7 @@ class Health(Control):
         :return: True if the workout data was successfully added.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "activity_type": activity_type.value,
                 "start_time": int(start_time.timestamp() * 1000),
@@ -1258,6 +2355,9 @@ class Health(Control):
             wait_for_result=True,
             wait_timeout=wait_timeout
         )
+
+        self._invalidate_query_cache(list(_WORKOUT_TYPES))
+
         return result == "true"
 
     async def write_workout_data_async(
@@ -1279,7 +2379,7 @@ class Health(Control):
         :return: True if the workout data was successfully added.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "activity_type": activity_type.value,
                 "start_time": int(start_time.timestamp() * 1000),
@@ -1298,6 +2398,9 @@ class Health(Control):
             wait_for_result=True,
             wait_timeout=wait_timeout
         )
+
+        self._invalidate_query_cache(list(_WORKOUT_TYPES))
+
         return result == "true"
 
     def write_blood_pressure(
@@ -1314,7 +2417,7 @@ class Health(Control):
         :return: True if successful, false otherwise.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "systolic": systolic,
                 "diastolic": diastolic,
@@ -1329,6 +2432,9 @@ class Health(Control):
             wait_for_result=True,
             wait_timeout=wait_timeout
         )
+
+        self._invalidate_query_cache(["BLOOD_PRESSURE_SYSTOLIC", "BLOOD_PRESSURE_DIASTOLIC"])
+
         return result == "true"
 
     async def write_blood_pressure_async(
@@ -1345,7 +2451,7 @@ class Health(Control):
         :return: True if successful, false otherwise.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "systolic": systolic,
                 "diastolic": diastolic,
@@ -1360,6 +2466,9 @@ class Health(Control):
             wait_for_result=True,
             wait_timeout=wait_timeout
         )
+
+        self._invalidate_query_cache(["BLOOD_PRESSURE_SYSTOLIC", "BLOOD_PRESSURE_DIASTOLIC"])
+
         return result == "true"
 
     def write_meal(
@@ -1418,7 +2527,7 @@ class Health(Control):
         :return: True if successful, False otherwise.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "meal_type": meal_type.value,
                 "start_time": int(start_time.timestamp() * 1000),
@@ -1476,6 +2585,8 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
+        self._invalidate_query_cache(list(_MEAL_TYPES))
+
         return result == "true"
 
     async def write_meal_async(
@@ -1534,7 +2645,7 @@ class Health(Control):
         :return: True if successful, False otherwise.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "meal_type": meal_type.value,
                 "start_time": int(start_time.timestamp() * 1000),
@@ -1592,6 +2703,8 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
+        self._invalidate_query_cache(list(_MEAL_TYPES))
+
         return result == "true"
 
     def write_audiogram(
@@ -1615,7 +2728,7 @@ class Health(Control):
         if platform == 'android':
             raise ValueError('writeAudiogram is not supported on Android')
 
-        data = json.dumps(
+        data = dumps(
             {
                 "frequencies": frequencies,
                 "left_ear_sensitivities": left_ear_sensitivities,
@@ -1632,6 +2745,9 @@ class Health(Control):
             wait_for_result=True,
             wait_timeout=wait_timeout
         )
+
+        self._invalidate_query_cache(["AUDIOGRAM"])
+
         return result == "true"
 
     async def write_audiogram_async(
@@ -1655,7 +2771,7 @@ class Health(Control):
         if platform == 'android':
             raise ValueError('writeAudiogram is not supported on Android')
 
-        data = json.dumps(
+        data = dumps(
             {
                 "frequencies": frequencies,
                 "left_ear_sensitivities": left_ear_sensitivities,
@@ -1672,6 +2788,9 @@ class Health(Control):
             wait_for_result=True,
             wait_timeout=wait_timeout
         )
+
+        self._invalidate_query_cache(["AUDIOGRAM"])
+
         return result == "true"
 
     def write_menstruation_flow(
@@ -1689,7 +2808,7 @@ class Health(Control):
         :return: True if successful, False otherwise.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "flow": flow.value,
                 "start_time": int(start_time.timestamp() * 1000),
@@ -1705,6 +2824,9 @@ class Health(Control):
             wait_for_result=True,
             wait_timeout=wait_timeout
         )
+
+        self._invalidate_query_cache(["MENSTRUATION_FLOW"])
+
         return result == "true"
 
     async def write_menstruation_flow_async(
@@ -1722,7 +2844,7 @@ class Health(Control):
         :return: True if successful, False otherwise.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "flow": flow.value,
                 "start_time": int(start_time.timestamp() * 1000),
@@ -1738,6 +2860,9 @@ class Health(Control):
             wait_for_result=True,
             wait_timeout=wait_timeout
         )
+
+        self._invalidate_query_cache(["MENSTRUATION_FLOW"])
+
         return result == "true"
 
     def write_insulin_delivery(
@@ -1754,7 +2879,7 @@ class Health(Control):
         :return: True if successful, False otherwise.
         """
 
-        data = json.dumps({
+        data = dumps({
             "units": units,
             "reason": reason,
             "start_time": int(start_time.timestamp() * 1000),
@@ -1768,6 +2893,8 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
+        self._invalidate_query_cache(["INSULIN_DELIVERY"])
+
         return result == "true"
 
     async def write_insulin_delivery_async(
@@ -1782,7 +2909,7 @@ class Health(Control):
         No description.
         """
 
-        data = json.dumps({
+        data = dumps({
             "units": units,
             "reason": reason,
             "start_time": int(start_time.timestamp() * 1000),
@@ -1796,22 +2923,34 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
+        self._invalidate_query_cache(["INSULIN_DELIVERY"])
+
         return result == "true"
 
     def remove_duplicates(
             self,
-            points: list[dict],
-            wait_timeout: Optional[float] = 25
-    ) -> list[dict]:
+            points: Iterable[dict | HealthDataPoint],
+            wait_timeout: Optional[float] = 25,
+            local: bool = True
+    ) -> list[dict | HealthDataPoint]:
         """
-        Removes duplicate HealthDataPoint entries using the Dart side method.
+        Removes duplicate HealthDataPoint entries, keeping the first occurrence of each point.
+
+        By default duplicates are removed in Python by hashing the same fields the Dart side
+        compares, without a round-trip. Set `local` to False to use the Dart side method.
 
-        :param points: A list of HealthDataPoint dictionaries (JSON format).
-        :param wait_timeout: Timeout in seconds to wait for the method result.
-        :return: A list of deduplicated HealthDataPoint dictionaries.
+        :param points: HealthDataPoint dictionaries (JSON format) or `HealthDataPoint` instances.
+        :param wait_timeout: Timeout in seconds to wait for the method result (Dart side only).
+        :param local: If False, the points are sent to the Dart side to be deduplicated.
+        :return: A list of deduplicated points, of the same kind as the given ones.
         """
 
-        data = json.dumps(points)
+        if local:
+            return list(unique_points(points))
+
+        points = list(points)
+        as_points = bool(points) and isinstance(points[0], HealthDataPoint)
+        data = dumps([p.to_json() if isinstance(p, HealthDataPoint) else p for p in points])
 
         result = self.invoke_method(
             method_name="remove_duplicates",
@@ -1820,22 +2959,34 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
-        return json.loads(result or "[]")
+        unique = loads(result or "[]")
+
+        return HealthDataPoint.from_json_list(unique) if as_points else unique
 
     async def remove_duplicates_async(
             self,
-            points: list[dict],
-            wait_timeout: Optional[float] = 25
-    ) -> list[dict]:
+            points: Iterable[dict | HealthDataPoint],
+            wait_timeout: Optional[float] = 25,
+            local: bool = True
+    ) -> list[dict | HealthDataPoint]:
         """
-        Asynchronously removes duplicate HealthDataPoint entries using the Dart side method.
+        Asynchronously removes duplicate HealthDataPoint entries, keeping the first occurrence of each point.
+
+        By default duplicates are removed in Python by hashing the same fields the Dart side
+        compares, without a round-trip. Set `local` to False to use the Dart side method.
 
-        :param points: A list of HealthDataPoint dictionaries (JSON format).
-        :param wait_timeout: Timeout in seconds to wait for the method result.
-        :return: A list of deduplicated HealthDataPoint dictionaries.
+        :param points: HealthDataPoint dictionaries (JSON format) or `HealthDataPoint` instances.
+        :param wait_timeout: Timeout in seconds to wait for the method result (Dart side only).
+        :param local: If False, the points are sent to the Dart side to be deduplicated.
+        :return: A list of deduplicated points, of the same kind as the given ones.
         """
 
-        data = json.dumps(points)
+        if local:
+            return list(unique_points(points))
+
+        points = list(points)
+        as_points = bool(points) and isinstance(points[0], HealthDataPoint)
+        data = dumps([p.to_json() if isinstance(p, HealthDataPoint) else p for p in points])
 
         result = await self.invoke_method_async(
             method_name="remove_duplicates",
@@ -1844,7 +2995,9 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
-        return json.loads(result or "[]")
+        unique = loads(result or "[]")
+
+        return HealthDataPoint.from_json_list(unique) if as_points else unique
 
     def delete(
             self,
@@ -1864,7 +3017,7 @@ class Health(Control):
         :return: True if successful, False otherwise.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "types": types.value if types else "",
                 "start_time": int(start_time.timestamp() * 1000),
@@ -1879,6 +3032,8 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
+        self._invalidate_query_cache([types] if types else None)
+
         return result == "true"
 
     async def delete_async(
@@ -1899,7 +3054,7 @@ class Health(Control):
         :return: True if successful, False otherwise.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "types": types.value if types else "",
                 "start_time": int(start_time.timestamp() * 1000),
@@ -1914,6 +3069,8 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
+        self._invalidate_query_cache([types] if types else None)
+
         return result == "true"
 
     def delete_by_uuid(
@@ -1934,7 +3091,7 @@ class Health(Control):
         :return: True if successful, False otherwise.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "uuid": uuid,
                 "types": types.value if types else ""
@@ -1948,6 +3105,8 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
+        self._invalidate_query_cache([types] if types else None)
+
         return result == "true"
 
     async def delete_by_uuid_async(
@@ -1968,7 +3127,7 @@ class Health(Control):
         :return: True if successful, False otherwise.
         """
 
-        data = json.dumps(
+        data = dumps(
             {
                 "uuid": uuid,
                 "types": types.value if types else ""
@@ -1982,6 +3141,8 @@ class Health(Control):
             wait_timeout=wait_timeout
         )
 
+        self._invalidate_query_cache([types] if types else None)
+
         return result == "true"
 
     @property
@@ -0,0 +1,449 @@
+import math
+from array import array
+from bisect import bisect_right
+from datetime import datetime, date, time, timedelta, tzinfo
+from typing import Optional, List, Dict
+from flet_health.health_series import HealthSeries, _numpy
+
+
+BUCKETS = ("hour", "day", "week", "month")
+_HOUR_MS = 3_600_000
+
+
+def _epoch_ms(day: date, tz: Optional[tzinfo]) -> int:
+    return int(datetime.combine(day, time(), tzinfo=tz).timestamp() * 1000)
+
+
+def _local(ms: int, tz: Optional[tzinfo]) -> datetime:
+    return datetime.fromtimestamp(ms / 1000, tz)
+
+
+def bucket_edges(start_ms: int, end_ms: int, by: str = "day", tz: Optional[tzinfo] = None, week_start: int = 0) -> List[int]:
+    """
+    Returns the calendar bucket edges (milliseconds since epoch) covering [start_ms, end_ms].
+
+    Edges fall on local hour, midnight, week start or first of the month in `tz` (the local time
+    zone if None), so buckets follow daylight saving changes: a day may last 23 or 25 hours.
+
+    :param by: One of 'hour', 'day', 'week' or 'month'.
+    :param week_start: First day of the week for 'week' buckets, 0 (Monday) to 6 (Sunday).
+    :return: Sorted edges; bucket `i` is [edges[i], edges[i + 1]).
+    """
+
+    if by not in BUCKETS:
+        raise ValueError(f"The 'by' argument must be one of {BUCKETS}.")
+
+    first = _local(start_ms, tz)
+
+    if by == "hour":
+        # Hours are fixed-length in absolute time; only the first edge depends on the offset.
+        edge = int(first.replace(minute=0, second=0, microsecond=0).timestamp() * 1000)
+        edges = [edge]
+        while edge <= end_ms:
+            edge += _HOUR_MS
+            edges.append(edge)
+        return edges
+
+    day = first.date()
+    if by == "week":
+        day -= timedelta(days=(day.weekday() - week_start) % 7)
+    elif by == "month":
+        day = day.replace(day=1)
+
+    edges = [_epoch_ms(day, tz)]
+    while edges[-1] <= end_ms:
+        if by == "day":
+            day += timedelta(days=1)
+        elif by == "week":
+            day += timedelta(days=7)
+        else:
+            day = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+        edges.append(_epoch_ms(day, tz))
+
+    return edges
+
+
+def _quantile(how: str) -> Optional[float]:
+    if how == "median":
+        return 0.5
+
+    if how.startswith("p"):
+        try:
+            q = float(how[1:]) / 100
+        except ValueError:
+            return None
+        if 0 <= q <= 1:
+            return q
+
+    return None
+
+
+def _percentile(values: List[float], q: float) -> float:
+    # Linear interpolation between the closest ranks, as numpy.percentile does by default.
+    position = (len(values) - 1) * q
+    low = math.floor(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def aggregate(
+        series: HealthSeries,
+        by: str = "day",
+        how: str = "sum",
+        tz: Optional[tzinfo] = None,
+        week_start: int = 0,
+) -> HealthSeries:
+    """
+    Aggregates the numeric values of a series by calendar bucket and type, locally.
+
+    One read of the whole range answers every chart: daily steps over 90 days is
+    `aggregate(series.select(HealthDataTypeAndroid.STEPS), by="day", how="sum")` instead of
+    90 `get_total_steps_in_interval` calls. Rows are assigned to buckets by `date_from`.
+
+    :param series: The data to aggregate.
+    :param by: One of 'hour', 'day', 'week' or 'month'.
+    :param how: One of 'sum', 'mean', 'min', 'max', 'count', 'median' or a percentile such as 'p90'.
+    :param tz: Time zone of the calendar buckets. Defaults to the local time zone.
+    :param week_start: First day of the week for 'week' buckets, 0 (Monday) to 6 (Sunday).
+
+    :return: A new series with one row per non-empty (type, bucket), ordered by type then time,
+        where `date_from` / `date_to` are the bucket edges. Unit and source are taken from the
+        first row of each group.
+    """
+
+    q = _quantile(how)
+    if how not in ("sum", "mean", "min", "max", "count") and q is None:
+        raise ValueError("The 'how' argument must be one of 'sum', 'mean', 'min', 'max', 'count', 'median' or 'pNN'.")
+
+    if by not in BUCKETS:
+        raise ValueError(f"The 'by' argument must be one of {BUCKETS}.")
+
+    result = HealthSeries(types=list(series.types), units=list(series.units), sources=list(series.sources))
+    np = _numpy()
+
+    if np is not None:
+        columns = series.to_numpy()
+        mask = ~np.isnan(columns["value"])
+        if not mask.any():
+            return result
+
+        date_from = columns["date_from"][mask]
+        edges = np.asarray(bucket_edges(int(date_from.min()), int(date_from.max()), by, tz, week_start), dtype=np.int64)
+        buckets = np.searchsorted(edges, date_from, side="right") - 1
+        keys = columns["type_codes"][mask].astype(np.int64) * len(edges) + buckets
+        values = columns["value"][mask]
+
+        # Sorting by (key, value) puts each group in one run, already ordered for percentiles.
+        order = np.lexsort((values, keys))
+        keys, values = keys[order], values[order]
+        groups, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+
+        if how in ("sum", "mean"):
+            out = np.add.reduceat(values, starts)
+            if how == "mean":
+                out = out / counts
+        elif how == "count":
+            out = counts.astype(np.float64)
+        elif how == "min":
+            out = values[starts]
+        elif how == "max":
+            out = values[starts + counts - 1]
+        else:
+            position = (counts - 1) * q
+            low = np.floor(position).astype(np.int64)
+            high = np.minimum(low + 1, counts - 1)
+            out = values[starts + low] + (values[starts + high] - values[starts + low]) * (position - low)
+
+        first = np.minimum.reduceat(np.flatnonzero(mask)[order], starts)
+        bucket = groups % len(edges)
+
+        result.date_from = array("q", edges[bucket].tobytes())
+        result.date_to = array("q", edges[bucket + 1].tobytes())
+        result.value = array("d", np.asarray(out, dtype=np.float64).tobytes())
+        result.type_codes = array("I", columns["type_codes"][first].tobytes())
+        result.unit_codes = array("I", columns["unit_codes"][first].tobytes())
+        result.source_codes = array("I", columns["source_codes"][first].tobytes())
+        return result
+
+    rows = [i for i, v in enumerate(series.value) if v == v]
+    if not rows:
+        return result
+
+    date_from = series.date_from
+    edges = bucket_edges(min(date_from[i] for i in rows), max(date_from[i] for i in rows), by, tz, week_start)
+    groups: Dict[tuple, List[int]] = {}
+
+    for i in rows:
+        key = (series.type_codes[i], bisect_right(edges, date_from[i]) - 1)
+        groups.setdefault(key, []).append(i)
+
+    for (type_code, bucket), indices in sorted(groups.items()):
+        values = sorted(series.value[i] for i in indices)
+
+        if how == "sum":
+            value = math.fsum(values)
+        elif how == "mean":
+            value = math.fsum(values) / len(values)
+        elif how == "count":
+            value = float(len(values))
+        elif how == "min":
+            value = values[0]
+        elif how == "max":
+            value = values[-1]
+        else:
+            value = _percentile(values, q)
+
+        first = indices[0]
+        result.date_from.append(edges[bucket])
+        result.date_to.append(edges[bucket + 1])
+        result.value.append(value)
+        result.type_codes.append(type_code)
+        result.unit_codes.append(series.unit_codes[first])
+        result.source_codes.append(series.source_codes[first])
+
+    return result
+
+
+FILLS = ("nan", "zero", "ffill")
+_RESAMPLE_AGGREGATIONS = ("sum", "mean", "min", "max", "count")
+
+
+def _edges(freq: timedelta | str, low: int, high: int, origin: Optional[int], tz: Optional[tzinfo]) -> List[int]:
+    if isinstance(freq, str):
+        return bucket_edges(low, high, freq, tz)
+
+    step = int(freq.total_seconds() * 1000)
+    if step <= 0:
+        raise ValueError("The 'freq' argument must be a positive timedelta.")
+
+    origin = origin or 0
+    edge = origin + (low - origin) // step * step
+    edges = [edge]
+    while edge <= high:
+        edge += step
+        edges.append(edge)
+
+    return edges
+
+
+def _fill_row(values: List[float], fill: str) -> List[float]:
+    if fill == "zero":
+        return [0.0 if v != v else v for v in values]
+
+    if fill == "ffill":
+        last = math.nan
+        filled = []
+        for v in values:
+            if v == v:
+                last = v
+            filled.append(last)
+        return filled
+
+    return values
+
+
+def resample(
+        series: HealthSeries,
+        freq: timedelta | str,
+        how: str = "mean",
+        fill: Optional[str] = None,
+        split: bool = False,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        origin: Optional[int] = None,
+        tz: Optional[tzinfo] = None,
+) -> HealthSeries:
+    """
+    Resamples a series into regular buckets per type, optionally splitting intervals across
+    bucket edges and filling the empty buckets.
+
+    Usage:
+        hourly = resample(steps, timedelta(hours=1), how="sum", fill="zero", split=True)
+        daily = resample(heart_rate, "day", how="mean", fill="ffill", tz=ZoneInfo("Europe/Lisbon"))
+
+    :param series: The data to resample, e.g. the result of `get_health_interval_data_from_types(..., as_series=True)`.
+    :param freq: A fixed bucket width, or a calendar bucket ('hour', 'day', 'week' or 'month') in `tz`.
+    :param how: One of 'mean', 'sum', 'min', 'max' or 'count'.
+    :param fill: How empty buckets are returned: None leaves them out, 'nan' returns NaN, 'zero' returns 0
+        and 'ffill' repeats the last non-empty bucket (NaN before the first one).
+    :param split: If True, a row covering several buckets contributes to each of them by overlap: 'sum' is
+        pro-rated by the overlapping share of its duration, 'mean' is weighted by the overlapping time, and
+        'min', 'max' and 'count' include every row overlapping the bucket. If False, rows only count in the
+        bucket of their `date_from`.
+    :param start_time: Start of the resampled range. Defaults to the first row.
+    :param end_time: End of the resampled range. Defaults to the last row.
+    :param origin: Start of the first fixed-width bucket in milliseconds since epoch. Buckets are aligned to
+        the epoch (UTC) if not specified.
+    :param tz: Time zone of the calendar buckets. Defaults to the local time zone.
+
+    :return: A new series with one row per (type, bucket), ordered by type then time, where `date_from` /
+        `date_to` are the bucket edges. Unit and source are taken from the first row of each type.
+    """
+
+    if how not in _RESAMPLE_AGGREGATIONS:
+        raise ValueError(f"The 'how' argument must be one of {_RESAMPLE_AGGREGATIONS}.")
+
+    if fill is not None and fill not in FILLS:
+        raise ValueError(f"The 'fill' argument must be None or one of {FILLS}.")
+
+    result = HealthSeries(types=list(series.types), units=list(series.units), sources=list(series.sources))
+    rows = [i for i, v in enumerate(series.value) if v == v]
+    if not rows:
+        return result
+
+    date_from, date_to = series.date_from, series.date_to
+    # Intervals are end-exclusive; rows without an end are instants.
+    ends = {i: max(date_to[i] - 1, date_from[i]) if split else date_from[i] for i in rows}
+    low = int(start_time.timestamp() * 1000) if start_time is not None else min(date_from[i] for i in rows)
+    high = int(end_time.timestamp() * 1000) if end_time is not None else max(ends.values())
+    edges = _edges(freq, low, high, origin, tz)
+    first_bucket = bisect_right(edges, low) - 1
+    last_bucket = bisect_right(edges, high) - 1
+
+    np = _numpy()
+    if np is not None:
+        return _resample_numpy(np, series, result, rows, edges, first_bucket, last_bucket, how, fill, split)
+
+    # (type_code, bucket) -> [weighted sum, weight, count, min, max]
+    groups: Dict[tuple, list] = {}
+    first_row: Dict[int, int] = {}
+
+    for i in rows:
+        v = series.value[i]
+        type_code = series.type_codes[i]
+        first_row.setdefault(type_code, i)
+        start, end = date_from[i], date_to[i]
+        duration = end - start if split else 0
+        b = max(bisect_right(edges, start) - 1, first_bucket)
+        last = min(bisect_right(edges, ends[i]) - 1, last_bucket)
+
+        while b <= last:
+            if duration > 0:
+                overlap = min(end, edges[b + 1]) - max(start, edges[b])
+                total = v * overlap / duration if how == "sum" else v * overlap
+                weight = overlap
+            else:
+                total, weight = v, 1
+
+            acc = groups.get((type_code, b))
+            if acc is None:
+                groups[(type_code, b)] = [total, weight, 1, v, v]
+            else:
+                acc[0] += total
+                acc[1] += weight
+                acc[2] += 1
+                if v < acc[3]:
+                    acc[3] = v
+                if v > acc[4]:
+                    acc[4] = v
+            b += 1
+
+    for type_code in sorted(first_row):
+        buckets = range(first_bucket, last_bucket + 1) if fill is not None else sorted(b for t, b in groups if t == type_code)
+        values = []
+
+        for b in buckets:
+            acc = groups.get((type_code, b))
+            if acc is None:
+                values.append(math.nan)
+            elif how == "sum":
+                values.append(acc[0])
+            elif how == "mean":
+                values.append(acc[0] / acc[1])
+            elif how == "count":
+                values.append(float(acc[2]))
+            else:
+                values.append(acc[3] if how == "min" else acc[4])
+
+        first = first_row[type_code]
+        for b, value in zip(buckets, _fill_row(values, fill)):
+            result.date_from.append(edges[b])
+            result.date_to.append(edges[b + 1])
+            result.value.append(value)
+            result.type_codes.append(type_code)
+            result.unit_codes.append(series.unit_codes[first])
+            result.source_codes.append(series.source_codes[first])
+
+    return result
+
+
+def _resample_numpy(np, series, result, rows, edges, first_bucket, last_bucket, how, fill, split) -> HealthSeries:
+    columns = series.to_numpy()
+    rows = np.asarray(rows, dtype=np.int64)
+    edges = np.asarray(edges, dtype=np.int64)
+    start = columns["date_from"][rows]
+    end = columns["date_to"][rows]
+    values = columns["value"][rows]
+    type_codes = columns["type_codes"][rows].astype(np.int64)
+
+    # One piece per (row, overlapped bucket).
+    first = np.searchsorted(edges, start, side="right") - 1
+    if split:
+        last = np.searchsorted(edges, np.maximum(end - 1, start), side="right") - 1
+        duration = end - start
+    else:
+        last = first
+        duration = np.zeros(len(rows), dtype=np.int64)
+
+    first = np.maximum(first, first_bucket)
+    last = np.minimum(last, last_bucket)
+    pieces = np.maximum(last - first + 1, 0)
+    piece_row = np.repeat(np.arange(len(rows)), pieces)
+    bucket = first[piece_row] + np.arange(len(piece_row)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    v = values[piece_row]
+    d = duration[piece_row]
+
+    overlap = np.minimum(end[piece_row], edges[bucket + 1]) - np.maximum(start[piece_row], edges[bucket])
+    weight = np.where(d > 0, overlap, 1).astype(np.float64)
+    if how == "sum":
+        total = np.where(d > 0, v * overlap / np.where(d > 0, d, 1), v)
+    else:
+        total = v * weight
+
+    n_buckets = last_bucket - first_bucket + 1
+    keys = type_codes[piece_row] * n_buckets + (bucket - first_bucket)
+    present = np.unique(type_codes)
+
+    grid = np.full(len(present) * n_buckets, np.nan)
+    slot = np.searchsorted(present, keys // n_buckets) * n_buckets + keys % n_buckets
+
+    if len(slot):
+        if how in ("sum", "mean", "count"):
+            sums = np.bincount(slot, weights=total, minlength=len(grid))
+            weights = np.bincount(slot, weights=weight, minlength=len(grid))
+            counts = np.bincount(slot, minlength=len(grid))
+            out = {"sum": sums, "mean": sums / np.where(counts > 0, weights, 1), "count": counts.astype(np.float64)}[how]
+            grid = np.where(counts > 0, out, np.nan)
+        else:
+            order = np.lexsort((v, slot))
+            slots, starts, sizes = np.unique(slot[order], return_index=True, return_counts=True)
+            grid[slots] = v[order][starts] if how == "min" else v[order][starts + sizes - 1]
+
+    grid = grid.reshape(len(present), n_buckets)
+
+    if fill == "zero":
+        grid = np.where(np.isnan(grid), 0.0, grid)
+    elif fill == "ffill":
+        index = np.where(np.isnan(grid), 0, np.arange(n_buckets))
+        np.maximum.accumulate(index, axis=1, out=index)
+        # Buckets before the first non-empty one point at bucket 0, which is NaN then.
+        grid = np.take_along_axis(grid, index, axis=1)
+
+    # First row (in series order) of each type, for unit and source.
+    first_rows = rows[np.unique(type_codes, return_index=True)[1]]
+    bucket_ids = np.arange(first_bucket, last_bucket + 1)
+
+    if fill is None:
+        type_index, position = np.nonzero(~np.isnan(grid))
+    else:
+        type_index, position = np.divmod(np.arange(grid.size), n_buckets)
+
+    b = bucket_ids[position]
+    result.date_from = array("q", edges[b].tobytes())
+    result.date_to = array("q", edges[b + 1].tobytes())
+    result.value = array("d", np.ascontiguousarray(grid[type_index, position], dtype=np.float64).tobytes())
+    result.type_codes = array("I", present[type_index].astype(np.uint32).tobytes())
+    result.unit_codes = array("I", columns["unit_codes"][first_rows[type_index]].tobytes())
+    result.source_codes = array("I", columns["source_codes"][first_rows[type_index]].tobytes())
+
+    return result
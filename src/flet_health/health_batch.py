@@ -0,0 +1,183 @@
+from contextvars import ContextVar
+from typing import Optional, Any, List, Dict, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from flet_health.flet_health import Health
+
+
+# Set while a `Health` method is being recorded into (or replayed from) a batch.
+_batch_call: ContextVar[Optional["HealthBatchCall"]] = ContextVar("flet_health_batch_call", default=None)
+
+
+def _recording() -> bool:
+    """True while a call is being recorded into a batch, when native results are not available yet."""
+
+    call = _batch_call.get()
+    return call is not None and call._replay is None
+
+
+# Error messages of native sides without a handler for the called method (Flet extensions, Flutter plugins).
+_UNKNOWN_METHOD_ERRORS = ("unknown method", "missingpluginexception", "no implementation found", "not implemented")
+
+
+def unknown_method(error: Exception) -> bool:
+    """
+    True if `error` says the native side has no handler for the called method, so it did not run it.
+    Any other error may come after the call was (partly) applied.
+    """
+
+    message = str(error).lower()
+    return any(marker in message for marker in _UNKNOWN_METHOD_ERRORS)
+
+
+class HealthBatchCall:
+    """
+    Handle for a single operation queued in a `HealthBatch`.
+
+    The `value` is available after the batch has been committed and holds exactly what the
+    equivalent direct `Health` method call would have returned.
+    """
+
+    def __init__(self, method, args: tuple, kwargs: dict):
+        self._method = method
+        self._args = args
+        self._kwargs = kwargs
+        self.method_name: Optional[str] = None
+        self.arguments: Optional[Dict[str, str]] = None
+        self.value: Any = None
+        self.error: Optional[str] = None
+        self.done: bool = False
+        self._replay: Optional[Tuple[Optional[str], Optional[str]]] = None
+
+    def _capture(self, method_name: str, arguments: Optional[Dict[str, str]]) -> Optional[str]:
+        if self._replay is not None:
+            result, error = self._replay
+            if error:
+                raise Exception(error)
+            return result
+
+        if self.method_name is not None:
+            raise RuntimeError(f"'{self._method.__name__}' invokes more than one native method and cannot be batched.")
+
+        self.method_name = method_name
+        self.arguments = arguments
+        return None
+
+    def _resolve(self, result: Optional[str], error: Optional[str]) -> None:
+        self._replay = (result, error)
+        self.error = error or None
+        token = _batch_call.set(self)
+
+        try:
+            self.value = self._method(*self._args, **self._kwargs)
+        except Exception as exc:
+            self.error = self.error or str(exc)
+            self.value = None
+        finally:
+            _batch_call.reset(token)
+
+        self.done = True
+
+    def __repr__(self):
+        return f"HealthBatchCall(method_name={self.method_name!r}, done={self.done}, value={self.value!r}, error={self.error!r})"
+
+
+class HealthBatch:
+    """
+    Collects several `Health` operations and sends them to the Flutter side in a single
+    `invoke_batch` method call.
+
+    Any `Health` method can be queued by calling it on the batch with the usual arguments.
+    Each call returns a `HealthBatchCall` whose `value` is filled in when the batch is committed.
+
+    Usage:
+        with health.batch() as batch:
+            steps = batch.write_health_data(types=HealthDataTypeAndroid.STEPS, ...)
+            weight = batch.write_health_data(types=HealthDataTypeAndroid.WEIGHT, ...)
+
+        print(steps.value, weight.value)
+
+    `async with` commits through `invoke_method_async`. Calls that do not need the native
+    side (e.g. platform short-circuits) are resolved immediately and not sent.
+    """
+
+    def __init__(self, health: "Health", wait_timeout: Optional[float] = 25):
+        self._health = health
+        self.wait_timeout = wait_timeout
+        self.calls: List[HealthBatchCall] = []
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        # Recording never blocks, so the sync variant is used for `*_async` names as well.
+        method = getattr(self._health, name[:-len("_async")] if name.endswith("_async") else name, None)
+
+        if not callable(method):
+            raise AttributeError(f"'Health' has no method '{name}'.")
+
+        def record(*args, **kwargs) -> HealthBatchCall:
+            call = HealthBatchCall(method, args, kwargs)
+            token = _batch_call.set(call)
+
+            try:
+                value = method(*args, **kwargs)
+            finally:
+                _batch_call.reset(token)
+
+            if call.method_name is None:
+                call.value = value
+                call.done = True
+            else:
+                self.calls.append(call)
+
+            return call
+
+        return record
+
+    def _pending(self) -> List[HealthBatchCall]:
+        return [call for call in self.calls if not call.done]
+
+    def commit(self) -> List[HealthBatchCall]:
+        """Sends all pending operations in one native call and resolves their handles."""
+
+        pending = self._pending()
+
+        if pending:
+            results = self._health.invoke_batch(
+                [(call.method_name, call.arguments) for call in pending],
+                wait_timeout=self.wait_timeout,
+            )
+            for call, (result, error) in zip(pending, results):
+                call._resolve(result, error)
+
+        return self.calls
+
+    async def commit_async(self) -> List[HealthBatchCall]:
+        """Sends all pending operations in one native call and resolves their handles."""
+
+        pending = self._pending()
+
+        if pending:
+            results = await self._health.invoke_batch_async(
+                [(call.method_name, call.arguments) for call in pending],
+                wait_timeout=self.wait_timeout,
+            )
+            for call, (result, error) in zip(pending, results):
+                call._resolve(result, error)
+
+        return self.calls
+
+    def __enter__(self) -> "HealthBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+
+    async def __aenter__(self) -> "HealthBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.commit_async()
@@ -0,0 +1,62 @@
+import os
+import asyncio
+import warnings
+from typing import Optional
+
+
+# Environment variable enabling the blocking call check when `Health(blocking_check=...)` is not given.
+BLOCKING_CHECK_ENV = "FLET_HEALTH_BLOCKING_CHECK"
+BLOCKING_CHECK_MODES = ("warn", "raise")
+
+
+class HealthBlockingCallWarning(RuntimeWarning):
+    """Emitted when a blocking native call is made on the thread of a running event loop."""
+
+
+class HealthBlockingCallError(RuntimeError):
+    """Raised instead of `HealthBlockingCallWarning` when the blocking call check is set to 'raise'."""
+
+
+def blocking_check_mode(mode: Optional[str] = None) -> Optional[str]:
+    """
+    Returns the validated check mode: `mode`, or the value of the `FLET_HEALTH_BLOCKING_CHECK`
+    environment variable if None. None (check disabled) when neither is set.
+    """
+
+    if mode is None:
+        mode = os.environ.get(BLOCKING_CHECK_ENV, "").strip().lower() or None
+        if mode in ("1", "true"):
+            mode = "warn"
+        elif mode in ("0", "false"):
+            mode = None
+
+    if mode is not None and mode not in BLOCKING_CHECK_MODES:
+        raise ValueError(f"The blocking call check must be one of {BLOCKING_CHECK_MODES}, not '{mode}'.")
+
+    return mode
+
+
+def check_blocking_call(mode: Optional[str], method_name: str) -> None:
+    """
+    Reports a native call about to block the current thread if that thread runs an event loop:
+    nothing else on the loop (UI events, other tasks) runs until the native side answers.
+    """
+
+    if mode is None:
+        return
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    message = (
+        f"Blocking native call '{method_name}' made on the running event loop. "
+        f"Use the '*_async' method instead."
+    )
+
+    if mode == "raise":
+        raise HealthBlockingCallError(message)
+
+    # Points to the code calling the `Health` method (check <- invoke_method <- method <- caller).
+    warnings.warn(message, HealthBlockingCallWarning, stacklevel=4)
@@ -0,0 +1,231 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from heapq import merge
+from operator import itemgetter
+from typing import Optional, Any, List, Dict, Iterable, Tuple
+from flet_health.health_data_point import parse_timestamp_ms
+
+
+CacheKey = Tuple[str, Tuple[str, ...]]
+
+
+class _CacheEntry:
+    __slots__ = ("intervals", "starts", "ends", "points", "uuids", "max_duration")
+
+    def __init__(self):
+        self.intervals: List[List[int]] = []  # sorted, non-overlapping [start, end] in ms
+        self.starts: List[int] = []  # date_from of each point, sorted
+        self.ends: List[int] = []
+        self.points: List[Dict[str, Any]] = []
+        self.uuids = set()
+        self.max_duration = 0
+
+    def missing(self, start: int, end: int) -> List[Tuple[int, int]]:
+        gaps = []
+        cursor = start
+
+        for interval_start, interval_end in self.intervals:
+            if interval_end < cursor:
+                continue
+            if interval_start > end:
+                break
+            if interval_start > cursor:
+                gaps.append((cursor, interval_start))
+            cursor = max(cursor, interval_end)
+            if cursor >= end:
+                break
+
+        if cursor < end:
+            gaps.append((cursor, end))
+
+        return gaps
+
+    def cover(self, start: int, end: int) -> None:
+        merged = []
+        placed = False
+
+        for interval in self.intervals:
+            if interval[1] < start:
+                merged.append(interval)
+            elif interval[0] > end:
+                if not placed:
+                    merged.append([start, end])
+                    placed = True
+                merged.append(interval)
+            else:
+                start = min(start, interval[0])
+                end = max(end, interval[1])
+
+        if not placed:
+            merged.append([start, end])
+
+        self.intervals = merged
+
+    def add(self, points: Iterable[Dict[str, Any]]) -> int:
+        rows = []
+
+        for point in points:
+            uuid = point.get("uuid")
+            if uuid:
+                if uuid in self.uuids:
+                    continue
+                self.uuids.add(uuid)
+
+            date_from = parse_timestamp_ms(point.get("dateFrom")) or 0
+            date_to = parse_timestamp_ms(point.get("dateTo")) or date_from
+            self.max_duration = max(self.max_duration, date_to - date_from)
+            rows.append((date_from, date_to, point))
+
+        if not rows:
+            return 0
+
+        # Sorted once, then appended or merged in a single pass (stable: on equal starts, the
+        # points already cached come first, then the new ones in the order they were given).
+        rows.sort(key=itemgetter(0))
+
+        if not self.starts or rows[0][0] >= self.starts[-1]:
+            self.starts.extend([row[0] for row in rows])
+            self.ends.extend([row[1] for row in rows])
+            self.points.extend([row[2] for row in rows])
+        else:
+            merged = list(merge(zip(self.starts, self.ends, self.points), rows, key=itemgetter(0)))
+            self.starts = [row[0] for row in merged]
+            self.ends = [row[1] for row in merged]
+            self.points = [row[2] for row in merged]
+
+        return len(rows)
+
+    def get(self, start: int, end: int) -> List[Dict[str, Any]]:
+        # Points overlapping [start, end]: the ones starting in range plus longer ones starting earlier.
+        lo = bisect_left(self.starts, start - self.max_duration)
+        hi = bisect_right(self.starts, end)
+        ends, points = self.ends, self.points
+
+        return [points[i] for i in range(lo, hi) if ends[i] >= start]
+
+
+class HealthQueryCache:
+    """
+    An in-memory cache for `get_health_data_from_types` results that remembers which time
+    intervals have already been fetched for each (type, recording_method filter) pair.
+
+    Queries only fetch the sub-ranges that are not covered yet and serve the rest from memory.
+    Entries are evicted in least-recently-used order once `max_points` or `max_entries` is
+    exceeded. `Health` invalidates the entries of a type on any `write_*` / `delete*` call for it.
+
+    A read takes the `generation` before fetching the missing sub-ranges and hands it back to
+    `add`: results fetched before an invalidation of their type are dropped instead of being
+    cached as covering the range.
+
+    Usage:
+        health = Health(query_cache=HealthQueryCache(max_points=200_000))
+
+    Returned dictionaries are shared with the cache and should not be modified.
+    """
+
+    def __init__(self, max_points: int = 100_000, max_entries: int = 64):
+        if max_points < 1 or max_entries < 1:
+            raise ValueError("The 'max_points' and 'max_entries' arguments must be at least 1.")
+
+        self.max_points = max_points
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._size = 0
+        self._generation = 0
+        self._cleared = 0  # generation of the last full invalidation
+        self._invalidated: Dict[str, int] = {}  # type -> generation of its last invalidation
+
+    @staticmethod
+    def key(types: Any, recording_method: Optional[Iterable[Any]] = None) -> CacheKey:
+        """Builds the cache key for a type and an optional list of RecordingMethod."""
+
+        return (
+            getattr(types, "value", types),
+            tuple(sorted(getattr(rm, "value", rm) for rm in recording_method or ())),
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    def generation(self, key: CacheKey) -> int:
+        """Returns the generation to give to `add` for points of `key` about to be fetched."""
+
+        return self._generation
+
+    def _stale(self, key: CacheKey, generation: int) -> bool:
+        return generation < max(self._cleared, self._invalidated.get(key[0], 0))
+
+    def missing(self, key: CacheKey, start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+        """Returns the sub-ranges of [start_ms, end_ms] that still have to be fetched."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return [(start_ms, end_ms)] if start_ms < end_ms else []
+
+        self._entries.move_to_end(key)
+        return entry.missing(start_ms, end_ms)
+
+    def add(
+            self,
+            key: CacheKey,
+            start_ms: int,
+            end_ms: int,
+            points: Iterable[Dict[str, Any]],
+            generation: Optional[int] = None
+    ) -> bool:
+        """
+        Stores the points fetched for [start_ms, end_ms] and marks the range as covered.
+
+        :param generation: The `generation` taken before fetching the points. They are dropped if
+            their type was invalidated since.
+        :return: False if the points were dropped as stale.
+        """
+
+        if generation is not None and self._stale(key, generation):
+            return False
+
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _CacheEntry()
+
+        self._entries.move_to_end(key)
+        self._size += entry.add(points)
+        entry.cover(start_ms, end_ms)
+        self._evict(keep=key)
+        return True
+
+    def get(self, key: CacheKey, start_ms: int, end_ms: int) -> List[Dict[str, Any]]:
+        """Returns the cached points overlapping [start_ms, end_ms]."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return []
+
+        self._entries.move_to_end(key)
+        return entry.get(start_ms, end_ms)
+
+    def invalidate(self, types: Optional[Iterable[Any]] = None) -> None:
+        """Drops the entries of the given types (enum members or their string values), or everything if None."""
+
+        self._generation += 1
+
+        if types is None:
+            self._entries.clear()
+            self._size = 0
+            self._cleared = self._generation
+            return
+
+        values = {getattr(t, "value", t) for t in types}
+        for value in values:
+            self._invalidated[value] = self._generation
+
+        for key in [k for k in self._entries if k[0] in values]:
+            self._size -= len(self._entries.pop(key).points)
+
+    def _evict(self, keep: CacheKey) -> None:
+        while self._entries and (self._size > self.max_points or len(self._entries) > self.max_entries):
+            key = next(iter(self._entries))
+            if key == keep:
+                # The newest entry alone exceeds the limit; it stays until something else is added.
+                break
+            self._size -= len(self._entries.pop(key).points)
@@ -0,0 +1,136 @@
+import json
+from typing import Optional, Any, List, Callable, NamedTuple
+from flet_health.health_data_point import HealthDataPoint
+
+
+class HealthCodec(NamedTuple):
+    """
+    Encoder and decoder used for the JSON payloads exchanged with the Dart side.
+
+    `decode_points` turns a JSON list of HealthDataPoint objects directly into `HealthDataPoint`
+    instances; codecs that cannot do better than dictionaries use `HealthDataPoint.from_json_list`.
+    """
+
+    name: str
+    dumps: Callable[[Any], str]
+    loads: Callable[[str | bytes], Any]
+    decode_points: Callable[[str | bytes], List[HealthDataPoint]]
+
+
+def _json_codec() -> HealthCodec:
+    def decode_points(data: str | bytes) -> List[HealthDataPoint]:
+        return HealthDataPoint.from_json_list(json.loads(data))
+
+    return HealthCodec("json", json.dumps, json.loads, decode_points)
+
+
+def _orjson_codec() -> Optional[HealthCodec]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    orjson_dumps, orjson_loads = orjson.dumps, orjson.loads
+
+    def dumps(obj: Any) -> str:
+        return orjson_dumps(obj).decode()
+
+    def decode_points(data: str | bytes) -> List[HealthDataPoint]:
+        return HealthDataPoint.from_json_list(orjson_loads(data))
+
+    return HealthCodec("orjson", dumps, orjson_loads, decode_points)
+
+
+def _msgspec_codec() -> Optional[HealthCodec]:
+    try:
+        import msgspec
+    except ImportError:
+        return None
+
+    class WirePoint(msgspec.Struct, rename="camel"):
+        uuid: Optional[str] = None
+        value: Any = None
+        type: Optional[str] = None
+        unit: Optional[str] = None
+        date_from: Any = None
+        date_to: Any = None
+        source_platform: Optional[str] = None
+        source_device_id: Optional[str] = None
+        source_id: Optional[str] = None
+        source_name: Optional[str] = None
+        recording_method: Optional[str] = None
+        workout_summary: Any = None
+        metadata: Any = None
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+    points_decoder = msgspec.json.Decoder(List[WirePoint])
+    from_fields = HealthDataPoint.from_fields
+
+    def dumps(obj: Any) -> str:
+        return encoder.encode(obj).decode()
+
+    def decode_points(data: str | bytes) -> List[HealthDataPoint]:
+        # Decodes into typed structs, skipping the intermediate dictionaries.
+        return [
+            from_fields(
+                p.uuid, p.value, p.type, p.unit, p.date_from, p.date_to, p.source_platform,
+                p.source_device_id, p.source_id, p.source_name, p.recording_method, p.workout_summary, p.metadata,
+            )
+            for p in points_decoder.decode(data)
+        ]
+
+    return HealthCodec("msgspec", dumps, decoder.decode, decode_points)
+
+
+_CODECS = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": _json_codec,
+}
+
+_codec: HealthCodec = _orjson_codec() or _msgspec_codec() or _json_codec()
+
+
+def get_codec() -> HealthCodec:
+    """Returns the codec in use: orjson if installed, then msgspec, then the standard library."""
+
+    return _codec
+
+
+def set_codec(codec: str | HealthCodec) -> HealthCodec:
+    """
+    Selects the codec used for the bridge payloads.
+
+    :param codec: One of 'orjson', 'msgspec' or 'json', or a custom `HealthCodec`.
+    :return: The codec now in use.
+    :raises ImportError: If the named codec is not installed.
+    """
+
+    global _codec
+
+    if isinstance(codec, HealthCodec):
+        _codec = codec
+        return _codec
+
+    if codec not in _CODECS:
+        raise ValueError(f"The 'codec' argument must be one of {tuple(_CODECS)} or a 'HealthCodec'.")
+
+    selected = _CODECS[codec]()
+    if selected is None:
+        raise ImportError(f"The '{codec}' codec is not installed. Install it with 'pip install {codec}'.")
+
+    _codec = selected
+    return _codec
+
+
+def dumps(obj: Any) -> str:
+    return _codec.dumps(obj)
+
+
+def loads(data: str | bytes) -> Any:
+    return _codec.loads(data)
+
+
+def decode_points(data: str | bytes) -> List[HealthDataPoint]:
+    return _codec.decode_points(data)
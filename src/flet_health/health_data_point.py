@@ -0,0 +1,314 @@
+import json
+from datetime import datetime
+from typing import Optional, Any, List, Dict, Iterable, Iterator, NamedTuple
+from flet_health.health_data_types import (
+    HealthDataTypeAndroid,
+    HealthDataTypeIOS,
+    HealthWorkoutActivityType,
+    HealthDataUnit,
+    RecordingMethod,
+)
+
+
+class HealthDataRecord(NamedTuple):
+    """A single value to be written with `Health.write_health_data_many`."""
+
+    value: float
+    start_time: datetime
+    end_time: datetime
+    types: HealthDataTypeAndroid | HealthDataTypeIOS
+    unit: Optional[HealthDataUnit] = None
+    recording_method: Optional[RecordingMethod] = None
+
+
+class HealthReadQuery(NamedTuple):
+    """A read to be run with `Health.gather_reads`."""
+
+    types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType] | HealthDataTypeAndroid | HealthDataTypeIOS
+    start_time: datetime
+    end_time: datetime
+    recording_method: Optional[List[RecordingMethod]] = None
+
+
+# Interned lookups from the wire strings to the enum members, built once at import.
+_ANDROID_TYPES: Dict[str, HealthDataTypeAndroid] = {t.value: t for t in HealthDataTypeAndroid}
+_IOS_TYPES: Dict[str, HealthDataTypeIOS] = {t.value: t for t in HealthDataTypeIOS}
+_UNITS: Dict[str, HealthDataUnit] = {u.value: u for u in HealthDataUnit}
+_RECORDING_METHODS: Dict[str, RecordingMethod] = {rm.value: rm for rm in RecordingMethod}
+
+
+def _parse_type(value: Optional[str], source_platform: Optional[str]):
+    if value is None:
+        return None
+
+    if source_platform and "apple" in source_platform.lower():
+        return _IOS_TYPES.get(value) or _ANDROID_TYPES.get(value) or value
+
+    return _ANDROID_TYPES.get(value) or _IOS_TYPES.get(value) or value
+
+
+def parse_timestamp_ms(value: Any) -> Optional[int]:
+    """
+    Converts a timestamp as sent by the Dart side (ISO 8601 string or epoch milliseconds)
+    to milliseconds since epoch. Naive timestamps are interpreted as local time.
+    """
+
+    if value is None or value == "":
+        return None
+
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+
+    return int(datetime.fromisoformat(value).timestamp() * 1000)
+
+
+def _freeze(value: Any) -> Any:
+    """Makes nested values (metadata, non-numeric values) hashable."""
+
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+
+    return value
+
+
+def _json_identity(data: Dict[str, Any]) -> tuple:
+    value = data.get("value")
+    if isinstance(value, dict) and "numericValue" in value:
+        value = value["numericValue"]
+
+    return (
+        data.get("uuid"),
+        _freeze(value),
+        data.get("unit"),
+        data.get("dateFrom"),
+        data.get("dateTo"),
+        data.get("type"),
+        data.get("sourcePlatform"),
+        data.get("sourceDeviceId"),
+        data.get("sourceId"),
+        data.get("sourceName"),
+        data.get("recordingMethod"),
+        _freeze(data.get("metadata")),
+    )
+
+
+def unique_points(points: Iterable[Any]) -> Iterator[Any]:
+    """
+    Yields the points of `points` (HealthDataPoint dictionaries or `HealthDataPoint`) skipping
+    duplicates, keeping the first occurrence and the original order.
+
+    Two points are duplicates when all the fields compared by the Dart `HealthDataPoint`
+    equality match: uuid, value, unit, dateFrom, dateTo, type, sourcePlatform, sourceDeviceId,
+    sourceId, sourceName, recordingMethod and metadata.
+    """
+
+    seen = set()
+    add = seen.add
+
+    for point in points:
+        key = point.identity() if isinstance(point, HealthDataPoint) else _json_identity(point)
+        if key not in seen:
+            add(key)
+            yield point
+
+
+def _format_timestamp(value: Optional[int]) -> Optional[str]:
+    if value is None:
+        return None
+
+    return datetime.fromtimestamp(value / 1000).isoformat(timespec="milliseconds")
+
+
+class HealthDataPoint:
+    """
+    A compact, typed representation of a health data point returned by the read methods.
+
+    Timestamps are stored as milliseconds since epoch. `type`, `unit` and `recording_method`
+    are enum members (the raw string is kept when the value is unknown). For numeric data
+    `value` holds the number itself; any other value (workouts, audiograms, ...) is kept as
+    the dictionary sent by the Dart side.
+    """
+
+    __slots__ = (
+        "uuid",
+        "value",
+        "type",
+        "unit",
+        "date_from",
+        "date_to",
+        "source_platform",
+        "source_device_id",
+        "source_id",
+        "source_name",
+        "recording_method",
+        "workout_summary",
+        "metadata",
+    )
+
+    def __init__(
+            self,
+            uuid: Optional[str] = None,
+            value: Any = None,
+            type: Optional[HealthDataTypeAndroid | HealthDataTypeIOS | str] = None,
+            unit: Optional[HealthDataUnit | str] = None,
+            date_from: Optional[int] = None,
+            date_to: Optional[int] = None,
+            source_platform: Optional[str] = None,
+            source_device_id: Optional[str] = None,
+            source_id: Optional[str] = None,
+            source_name: Optional[str] = None,
+            recording_method: Optional[RecordingMethod | str] = None,
+            workout_summary: Optional[Dict[str, Any]] = None,
+            metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.uuid = uuid
+        self.value = value
+        self.type = type
+        self.unit = unit
+        self.date_from = date_from
+        self.date_to = date_to
+        self.source_platform = source_platform
+        self.source_device_id = source_device_id
+        self.source_id = source_id
+        self.source_name = source_name
+        self.recording_method = recording_method
+        self.workout_summary = workout_summary
+        self.metadata = metadata
+
+    @classmethod
+    def from_fields(
+            cls,
+            uuid: Optional[str],
+            value: Any,
+            type: Optional[str],
+            unit: Optional[str],
+            date_from: Any,
+            date_to: Any,
+            source_platform: Optional[str],
+            source_device_id: Optional[str],
+            source_id: Optional[str],
+            source_name: Optional[str],
+            recording_method: Optional[str],
+            workout_summary: Optional[Dict[str, Any]],
+            metadata: Optional[Dict[str, Any]],
+    ) -> "HealthDataPoint":
+        """Builds a point from the raw wire values of each HealthDataPoint field."""
+
+        if isinstance(value, dict) and "numericValue" in value:
+            value = value["numericValue"]
+
+        return cls(
+            uuid=uuid,
+            value=value,
+            type=_parse_type(type, source_platform),
+            unit=_UNITS.get(unit, unit),
+            date_from=parse_timestamp_ms(date_from),
+            date_to=parse_timestamp_ms(date_to),
+            source_platform=source_platform,
+            source_device_id=source_device_id,
+            source_id=source_id,
+            source_name=source_name,
+            recording_method=_RECORDING_METHODS.get(recording_method, recording_method),
+            workout_summary=workout_summary,
+            metadata=metadata,
+        )
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "HealthDataPoint":
+        """Builds a point from a HealthDataPoint dictionary (JSON format) sent by the Dart side."""
+
+        get = data.get
+
+        return cls.from_fields(
+            get("uuid"),
+            get("value"),
+            get("type"),
+            get("unit"),
+            get("dateFrom"),
+            get("dateTo"),
+            get("sourcePlatform"),
+            get("sourceDeviceId"),
+            get("sourceId"),
+            get("sourceName"),
+            get("recordingMethod"),
+            get("workoutSummary"),
+            get("metadata"),
+        )
+
+    @classmethod
+    def from_json_list(cls, data: Iterable[Dict[str, Any]]) -> List["HealthDataPoint"]:
+        """Builds a list of points from a list of HealthDataPoint dictionaries."""
+
+        from_json = cls.from_json
+        return [from_json(d) for d in data]
+
+    def to_json(self) -> Dict[str, Any]:
+        """Converts the point back to the HealthDataPoint dictionary (JSON format) used by the Dart side."""
+
+        value = self.value
+        if isinstance(value, (int, float)):
+            value = {"__type": "NumericHealthValue", "numericValue": value}
+
+        return {
+            "uuid": self.uuid,
+            "value": value,
+            "type": getattr(self.type, "value", self.type),
+            "unit": getattr(self.unit, "value", self.unit),
+            "dateFrom": _format_timestamp(self.date_from),
+            "dateTo": _format_timestamp(self.date_to),
+            "sourcePlatform": self.source_platform,
+            "sourceDeviceId": self.source_device_id,
+            "sourceId": self.source_id,
+            "sourceName": self.source_name,
+            "recordingMethod": getattr(self.recording_method, "value", self.recording_method),
+            "workoutSummary": self.workout_summary,
+            "metadata": self.metadata,
+        }
+
+    def identity(self) -> tuple:
+        """The fields compared by the Dart `HealthDataPoint` equality, as a hashable tuple."""
+
+        return (
+            self.uuid,
+            _freeze(self.value),
+            self.unit,
+            self.date_from,
+            self.date_to,
+            self.type,
+            self.source_platform,
+            self.source_device_id,
+            self.source_id,
+            self.source_name,
+            self.recording_method,
+            _freeze(self.metadata),
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, HealthDataPoint):
+            return NotImplemented
+        return self.identity() == other.identity()
+
+    def __hash__(self):
+        return hash(self.identity())
+
+    @property
+    def numeric_value(self) -> Optional[float]:
+        """The value as a number, or None if the point does not hold numeric data."""
+
+        value = self.value
+        return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+    @property
+    def start_time(self) -> Optional[datetime]:
+        return datetime.fromtimestamp(self.date_from / 1000) if self.date_from is not None else None
+
+    @property
+    def end_time(self) -> Optional[datetime]:
+        return datetime.fromtimestamp(self.date_to / 1000) if self.date_to is not None else None
+
+    def __repr__(self):
+        type_name = getattr(self.type, "name", self.type)
+        return f"HealthDataPoint(type={type_name}, value={self.value!r}, date_from={self.date_from}, date_to={self.date_to}, uuid={self.uuid!r})"
@@ -0,0 +1,78 @@
+from time import monotonic
+from contextvars import ContextVar
+from typing import Optional
+
+
+# Absolute `time.monotonic()` by which every native call made in the current context must complete.
+_deadline: ContextVar[Optional[float]] = ContextVar("flet_health_deadline", default=None)
+
+# Methods whose native query can be aborted with `Health(native_cancel=True)`: a cancelled or
+# timed-out call sends a "cancel". The native side must implement it; the plugin does not yet.
+CANCELLABLE_PREFIXES = ("get_",)
+
+
+class HealthDeadline:
+    """
+    A single time budget shared by all the `Health` calls made inside it.
+
+    Each native call waits at most for its own `wait_timeout` and for the time left until the
+    deadline, so a multi-call operation (a loop of reads, `gather_reads`, `iter_health_data`, ...)
+    fails with `TimeoutError` as a whole instead of giving every call its full timeout. A call
+    started after the deadline has passed fails immediately, without reaching the native side.
+
+    The deadline follows the context: tasks created inside it (e.g. by `asyncio.gather`) share it.
+    Nested deadlines can only shorten the outer one.
+
+    Usage:
+        with health.deadline(10):
+            steps = await health.get_health_data_from_types_async(...)
+            heart_rate = await health.get_health_data_from_types_async(...)
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at: Optional[float] = None
+        self._token = None
+
+    @property
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the deadline, or None if it has not been entered yet."""
+
+        if self.expires_at is None:
+            return None
+
+        return max(self.expires_at - monotonic(), 0.0)
+
+    def __enter__(self) -> "HealthDeadline":
+        expires_at = monotonic() + self.seconds
+        outer = _deadline.get()
+        self.expires_at = expires_at if outer is None else min(outer, expires_at)
+        self._token = _deadline.set(self.expires_at)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _deadline.reset(self._token)
+        self._token = None
+
+    async def __aenter__(self) -> "HealthDeadline":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.__exit__(exc_type, exc_val, exc_tb)
+
+
+def call_timeout(method_name: str, wait_timeout: Optional[float]) -> Optional[float]:
+    """
+    Returns the timeout of a native call: `wait_timeout`, shortened to the time left until the
+    current deadline. Raises `TimeoutError` if the deadline has already passed.
+    """
+
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return wait_timeout
+
+    remaining = expires_at - monotonic()
+    if remaining <= 0:
+        raise TimeoutError(f"Deadline exceeded before calling {method_name}")
+
+    return remaining if wait_timeout is None else min(wait_timeout, remaining)
@@ -0,0 +1,454 @@
+import json
+import time
+import random
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Any, List, Dict, Iterable, Tuple
+from flet.core.types import PagePlatform
+from flet_health.health_data_point import unique_points
+from flet_health.health_wire import COLUMNAR, encode_columnar
+
+
+_UNITS = {
+    "STEPS": "COUNT",
+    "FLIGHTS_CLIMBED": "COUNT",
+    "HEART_RATE": "BEATS_PER_MINUTE",
+    "RESTING_HEART_RATE": "BEATS_PER_MINUTE",
+    "WEIGHT": "KILOGRAM",
+    "HEIGHT": "METER",
+    "DISTANCE_DELTA": "METER",
+    "DISTANCE_WALKING_RUNNING": "METER",
+    "ACTIVE_ENERGY_BURNED": "KILOCALORIE",
+    "TOTAL_CALORIES_BURNED": "KILOCALORIE",
+    "BLOOD_OXYGEN": "PERCENT",
+    "BODY_FAT_PERCENTAGE": "PERCENT",
+    "BLOOD_GLUCOSE": "MILLIGRAM_PER_DECILITER",
+    "BODY_TEMPERATURE": "DEGREE_CELSIUS",
+    "BLOOD_PRESSURE_SYSTOLIC": "MILLIMETER_OF_MERCURY",
+    "BLOOD_PRESSURE_DIASTOLIC": "MILLIMETER_OF_MERCURY",
+    "WATER": "LITER",
+}
+
+# Methods answering "true" when the fake platform supports them.
+_AVAILABILITY = (
+    "is_health_connect_available",
+    "is_health_data_history_available",
+    "is_health_data_history_authorized",
+    "is_health_data_in_background_available",
+    "request_health_data_history_authorization",
+    "request_health_data_in_background_authorization",
+)
+
+
+def _value(value: Any) -> Any:
+    # DataAccess.WRITE has a tuple value and is sent as a one element list.
+    return value[0] if isinstance(value, list) and len(value) == 1 else value
+
+
+class FakeHealthBackend:
+    """
+    An in-process stand-in for the Flutter side of `Health`, so the Python layer can be driven
+    without a device (tests, benchmarks, CI).
+
+    It replaces the page of a `Health` control and answers every method the control invokes from
+    a synthetic data store: each type has one generated point every `sample_interval`, with
+    deterministic values and uuids, plus the points written through `write_*` methods and minus
+    the deleted ones. Responses have the same shape as the ones of the native side.
+
+    Latency, jitter, payload size and failures can be configured to exercise timeouts, retries
+    and decoding at realistic sizes. Every call is recorded in `calls`, and the `request_id` of
+    every read a `Health(native_cancel=True)` cancels in `cancelled`.
+
+    Usage:
+        health = Health()
+        backend = FakeHealthBackend(platform="android", latency=0.005, sample_interval=timedelta(minutes=1))
+        backend.attach(health)
+        points = health.get_health_data_from_types([HealthDataTypeAndroid.STEPS], start, end)
+    """
+
+    def __init__(
+            self,
+            platform: str = "android",
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            sample_interval: timedelta = timedelta(minutes=5),
+            sample_intervals: Optional[Dict[Any, timedelta]] = None,
+            metadata_bytes: int = 0,
+            failure_rate: float = 0.0,
+            timeout_rate: float = 0.0,
+            fail_methods: Optional[Iterable[str]] = None,
+            granted: bool = True,
+            seed: int = 0,
+    ):
+        """
+        :param platform: Platform reported to `Health`: "android" or "ios".
+        :param latency: Seconds each call takes, on top of the time spent building the response.
+            Calls waiting for a result raise `TimeoutError` after `wait_timeout` if it is shorter.
+        :param jitter: Maximum random variation, in seconds, added to or removed from `latency`.
+        :param sample_interval: Time between two generated points of a type.
+        :param sample_intervals: Per type (enum member or string value) overrides of `sample_interval`.
+            A `None` interval generates no points for that type.
+        :param metadata_bytes: Size of a padding string added to the metadata of every point, to
+            make payloads larger.
+        :param failure_rate: Probability (0 to 1) that a call raises an exception.
+        :param timeout_rate: Probability (0 to 1) that a call raises `TimeoutError`, right away.
+        :param fail_methods: Method names the failure and timeout rates apply to. All if None.
+        :param granted: Whether every permission is initially granted.
+        :param seed: Seed of the jitter and failure random generator.
+        """
+
+        if not 0 <= failure_rate <= 1 or not 0 <= timeout_rate <= 1:
+            raise ValueError("The 'failure_rate' and 'timeout_rate' arguments must be between 0 and 1.")
+
+        if sample_interval <= timedelta(0):
+            raise ValueError("The 'sample_interval' argument must be positive.")
+
+        self.platform = PagePlatform(platform)
+        self.latency = latency
+        self.jitter = jitter
+        self.sample_interval = sample_interval
+        self.sample_intervals = {getattr(t, "value", t): i for t, i in (sample_intervals or {}).items()}
+        self.metadata_bytes = metadata_bytes
+        self.failure_rate = failure_rate
+        self.timeout_rate = timeout_rate
+        self.fail_methods = set(fail_methods) if fail_methods is not None else None
+        self.granted = granted
+        self.calls: List[Tuple[str, Optional[Dict[str, str]]]] = []
+        self.cancelled: List[str] = []
+
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._permissions: set = set()
+        self._written: Dict[str, dict] = {}
+        self._deleted: set = set()
+        self._deleted_ranges: List[Tuple[Optional[str], int, Optional[int]]] = []
+        self._next_uuid = 0
+        self._handlers = {
+            "invoke_batch": self._invoke_batch,
+            "request_authorization": self._request_authorization,
+            "has_permissions": self._has_permissions,
+            "revoke_permissions": self._revoke_permissions,
+            "install_health_connect": lambda data: None,
+            "get_health_connect_sdk_status": lambda data: "HealthConnectSdkStatus.sdkAvailable",
+            "get_total_steps_in_interval": self._get_total_steps_in_interval,
+            "get_health_data_from_types": self._get_health_data,
+            "get_health_interval_data_from_types": self._get_health_data,
+            "get_health_aggregate_data_from_types": self._get_health_data,
+            "write_health_data": self._write_health_data,
+            "write_health_data_many": self._write_health_data_many,
+            "write_blood_oxygen": self._write_blood_oxygen,
+            "write_blood_pressure": self._write_blood_pressure,
+            "write_workout_data": self._write_workout_data,
+            "write_meal": self._write_meal,
+            "write_audiogram": self._write_audiogram,
+            "write_menstruation_flow": self._write_menstruation_flow,
+            "write_insulin_delivery": self._write_insulin_delivery,
+            "remove_duplicates": self._remove_duplicates,
+            "delete_by_uuid": self._delete,
+        }
+        for name in _AVAILABILITY:
+            self._handlers[name] = lambda data: "true"
+
+    def attach(self, control):
+        """Makes `control` (a `Health` instance) send its native calls to this backend."""
+
+        control.page = self
+        return control
+
+    # Page interface used by `Control.invoke_method` / `invoke_method_async`.
+
+    def _invoke_method(
+            self,
+            method_name: str,
+            arguments: Optional[Dict[str, str]] = None,
+            control_id: str = "",
+            wait_for_result: bool = False,
+            wait_timeout: Optional[float] = 5,
+    ) -> Optional[str]:
+        # Calls that do not wait for a result return as soon as they are sent.
+        delay = self._delay() if wait_for_result else 0.0
+        if wait_for_result and wait_timeout is not None and delay > wait_timeout:
+            time.sleep(wait_timeout)
+            raise TimeoutError(f"Timeout waiting for invokeMethod {method_name}({arguments}) call")
+        if delay:
+            time.sleep(delay)
+
+        return self.handle(method_name, arguments)
+
+    async def _invoke_method_async(
+            self,
+            method_name: str,
+            arguments: Optional[Dict[str, str]] = None,
+            control_id: str = "",
+            wait_for_result: bool = False,
+            wait_timeout: Optional[float] = 5,
+    ) -> Optional[str]:
+        # Calls that do not wait for a result return as soon as they are sent.
+        delay = self._delay() if wait_for_result else 0.0
+        if wait_for_result and wait_timeout is not None and delay > wait_timeout:
+            await asyncio.sleep(wait_timeout)
+            raise TimeoutError(f"Timeout waiting for invokeMethod {method_name}({arguments}) call")
+        await asyncio.sleep(delay)
+
+        return self.handle(method_name, arguments)
+
+    def _delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+
+        with self._lock:
+            return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def _inject_failure(self, method_name: str) -> None:
+        if self.fail_methods is not None and method_name not in self.fail_methods:
+            return
+
+        with self._lock:
+            draw = self._random.random()
+
+        if draw < self.timeout_rate:
+            raise TimeoutError(f"Timeout waiting for invokeMethod {method_name} call")
+        if draw < self.timeout_rate + self.failure_rate:
+            raise Exception(f"Injected failure in {method_name}")
+
+    def handle(self, method_name: str, arguments: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """Answers a native call, as the Flutter side would."""
+
+        self.calls.append((method_name, arguments))
+
+        if method_name == "cancel":
+            # The id of the call to abort is a plain argument: there is no payload.
+            with self._lock:
+                self.cancelled.append((arguments or {}).get("request_id"))
+            return None
+
+        self._inject_failure(method_name)
+
+        handler = self._handlers.get(method_name)
+        if handler is None:
+            raise Exception(f"Unknown method: {method_name}")
+
+        data = (arguments or {}).get("data")
+
+        with self._lock:
+            return handler(json.loads(data) if data else {})
+
+    # Synthetic store
+
+    def _interval_ms(self, type_value: str) -> Optional[int]:
+        interval = self.sample_intervals.get(type_value, self.sample_interval)
+        return int(interval.total_seconds() * 1000) if interval else None
+
+    def _point(
+            self,
+            uuid: str,
+            type_value: str,
+            value: Any,
+            start_ms: int,
+            end_ms: int,
+            unit: Optional[str] = None,
+            recording_method: str = "automatic",
+            workout_summary: Optional[dict] = None,
+    ) -> dict:
+        if not isinstance(value, dict):
+            value = {"__type": "NumericHealthValue", "numericValue": value}
+
+        return {
+            "uuid": uuid,
+            "value": value,
+            "type": type_value,
+            "unit": unit or _UNITS.get(type_value, "NO_UNIT"),
+            "dateFrom": datetime.fromtimestamp(start_ms / 1000).isoformat(timespec="milliseconds"),
+            "dateTo": datetime.fromtimestamp(end_ms / 1000).isoformat(timespec="milliseconds"),
+            "sourcePlatform": "googleHealthConnect" if self.platform == PagePlatform.ANDROID else "appleHealth",
+            "sourceDeviceId": "fake-device",
+            "sourceId": "dev.flet.health.fake",
+            "sourceName": "FakeHealthBackend",
+            "recordingMethod": recording_method,
+            "workoutSummary": workout_summary,
+            "metadata": {"padding": "x" * self.metadata_bytes} if self.metadata_bytes else None,
+        }
+
+    def _is_deleted(self, uuid: str, type_value: str, start_ms: int) -> bool:
+        if uuid in self._deleted:
+            return True
+
+        return any(
+            (t is None or t == type_value) and start_ms >= range_start and (range_end is None or start_ms <= range_end)
+            for t, range_start, range_end in self._deleted_ranges
+        )
+
+    def points(self, types: Iterable[Any], start_ms: int, end_ms: int, exclude_recording_methods: Iterable[str] = ()) -> List[dict]:
+        """Returns the points of `types` starting in [start_ms, end_ms), generated and written ones."""
+
+        excluded = set(exclude_recording_methods)
+        points = []
+
+        for type_value in (getattr(t, "value", t) for t in types):
+            interval = self._interval_ms(type_value)
+
+            if interval and "automatic" not in excluded:
+                # Generated points are aligned on multiples of the interval since the epoch.
+                salt = sum(map(ord, type_value))
+                for index in range(-(-start_ms // interval), -(-end_ms // interval)):
+                    uuid = f"{type_value}-{index}"
+                    point_start = index * interval
+                    if self._deleted or self._deleted_ranges:
+                        if self._is_deleted(uuid, type_value, point_start):
+                            continue
+                    value = 50 + (index * 2654435761 + salt) % 1000 / 10
+                    points.append(self._point(uuid, type_value, value, point_start, point_start + interval))
+
+            for point in self._written.values():
+                if point["type"] == type_value and start_ms <= point["_start"] < end_ms and point["recordingMethod"] not in excluded:
+                    points.append({k: v for k, v in point.items() if k != "_start"})
+
+        return points
+
+    def _store(self, type_value: str, value: Any, start_ms: int, end_ms: Optional[int] = None, **fields) -> None:
+        self._next_uuid += 1
+        uuid = f"written-{self._next_uuid}"
+        point = self._point(uuid, type_value, value, start_ms, end_ms if end_ms is not None else start_ms, **fields)
+        point["_start"] = start_ms
+        self._written[uuid] = point
+
+    # Method handlers: each takes the decoded `data` argument and returns the result string.
+
+    def _invoke_batch(self, data: dict) -> str:
+        results = []
+
+        for call in data.get("calls", []):
+            try:
+                result = self.handle(call["method_name"], call.get("arguments") or None)
+                results.append({"result": result})
+            except Exception as error:
+                results.append({"error": str(error)})
+
+        return json.dumps(results)
+
+    def _permission_keys(self, data: dict) -> List[Tuple[str, str]]:
+        types = data.get("types") or []
+        access = data.get("data_access") or ["READ"] * len(types)
+        return [(t, _value(a)) for t, a in zip(types, access)]
+
+    def _request_authorization(self, data: dict) -> str:
+        for type_value, access in self._permission_keys(data):
+            self._permissions.add((type_value, access))
+            if access == "READ_WRITE":
+                self._permissions.update({(type_value, "READ"), (type_value, "WRITE")})
+        return "true"
+
+    def _has_permissions(self, data: dict) -> str:
+        if self.granted:
+            return "true"
+        keys = self._permission_keys(data)
+        return "true" if all(key in self._permissions for key in keys) else "false"
+
+    def _revoke_permissions(self, data: dict) -> str:
+        self.granted = False
+        self._permissions.clear()
+        return "true"
+
+    def _get_total_steps_in_interval(self, data: dict) -> str:
+        points = self.points(["STEPS"], data["start_time"], data["end_time"])
+        return str(int(sum(p["value"]["numericValue"] for p in points)))
+
+    def _get_health_data(self, data: dict) -> str:
+        # Interval and aggregate reads answer with the raw points too. As in the health plugin,
+        # the recording methods given are filtered out.
+        points = self.points(data.get("types", []), data["start_time"], data["end_time"], data.get("recording_method") or ())
+
+        if data.get("wire_format") == COLUMNAR:
+            return encode_columnar(points)
+
+        return json.dumps(points)
+
+    def _write_health_data(self, data: dict) -> str:
+        unit = data.get("unit")
+        self._store(
+            data["types"], data["value"], data["start_time"], data.get("end_time"),
+            unit=unit if unit and unit != "NO_UNIT" else None,
+            recording_method=data.get("recording_method") or "unknown",
+        )
+        return "true"
+
+    def _write_health_data_many(self, data: dict) -> str:
+        fields = data["fields"]
+        for row in data["records"]:
+            self._write_health_data(dict(zip(fields, row)))
+        return json.dumps([True] * len(data["records"]))
+
+    def _write_blood_oxygen(self, data: dict) -> str:
+        self._store("BLOOD_OXYGEN", data["saturation"], data["start_time"], data["end_time"], recording_method=data.get("recording_method", "unknown"))
+        return "true"
+
+    def _write_blood_pressure(self, data: dict) -> str:
+        recording_method = data.get("recording_method", "unknown")
+        self._store("BLOOD_PRESSURE_SYSTOLIC", data["systolic"], data["start_time"], recording_method=recording_method)
+        self._store("BLOOD_PRESSURE_DIASTOLIC", data["diastolic"], data["start_time"], recording_method=recording_method)
+        return "true"
+
+    def _write_workout_data(self, data: dict) -> str:
+        summary = {
+            "workoutType": data["activity_type"],
+            "totalDistance": data.get("total_distance") or 0,
+            "totalEnergyBurned": data.get("total_energy_burned") or 0,
+            "totalSteps": 0,
+        }
+        value = {"__type": "WorkoutHealthValue", "workoutActivityType": data["activity_type"], **summary}
+        self._store("WORKOUT", value, data["start_time"], data["end_time"], unit="NO_UNIT",
+                    recording_method=data.get("recording_method", "unknown"), workout_summary=summary)
+        return "true"
+
+    def _write_meal(self, data: dict) -> str:
+        nutrients = {k: v for k, v in data.items() if k not in ("start_time", "end_time", "recording_method") and v is not None}
+        value = {"__type": "NutritionHealthValue", **nutrients}
+        self._store("NUTRITION", value, data["start_time"], data["end_time"], unit="NO_UNIT", recording_method=data.get("recording_method", "unknown"))
+        return "true"
+
+    def _write_audiogram(self, data: dict) -> str:
+        if self.platform == PagePlatform.ANDROID:
+            raise Exception("writeAudiogram is not supported on Android")
+
+        value = {
+            "__type": "AudiogramHealthValue",
+            "frequencies": data["frequencies"],
+            "leftEarSensitivities": data["left_ear_sensitivities"],
+            "rightEarSensitivities": data["right_ear_sensitivities"],
+        }
+        self._store("AUDIOGRAM", value, data["start_time"], data["end_time"], unit="DECIBEL_HEARING_LEVEL")
+        return "true"
+
+    def _write_menstruation_flow(self, data: dict) -> str:
+        value = {"__type": "MenstruationFlowHealthValue", "flow": data["flow"], "isStartOfCycle": data.get("is_start_of_cycle")}
+        self._store("MENSTRUATION_FLOW", value, data["start_time"], data["end_time"], unit="NO_UNIT", recording_method=data.get("recording_method", "unknown"))
+        return "true"
+
+    def _write_insulin_delivery(self, data: dict) -> str:
+        if self.platform == PagePlatform.ANDROID:
+            raise Exception("writeInsulinDelivery is not supported on Android")
+
+        self._store("INSULIN_DELIVERY", data["units"], data["start_time"], data["end_time"], unit="INTERNATIONAL_UNIT")
+        return "true"
+
+    def _remove_duplicates(self, data: Any) -> str:
+        return json.dumps(list(unique_points(data)))
+
+    def _delete(self, data: dict) -> str:
+        type_value = data.get("types") or None
+
+        if "uuid" in data:
+            uuid = data["uuid"]
+            self._written.pop(uuid, None)
+            self._deleted.add(uuid)
+            return "true"
+
+        start_ms, end_ms = data["start_time"], data.get("end_time")
+        self._deleted_ranges.append((type_value, start_ms, end_ms))
+
+        for uuid, point in list(self._written.items()):
+            if (type_value is None or point["type"] == type_value) and point["_start"] >= start_ms and (end_ms is None or point["_start"] <= end_ms):
+                del self._written[uuid]
+
+        return "true"
@@ -0,0 +1,291 @@
+import asyncio
+import threading
+from time import perf_counter
+from contextvars import ContextVar
+from typing import Optional, Any, Dict, Tuple, Callable, Awaitable, NamedTuple
+
+
+class Histogram:
+    """
+    A log-linear (HDR-style) histogram of non-negative integers.
+
+    Values are counted in buckets whose width grows with the value, so memory stays small over
+    any range while every recorded value is known within about 1 / 2 ** (`significant_bits` - 1)
+    of its magnitude (1.6% with the default).
+    """
+
+    __slots__ = ("significant_bits", "_counts", "count", "total", "min", "max")
+
+    def __init__(self, significant_bits: int = 7):
+        self.significant_bits = significant_bits
+        self._counts: Dict[Tuple[int, int], int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def record(self, value: float) -> None:
+        value = max(0, int(value))
+        shift = max(0, value.bit_length() - self.significant_bits)
+        key = (shift, value >> shift)
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        if other.significant_bits != self.significant_bits:
+            raise ValueError("Only histograms with the same precision can be merged.")
+
+        for key, n in other._counts.items():
+            self._counts[key] = self._counts.get(key, 0) + n
+
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Returns the value below which a fraction `q` (0 to 1) of the recorded values fall."""
+
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+
+        # Keys sort in value order: higher shifts hold strictly larger values.
+        for (shift, mantissa), n in sorted(self._counts.items()):
+            seen += n
+            if seen >= rank:
+                low = mantissa << shift
+                middle = low + ((1 << shift) - 1) / 2
+                return min(max(middle, self.min), self.max)
+
+        return float(self.max)
+
+    def summary(self, scale: float = 1.0) -> Dict[str, Optional[float]]:
+        """count, min, max, mean and p50 / p90 / p99 / p999, with values multiplied by `scale`."""
+
+        def scaled(value):
+            return value * scale if value is not None else None
+
+        return {
+            "count": self.count,
+            "min": scaled(self.min),
+            "max": scaled(self.max),
+            "mean": scaled(self.mean),
+            "p50": scaled(self.percentile(0.5)),
+            "p90": scaled(self.percentile(0.9)),
+            "p99": scaled(self.percentile(0.99)),
+            "p999": scaled(self.percentile(0.999)),
+        }
+
+
+class HealthCallMetric(NamedTuple):
+    """One native call, as passed to a metrics exporter. Times are in seconds."""
+
+    method_name: str
+    bytes_out: int
+    bytes_in: int
+    encode_time: float
+    bridge_time: float
+    error: Optional[BaseException] = None
+
+    @property
+    def timed_out(self) -> bool:
+        return isinstance(self.error, TimeoutError)
+
+    @property
+    def cancelled(self) -> bool:
+        return isinstance(self.error, asyncio.CancelledError)
+
+
+class _MethodMetrics:
+    __slots__ = ("calls", "errors", "timeouts", "cancelled", "bridge", "encode", "decode", "bytes_out", "bytes_in")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.bridge = Histogram()  # microseconds
+        self.encode = Histogram()
+        self.decode = Histogram()
+        self.bytes_out = Histogram()
+        self.bytes_in = Histogram()
+
+
+class HealthMetrics:
+    """
+    Per-method statistics of the native calls made by a `Health` control: number of calls,
+    errors, timeouts and cancellations, and histograms of bridge wait time, payload encode / decode time and
+    payload sizes in and out.
+
+    `exporter`, if set, is called with a `HealthCallMetric` after every native call (e.g. to
+    forward it to a logging or telemetry system). It runs on the calling thread and should be fast.
+    """
+
+    def __init__(self, exporter: Optional[Callable[[HealthCallMetric], None]] = None):
+        self.exporter = exporter
+        self._lock = threading.Lock()
+        self._methods: Dict[str, _MethodMetrics] = {}
+
+    def _method(self, method_name: str) -> _MethodMetrics:
+        metrics = self._methods.get(method_name)
+        if metrics is None:
+            metrics = self._methods[method_name] = _MethodMetrics()
+        return metrics
+
+    def record_call(self, metric: HealthCallMetric) -> None:
+        with self._lock:
+            m = self._method(metric.method_name)
+            m.calls += 1
+            m.bridge.record(metric.bridge_time * 1e6)
+            m.encode.record(metric.encode_time * 1e6)
+            m.bytes_out.record(metric.bytes_out)
+
+            if metric.error is not None:
+                m.errors += 1
+                if metric.timed_out:
+                    m.timeouts += 1
+                elif metric.cancelled:
+                    m.cancelled += 1
+            else:
+                m.bytes_in.record(metric.bytes_in)
+
+        if self.exporter is not None:
+            try:
+                self.exporter(metric)
+            except Exception as error:
+                print(f"Error in HealthMetrics exporter: {error}")
+
+    def record_decode(self, method_name: str, seconds: float) -> None:
+        with self._lock:
+            self._method(method_name).decode.record(seconds * 1e6)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns, for each method name, its counters and histogram summaries. Times are in
+        milliseconds, sizes in bytes.
+        """
+
+        with self._lock:
+            return {
+                name: {
+                    "calls": m.calls,
+                    "errors": m.errors,
+                    "timeouts": m.timeouts,
+                    "cancelled": m.cancelled,
+                    "bridge_ms": m.bridge.summary(1e-3),
+                    "encode_ms": m.encode.summary(1e-3),
+                    "decode_ms": m.decode.summary(1e-3),
+                    "bytes_out": m.bytes_out.summary(),
+                    "bytes_in": m.bytes_in.summary(),
+                }
+                for name, m in self._methods.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._methods.clear()
+
+
+# Payloads are encoded before the method name is known, and decoded after the call returned:
+# encode time is accumulated until the next native call, decode time is attributed to the last one.
+_encode_time: ContextVar[float] = ContextVar("flet_health_encode_time", default=0.0)
+_last_call: ContextVar[Optional[Tuple[HealthMetrics, str]]] = ContextVar("flet_health_last_call", default=None)
+
+
+def take_encode_time() -> float:
+    """Returns the encode time accumulated since the last native call and resets it."""
+
+    encode_time = _encode_time.get()
+    _encode_time.set(0.0)
+    return encode_time
+
+
+def set_last_call(metrics: Optional[HealthMetrics], method_name: str) -> None:
+    """Attributes the payloads decoded from now on to `method_name`."""
+
+    _last_call.set((metrics, method_name) if metrics is not None else None)
+
+
+def timed_encoder(encode: Callable[..., Any]) -> Callable[..., Any]:
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return encode(*args, **kwargs)
+        finally:
+            _encode_time.set(_encode_time.get() + perf_counter() - start)
+
+    return wrapper
+
+
+def timed_decoder(decode: Callable[..., Any]) -> Callable[..., Any]:
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return decode(*args, **kwargs)
+        finally:
+            last = _last_call.get()
+            if last is not None:
+                last[0].record_decode(last[1], perf_counter() - start)
+
+    return wrapper
+
+
+def _payload_size(arguments: Optional[Dict[str, Any]]) -> int:
+    return sum(len(str(v)) for v in arguments.values() if v is not None) if arguments else 0
+
+
+def measure_call(
+        metrics: HealthMetrics,
+        method_name: str,
+        arguments: Optional[Dict[str, Any]],
+        encode_time: float,
+        call: Callable[[], Any]
+) -> Any:
+    """Runs a native call, recording it into `metrics`."""
+
+    start = perf_counter()
+
+    try:
+        result = call()
+    except BaseException as error:
+        metrics.record_call(HealthCallMetric(method_name, _payload_size(arguments), 0, encode_time, perf_counter() - start, error))
+        raise
+
+    metrics.record_call(HealthCallMetric(method_name, _payload_size(arguments), len(result or ""), encode_time, perf_counter() - start))
+    return result
+
+
+async def measure_call_async(
+        metrics: HealthMetrics,
+        method_name: str,
+        arguments: Optional[Dict[str, Any]],
+        encode_time: float,
+        call: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Awaits a native call, recording it into `metrics`."""
+
+    start = perf_counter()
+
+    try:
+        result = await call()
+    except BaseException as error:
+        metrics.record_call(HealthCallMetric(method_name, _payload_size(arguments), 0, encode_time, perf_counter() - start, error))
+        raise
+
+    metrics.record_call(HealthCallMetric(method_name, _payload_size(arguments), len(result or ""), encode_time, perf_counter() - start))
+    return result
@@ -0,0 +1,102 @@
+import time
+from typing import Optional, Any, List, Dict, Tuple, Iterable, Callable
+from flet_health.health_data_types import DataAccess
+
+
+PermissionKey = Tuple[str, str]
+
+# A granted READ_WRITE also grants READ and WRITE on their own.
+_IMPLIED = {
+    DataAccess.READ_WRITE.value: (DataAccess.READ.value, DataAccess.WRITE.value),
+}
+
+
+class HealthPermissionCache:
+    """
+    Remembers the permission state of each (type, DataAccess) pair, so screens can check
+    permissions on every mount without a native round-trip.
+
+    `Health` fills it from `has_permissions` and `request_authorization` results and clears it on
+    `revoke_permissions`. Entries expire after `ttl` seconds. Permissions can also change while
+    the app is in the background, so the cache should be cleared when the app resumes:
+
+    Usage:
+        health = Health(permission_cache=HealthPermissionCache(ttl=600))
+        page.on_app_lifecycle_state_change = health.permission_cache.on_app_lifecycle_state_change
+        await health.prefetch_permissions_async([HealthDataTypeAndroid.STEPS, HealthDataTypeAndroid.WEIGHT])
+    """
+
+    def __init__(self, ttl: Optional[float] = 300, clock: Callable[[], float] = time.monotonic):
+        """
+        :param ttl: Seconds an entry stays valid, or None to keep entries until invalidated.
+        :param clock: Monotonic time source, in seconds.
+        """
+
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[PermissionKey, Tuple[Optional[bool], float]] = {}
+
+    @staticmethod
+    def _keys(types: Iterable[Any], data_access: Iterable[Any]) -> List[PermissionKey]:
+        return [(getattr(t, "value", t), getattr(da, "value", da)) for t, da in zip(types, data_access)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, types: Iterable[Any], data_access: Iterable[Any]) -> Tuple[bool, Optional[bool]]:
+        """
+        Combines the cached states of all (type, data_access) pairs the way `has_permissions` does.
+
+        :return: (hit, value): `hit` is False if any pair is missing or expired.
+        """
+
+        now = self._clock()
+        states = []
+
+        for key in self._keys(types, data_access):
+            entry = self._entries.get(key)
+            if entry is None or (entry[1] is not None and entry[1] <= now):
+                self._entries.pop(key, None)
+                return False, None
+            states.append(entry[0])
+
+        if False in states:
+            return True, False
+        if None in states:
+            return True, None
+        return True, True
+
+    def store(self, types: Iterable[Any], data_access: Iterable[Any], value: Optional[bool]) -> None:
+        """
+        Records a `has_permissions` result. A True result applies to every pair; False or None
+        only identifies the pair when a single one was checked.
+        """
+
+        keys = self._keys(types, data_access)
+        if value is not True and len(keys) != 1:
+            return
+
+        expires = self._clock() + self.ttl if self.ttl is not None else None
+
+        for type_value, access in keys:
+            self._entries[(type_value, access)] = (value, expires)
+            if value is True:
+                for implied in _IMPLIED.get(access, ()):
+                    self._entries[(type_value, implied)] = (True, expires)
+
+    def invalidate(self, types: Optional[Iterable[Any]] = None) -> None:
+        """Drops the entries of the given types (enum members or their string values), or everything if None."""
+
+        if types is None:
+            self._entries.clear()
+            return
+
+        values = {getattr(t, "value", t) for t in types}
+        for key in [k for k in self._entries if k[0] in values]:
+            del self._entries[key]
+
+    def on_app_lifecycle_state_change(self, e) -> None:
+        """Page event handler clearing the cache when the app resumes."""
+
+        if getattr(getattr(e, "state", None), "value", None) in ("resume", "show"):
+            self.invalidate()
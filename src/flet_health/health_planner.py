@@ -0,0 +1,148 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional, Any, List, Dict, Iterable, Tuple
+from flet_health.health_series import HealthSeries
+
+
+_HOUR_MS = 3_600_000
+
+
+def _type_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def count_by_type(points: Any) -> Counter:
+    """Counts the points of a read result (dictionaries, `HealthDataPoint` or `HealthSeries`) per type string."""
+
+    if isinstance(points, HealthSeries):
+        codes = Counter(points.type_codes)
+        return Counter({_type_value(points.types[code]): n for code, n in codes.items()})
+
+    return Counter(
+        _type_value(p.get("type") if isinstance(p, dict) else p.type)
+        for p in points
+    )
+
+
+class HealthQueryPlanner:
+    """
+    Learns how dense each health data type is and sizes the time windows of chunked reads so
+    each native call returns about `target_bytes`.
+
+    Every read observed updates an exponentially weighted average of points per hour and bytes
+    per point for each type. A window for a set of types is then
+    `target_bytes / sum(points_per_hour * bytes_per_point)` hours long, clamped between
+    `min_chunk` and `max_chunk`: STEPS ends up with short windows, WEIGHT with long ones.
+
+    Usage:
+        health = Health(query_planner=HealthQueryPlanner(target_bytes=500_000))
+        async for point in health.iter_health_data([HealthDataTypeAndroid.STEPS], start, end, chunk=None):
+            ...
+    """
+
+    def __init__(
+            self,
+            target_bytes: int = 1_000_000,
+            min_chunk: timedelta = timedelta(minutes=15),
+            max_chunk: timedelta = timedelta(days=90),
+            initial_chunk: timedelta = timedelta(days=1),
+            smoothing: float = 0.3,
+            bytes_per_point: int = 400,
+    ):
+        """
+        :param target_bytes: Payload size each window should produce.
+        :param min_chunk: Shortest window returned.
+        :param max_chunk: Longest window returned.
+        :param initial_chunk: Window used for types never observed.
+        :param smoothing: Weight of the newest observation in the moving averages (0 to 1].
+        :param bytes_per_point: Payload size of a point until one is observed.
+        """
+
+        if target_bytes < 1:
+            raise ValueError("The 'target_bytes' argument must be at least 1.")
+
+        if not 0 < smoothing <= 1:
+            raise ValueError("The 'smoothing' argument must be greater than 0 and at most 1.")
+
+        if not timedelta(0) < min_chunk <= max_chunk:
+            raise ValueError("The 'min_chunk' argument must be positive and not greater than 'max_chunk'.")
+
+        self.target_bytes = target_bytes
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.initial_chunk = initial_chunk
+        self.smoothing = smoothing
+        self.bytes_per_point = bytes_per_point
+        self._density: Dict[Any, float] = {}  # type -> points per hour
+        self._point_size: Dict[Any, float] = {}  # type -> bytes per point
+
+    def _average(self, table: Dict[Any, float], key: Any, value: float) -> None:
+        previous = table.get(key)
+        table[key] = value if previous is None else previous + self.smoothing * (value - previous)
+
+    def observe(self, types: Any, start_ms: int, end_ms: int, points: int, payload_bytes: Optional[int] = None) -> None:
+        """
+        Records that a read of `types` over [start_ms, end_ms] returned `points` points.
+
+        :param types: A HealthDataType enum member or its string value.
+        :param payload_bytes: Size of the response attributable to this type, if known.
+        """
+
+        hours = (end_ms - start_ms) / _HOUR_MS
+        if hours <= 0:
+            return
+
+        key = _type_value(types)
+        self._average(self._density, key, points / hours)
+
+        if payload_bytes and points:
+            self._average(self._point_size, key, payload_bytes / points)
+
+    def observe_result(self, types: Iterable[Any], start_ms: int, end_ms: int, result: Any, payload_bytes: Optional[int] = None) -> None:
+        """Records a whole read result, splitting it and its payload size between the requested types."""
+
+        counts = count_by_type(result)
+        total = sum(counts.values())
+
+        for t in types:
+            key = _type_value(t)
+            n = counts.get(key, 0)
+            self.observe(key, start_ms, end_ms, n, payload_bytes * n // total if payload_bytes and total else None)
+
+    def density(self, types: Any) -> Optional[float]:
+        """Points per hour learned for a type, or None if it was never observed."""
+
+        return self._density.get(_type_value(types))
+
+    def chunk_for(self, types: Iterable[Any]) -> timedelta:
+        """Returns the window size for a read of `types` that should produce about `target_bytes`."""
+
+        bytes_per_hour = 0.0
+
+        for t in types:
+            key = _type_value(t)
+            density = self._density.get(key)
+            if density is None:
+                return max(self.min_chunk, min(self.initial_chunk, self.max_chunk))
+            bytes_per_hour += density * self._point_size.get(key, self.bytes_per_point)
+
+        if bytes_per_hour <= 0:
+            return self.max_chunk
+
+        chunk = timedelta(hours=self.target_bytes / bytes_per_hour)
+        return max(self.min_chunk, min(chunk, self.max_chunk))
+
+    def plan(self, types: Iterable[Any], start_time: datetime, end_time: datetime) -> List[Tuple[datetime, datetime]]:
+        """Splits [start_time, end_time] into windows sized with the current estimates."""
+
+        types = list(types)
+        chunk = self.chunk_for(types)
+        windows = []
+        window_start = start_time
+
+        while window_start < end_time:
+            window_end = min(window_start + chunk, end_time)
+            windows.append((window_start, window_end))
+            window_start = window_end
+
+        return windows
@@ -0,0 +1,377 @@
+import math
+from array import array
+from datetime import timedelta, tzinfo
+from typing import Optional, Any, List, Dict, Tuple, Iterable, Iterator
+from flet_health.health_data_types import HealthDataTypeAndroid, HealthDataTypeIOS, HealthDataUnit
+from flet_health.health_data_point import HealthDataPoint, parse_timestamp_ms, _parse_type, _UNITS
+
+
+_AGGREGATIONS = ("mean", "sum", "min", "max", "count")
+
+
+def _numpy():
+    """Returns the numpy module if it is installed, None otherwise."""
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    return numpy
+
+
+def _code(categories: list, index: dict, key) -> int:
+    code = index.get(key)
+
+    if code is None:
+        code = index[key] = len(categories)
+        categories.append(key)
+
+    return code
+
+
+class HealthSeries:
+    """
+    A columnar representation of numeric health data.
+
+    Each point is a row spread across typed arrays: `date_from` / `date_to` (int64, milliseconds
+    since epoch), `value` (float64, NaN for non-numeric values) and categorical codes for type,
+    unit and source (`type_codes`, `unit_codes`, `source_codes`) that index into `types`, `units`
+    and `sources`. Columns are built in a single pass while decoding and no per-point object is kept.
+
+    When numpy is installed, `to_numpy()` exposes the columns as zero-copy arrays and the
+    aggregations run vectorized; otherwise they fall back to the standard library.
+    """
+
+    __slots__ = (
+        "date_from",
+        "date_to",
+        "value",
+        "type_codes",
+        "unit_codes",
+        "source_codes",
+        "types",
+        "units",
+        "sources",
+        "uuids",
+    )
+
+    def __init__(
+            self,
+            date_from: Optional[array] = None,
+            date_to: Optional[array] = None,
+            value: Optional[array] = None,
+            type_codes: Optional[array] = None,
+            unit_codes: Optional[array] = None,
+            source_codes: Optional[array] = None,
+            types: Optional[List[HealthDataTypeAndroid | HealthDataTypeIOS | str]] = None,
+            units: Optional[List[HealthDataUnit | str]] = None,
+            sources: Optional[List[Optional[str]]] = None,
+            uuids: Optional[List[Optional[str]]] = None,
+    ):
+        self.date_from = date_from if date_from is not None else array("q")
+        self.date_to = date_to if date_to is not None else array("q")
+        self.value = value if value is not None else array("d")
+        self.type_codes = type_codes if type_codes is not None else array("I")
+        self.unit_codes = unit_codes if unit_codes is not None else array("I")
+        self.source_codes = source_codes if source_codes is not None else array("I")
+        self.types = types if types is not None else []
+        self.units = units if units is not None else []
+        self.sources = sources if sources is not None else []
+        self.uuids = uuids if uuids is not None else []
+
+    @classmethod
+    def from_json(cls, data: Iterable[Dict[str, Any]]) -> "HealthSeries":
+        """Builds a series from a list of HealthDataPoint dictionaries (JSON format) in one pass."""
+
+        series = cls()
+        date_from, date_to, values = series.date_from, series.date_to, series.value
+        type_codes, unit_codes, source_codes = series.type_codes, series.unit_codes, series.source_codes
+        types, units, sources, uuids = series.types, series.units, series.sources, series.uuids
+        type_index, unit_index, source_index = {}, {}, {}
+        raw_type_codes = {}
+        nan = math.nan
+
+        for d in data:
+            value = d.get("value")
+            if isinstance(value, dict):
+                value = value.get("numericValue")
+
+            raw_type = (d.get("type"), d.get("sourcePlatform"))
+            type_code = raw_type_codes.get(raw_type)
+            if type_code is None:
+                type_code = raw_type_codes[raw_type] = _code(types, type_index, _parse_type(*raw_type))
+
+            unit = d.get("unit")
+
+            date_from.append(parse_timestamp_ms(d.get("dateFrom")) or 0)
+            date_to.append(parse_timestamp_ms(d.get("dateTo")) or 0)
+            values.append(value if isinstance(value, (int, float)) else nan)
+            type_codes.append(type_code)
+            unit_codes.append(_code(units, unit_index, _UNITS.get(unit, unit)))
+            source_codes.append(_code(sources, source_index, d.get("sourceName") or d.get("sourceId")))
+            uuids.append(d.get("uuid"))
+
+        return series
+
+    @classmethod
+    def from_points(cls, points: Iterable[HealthDataPoint]) -> "HealthSeries":
+        """Builds a series from `HealthDataPoint` instances."""
+
+        series = cls()
+        type_index, unit_index, source_index = {}, {}, {}
+        nan = math.nan
+
+        for point in points:
+            value = point.numeric_value
+            series.date_from.append(point.date_from or 0)
+            series.date_to.append(point.date_to or 0)
+            series.value.append(value if value is not None else nan)
+            series.type_codes.append(_code(series.types, type_index, point.type))
+            series.unit_codes.append(_code(series.units, unit_index, point.unit))
+            series.source_codes.append(_code(series.sources, source_index, point.source_name or point.source_id))
+            series.uuids.append(point.uuid)
+
+        return series
+
+    def __len__(self) -> int:
+        return len(self.date_from)
+
+    def __iter__(self) -> Iterator[HealthDataPoint]:
+        for i in range(len(self)):
+            yield self.point(i)
+
+    def __repr__(self):
+        return f"HealthSeries(len={len(self)}, types={[getattr(t, 'name', t) for t in self.types]})"
+
+    def point(self, i: int) -> HealthDataPoint:
+        """Materializes row `i` as a `HealthDataPoint`."""
+
+        value = self.value[i]
+
+        return HealthDataPoint(
+            uuid=self.uuids[i] if i < len(self.uuids) else None,
+            value=None if math.isnan(value) else value,
+            type=self.types[self.type_codes[i]],
+            unit=self.units[self.unit_codes[i]],
+            date_from=self.date_from[i],
+            date_to=self.date_to[i],
+            source_name=self.sources[self.source_codes[i]],
+        )
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Returns the columns as numpy arrays sharing memory with the series.
+
+        :raises ImportError: If numpy is not installed.
+        """
+
+        np = _numpy()
+        if np is None:
+            raise ImportError("HealthSeries.to_numpy() requires numpy. Install it with 'pip install numpy'.")
+
+        return {
+            "date_from": np.frombuffer(self.date_from, dtype=np.int64),
+            "date_to": np.frombuffer(self.date_to, dtype=np.int64),
+            "value": np.frombuffer(self.value, dtype=np.float64),
+            "type_codes": np.frombuffer(self.type_codes, dtype=np.uint32),
+            "unit_codes": np.frombuffer(self.unit_codes, dtype=np.uint32),
+            "source_codes": np.frombuffer(self.source_codes, dtype=np.uint32),
+        }
+
+    def take(self, indices: Iterable[int]) -> "HealthSeries":
+        """Returns a new series with the rows at `indices`, sharing the categories."""
+
+        indices = list(indices)
+        has_uuids = len(self.uuids) == len(self)
+
+        return HealthSeries(
+            date_from=array("q", (self.date_from[i] for i in indices)),
+            date_to=array("q", (self.date_to[i] for i in indices)),
+            value=array("d", (self.value[i] for i in indices)),
+            type_codes=array("I", (self.type_codes[i] for i in indices)),
+            unit_codes=array("I", (self.unit_codes[i] for i in indices)),
+            source_codes=array("I", (self.source_codes[i] for i in indices)),
+            types=list(self.types),
+            units=list(self.units),
+            sources=list(self.sources),
+            uuids=[self.uuids[i] for i in indices] if has_uuids else [],
+        )
+
+    def select(self, types: HealthDataTypeAndroid | HealthDataTypeIOS | str) -> "HealthSeries":
+        """Returns the rows of the given type. Android and iOS members with the same name match."""
+
+        value = getattr(types, "value", types)
+        codes = {code for code, t in enumerate(self.types) if getattr(t, "value", t) == value}
+        type_codes = self.type_codes
+
+        return self.take(i for i in range(len(self)) if type_codes[i] in codes)
+
+    def _numeric(self) -> List[float]:
+        return [v for v in self.value if v == v]
+
+    def count(self) -> int:
+        """Number of rows holding a numeric value."""
+
+        np = _numpy()
+        if np is not None:
+            return int(np.count_nonzero(~np.isnan(np.frombuffer(self.value, dtype=np.float64))))
+
+        return len(self._numeric())
+
+    def sum(self) -> float:
+        np = _numpy()
+        if np is not None:
+            return float(np.nansum(np.frombuffer(self.value, dtype=np.float64)))
+
+        return math.fsum(self._numeric())
+
+    def mean(self) -> Optional[float]:
+        """Mean of the numeric values, or None if there are none."""
+
+        count = self.count()
+        return self.sum() / count if count else None
+
+    def min(self) -> Optional[float]:
+        if not self.count():
+            return None
+
+        np = _numpy()
+        if np is not None:
+            return float(np.nanmin(np.frombuffer(self.value, dtype=np.float64)))
+
+        return min(self._numeric())
+
+    def max(self) -> Optional[float]:
+        if not self.count():
+            return None
+
+        np = _numpy()
+        if np is not None:
+            return float(np.nanmax(np.frombuffer(self.value, dtype=np.float64)))
+
+        return max(self._numeric())
+
+    def aggregate(self, by: str = "day", how: str = "sum", tz: Optional[tzinfo] = None, week_start: int = 0) -> "HealthSeries":
+        """
+        Aggregates the values by calendar bucket ('hour', 'day', 'week' or 'month') and type.
+        See `flet_health.health_aggregate.aggregate`.
+        """
+
+        from flet_health.health_aggregate import aggregate
+
+        return aggregate(self, by=by, how=how, tz=tz, week_start=week_start)
+
+    def resample(
+            self,
+            freq: timedelta,
+            how: str = "mean",
+            origin: Optional[int] = None,
+            fill: Optional[str] = None,
+            split: bool = False,
+    ) -> "HealthSeries":
+        """
+        Groups the rows of each type into fixed-width buckets by `date_from` and aggregates their values.
+
+        :param freq: The bucket width.
+        :param how: One of 'mean', 'sum', 'min', 'max' or 'count'.
+        :param origin: Start of the first bucket in milliseconds since epoch. Buckets are aligned
+            to the epoch (UTC) if not specified.
+        :param fill: 'nan', 'zero' or 'ffill' to also return the empty buckets, per type.
+        :param split: If True, rows are spread over every bucket their interval overlaps.
+            See `flet_health.health_aggregate.resample`, which handles `fill` and `split`.
+
+        :return: A new series with one row per non-empty (type, bucket), ordered by type then time, where
+            `date_from` / `date_to` are the bucket edges. Unit and source are taken from the first row of each.
+        """
+
+        if how not in _AGGREGATIONS:
+            raise ValueError(f"The 'how' argument must be one of {_AGGREGATIONS}.")
+
+        if fill is not None or split:
+            from flet_health.health_aggregate import resample
+
+            return resample(self, freq, how=how, fill=fill, split=split, origin=origin)
+
+        step = int(freq.total_seconds() * 1000)
+        if step <= 0:
+            raise ValueError("The 'freq' argument must be a positive timedelta.")
+
+        origin = origin or 0
+        np = _numpy()
+
+        if np is not None:
+            return self._resample_numpy(np, step, how, origin)
+
+        buckets: Dict[Tuple[int, int], list] = {}
+        for i, v in enumerate(self.value):
+            if v != v:
+                continue
+
+            key = (self.type_codes[i], (self.date_from[i] - origin) // step)
+            acc = buckets.get(key)
+            if acc is None:
+                buckets[key] = [i, 1, v, v, v]
+            else:
+                acc[1] += 1
+                acc[2] += v
+                if v < acc[3]:
+                    acc[3] = v
+                if v > acc[4]:
+                    acc[4] = v
+
+        result = HealthSeries(types=list(self.types), units=list(self.units), sources=list(self.sources))
+        position = {"count": 1, "sum": 2, "min": 3, "max": 4}
+
+        for key in sorted(buckets):
+            first, count, total, low, high = acc = buckets[key]
+            start = origin + key[1] * step
+            result.date_from.append(start)
+            result.date_to.append(start + step)
+            result.value.append(total / count if how == "mean" else float(acc[position[how]]))
+            result.type_codes.append(self.type_codes[first])
+            result.unit_codes.append(self.unit_codes[first])
+            result.source_codes.append(self.source_codes[first])
+
+        return result
+
+    def _resample_numpy(self, np, step: int, how: str, origin: int) -> "HealthSeries":
+        columns = self.to_numpy()
+        values = columns["value"]
+        mask = ~np.isnan(values)
+        keys = np.stack([
+            columns["type_codes"][mask].astype(np.int64),
+            (columns["date_from"][mask] - origin) // step,
+        ], axis=1)
+        values = values[mask]
+
+        # Unique (type, bucket) pairs, sorted by type then time.
+        groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        buckets = groups[:, 1]
+        order = np.argsort(inverse, kind="stable")
+        starts = np.searchsorted(inverse[order], np.arange(len(buckets)))
+        first = np.flatnonzero(mask)[order[starts]] if len(buckets) else np.array([], dtype=np.int64)
+
+        if how in ("mean", "sum", "count"):
+            counts = np.bincount(inverse, minlength=len(buckets))
+            sums = np.bincount(inverse, weights=values, minlength=len(buckets))
+            out = {"mean": lambda: sums / counts, "sum": lambda: sums, "count": lambda: counts}[how]()
+        elif how == "min":
+            out = np.minimum.reduceat(values[order], starts) if len(buckets) else values
+        else:
+            out = np.maximum.reduceat(values[order], starts) if len(buckets) else values
+
+        bucket_start = origin + buckets.astype(np.int64) * step
+
+        return HealthSeries(
+            date_from=array("q", bucket_start.tobytes()),
+            date_to=array("q", (bucket_start + step).tobytes()),
+            value=array("d", np.asarray(out, dtype=np.float64).tobytes()),
+            type_codes=array("I", columns["type_codes"][first].tobytes()),
+            unit_codes=array("I", columns["unit_codes"][first].tobytes()),
+            source_codes=array("I", columns["source_codes"][first].tobytes()),
+            types=list(self.types),
+            units=list(self.units),
+            sources=list(self.sources),
+        )
@@ -0,0 +1,122 @@
+import json
+import asyncio
+import threading
+from typing import Optional, Any, Dict, Tuple, Callable, Awaitable, Hashable
+
+
+# Methods that only read state, so identical concurrent calls can share one result.
+IDEMPOTENT_PREFIXES = ("get_", "is_", "has_")
+
+
+def flight_key(method_name: str, arguments: Optional[Dict[str, Any]] = None) -> Optional[Tuple]:
+    """
+    Returns the key identifying identical calls: the method name plus the arguments, with the
+    JSON `data` payload canonicalized (sorted keys, no whitespace). None for non-idempotent methods.
+    """
+
+    if not method_name.startswith(IDEMPOTENT_PREFIXES):
+        return None
+
+    items = []
+    for name, value in sorted((arguments or {}).items()):
+        if value is None:
+            continue
+        value = str(value)
+        if name == "data":
+            try:
+                value = json.dumps(json.loads(value), sort_keys=True, separators=(",", ":"))
+            except ValueError:
+                pass
+        items.append((name, value))
+
+    return method_name, tuple(items)
+
+
+class _Flight:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical calls made while one is already in progress: the first caller runs the
+    call and the others wait for it and receive the same result (or exception).
+
+    Nothing is cached: once a call completes, the next identical call runs again. Results are
+    shared objects and should not be modified. An async call is cancelled when all the callers
+    waiting for it are.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._tasks: Dict[Hashable, "asyncio.Future"] = {}
+        self._waiters: Dict["asyncio.Future", int] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights) + len(self._tasks)
+
+    def call(self, key: Optional[Hashable], fn: Callable[[], Any]) -> Any:
+        """Runs `fn()`, or waits for the identical call in progress in another thread."""
+
+        if key is None:
+            return fn()
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+        return flight.result
+
+    async def call_async(self, key: Optional[Hashable], fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Awaits `fn()`, or the identical call already in progress."""
+
+        if key is None:
+            return await fn()
+
+        task = self._tasks.get(key)
+
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+
+            def done(finished, key=key):
+                if self._tasks.get(key) is finished:
+                    del self._tasks[key]
+
+            task.add_done_callback(done)
+
+        # Shielded, so one caller being cancelled does not cancel the call the others wait for.
+        # The call itself is cancelled once nobody waits for it anymore.
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
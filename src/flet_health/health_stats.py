@@ -0,0 +1,359 @@
+import math
+import hashlib
+from bisect import bisect_left
+from typing import Optional, Any, List, Dict, Iterable, AsyncIterable
+from flet_health.health_data_point import HealthDataPoint
+
+
+class RunningStats:
+    """
+    Count, mean, variance, min and max of a stream of numbers in constant memory (Welford's
+    algorithm). Two instances built over different parts of a stream can be merged.
+    """
+
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def update(self, values: Iterable[float]) -> "RunningStats":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Adds the values seen by `other` to this instance (Chan et al. parallel update)."""
+
+        if not other.count:
+            return self
+
+        if not self.count:
+            self.count, self.mean, self._m2, self.min, self.max = other.count, other.mean, other._m2, other.min, other.max
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Sample variance, or None with fewer than two values."""
+
+        return self._m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def stddev(self) -> Optional[float]:
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def __repr__(self):
+        return f"RunningStats(count={self.count}, mean={self.mean}, variance={self.variance}, min={self.min}, max={self.max})"
+
+
+class TDigest:
+    """
+    Approximate quantiles of a stream of numbers in bounded memory (merging t-digest).
+
+    Values are buffered and periodically merged into at most about `compression` centroids,
+    which are kept small near the tails so extreme quantiles stay accurate. Digests built over
+    different parts of a stream can be merged.
+    """
+
+    __slots__ = ("compression", "_means", "_weights", "_buffer", "count", "min", "max")
+
+    def __init__(self, compression: int = 100):
+        if compression < 10:
+            raise ValueError("The 'compression' argument must be at least 10.")
+
+        self.compression = compression
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._buffer: List[float] = []
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self._buffer.append(value)
+        self.count += 1
+
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+        if len(self._buffer) >= self.compression * 5:
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> "TDigest":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Adds the values summarized by `other` to this digest."""
+
+        other._compress()
+        self._compress()
+
+        if not other.count:
+            return self
+
+        centroids = sorted(zip(self._means + other._means, self._weights + other._weights))
+        self._means, self._weights = self._merge_centroids(centroids)
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def _quantile_limit(self, q: float) -> float:
+        # Scale function k1(q) = compression / (2 pi) * asin(2q - 1): a centroid starting at
+        # quantile q may grow up to k1(q) + 1. k1 spans compression / 2 over [0, 1], which bounds
+        # the number of centroids by about `compression`, with small ones near the tails.
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= self.compression / 4:
+            return 1.0
+
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _merge_centroids(self, centroids: List[tuple]) -> tuple:
+        total = sum(w for _, w in centroids)
+        means: List[float] = []
+        weights: List[float] = []
+        cumulative = 0.0  # weight of the centroids before the last one
+        limit = total * self._quantile_limit(0.0)
+
+        for mean, weight in centroids:
+            if weights:
+                if cumulative + weights[-1] + weight <= limit:
+                    merged = weights[-1] + weight
+                    means[-1] += (mean - means[-1]) * weight / merged
+                    weights[-1] = merged
+                    continue
+                cumulative += weights[-1]
+                limit = total * self._quantile_limit(cumulative / total)
+
+            means.append(mean)
+            weights.append(weight)
+
+        return means, weights
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+
+        centroids = sorted(list(zip(self._means, self._weights)) + [(v, 1.0) for v in self._buffer])
+        self._buffer = []
+        self._means, self._weights = self._merge_centroids(centroids)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Returns the approximate `q` quantile (0 to 1), or None if no value was added."""
+
+        if not 0 <= q <= 1:
+            raise ValueError("The 'q' argument must be between 0 and 1.")
+
+        self._compress()
+
+        if not self.count:
+            return None
+
+        means, weights = self._means, self._weights
+        if len(means) == 1 or q == 0:
+            return self.min if q == 0 else means[0]
+        if q == 1:
+            return self.max
+
+        # Interpolate between centroid centers, using min / max for the outer halves.
+        target = q * self.count
+        centers = []
+        cumulative = 0.0
+        for weight in weights:
+            centers.append(cumulative + weight / 2)
+            cumulative += weight
+
+        i = bisect_left(centers, target)
+        if i == 0:
+            return self.min + (means[0] - self.min) * target / centers[0]
+        if i == len(centers):
+            return means[-1] + (self.max - means[-1]) * (target - centers[-1]) / (self.count - centers[-1])
+
+        fraction = (target - centers[i - 1]) / (centers[i] - centers[i - 1])
+        return means[i - 1] + (means[i] - means[i - 1]) * fraction
+
+    def __len__(self) -> int:
+        self._compress()
+        return len(self._means)
+
+
+class HyperLogLog:
+    """
+    Approximate count of distinct values in fixed memory (2 ** `precision` bytes).
+
+    The relative error is about 1.04 / sqrt(2 ** `precision`), 1.6% with the default. Hashes are
+    stable across processes, so sketches can be stored and merged later.
+    """
+
+    __slots__ = ("precision", "_registers")
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError("The 'precision' argument must be between 4 and 16.")
+
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        digest = hashlib.blake2b(str(value).encode(), digest_size=8).digest()
+        x = int.from_bytes(digest, "big")
+        index = x >> (64 - self.precision)
+        rest = x & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update(self, values: Iterable[Any]) -> "HyperLogLog":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Only sketches with the same precision can be merged.")
+
+        self._registers = bytearray(map(max, self._registers, other._registers))
+        return self
+
+    def count(self) -> int:
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small range correction (linear counting).
+            return round(m * math.log(m / zeros))
+
+        return round(estimate)
+
+    def __len__(self) -> int:
+        return self.count()
+
+
+class HealthStatsAccumulator:
+    """
+    Running statistics of the numeric values of a stream of health data points, in constant memory.
+
+    Combines `RunningStats` (count, mean, variance, min, max), `TDigest` (quantiles) and
+    `HyperLogLog` (distinct sources). Accumulators fed with different ranges, e.g. concurrently,
+    can be merged.
+
+    Usage:
+        stats = HealthStatsAccumulator()
+        await stats.consume(health.iter_health_data([HealthDataTypeAndroid.HEART_RATE], start, end))
+        print(stats.mean, stats.quantile(0.95), stats.distinct_sources)
+    """
+
+    def __init__(self, compression: int = 100, precision: int = 12):
+        """
+        :param compression: Accuracy of the quantiles, see `TDigest`.
+        :param precision: Accuracy of the distinct source count, see `HyperLogLog`.
+        """
+
+        self.stats = RunningStats()
+        self.digest = TDigest(compression)
+        self.sources = HyperLogLog(precision)
+
+    def add(self, point: HealthDataPoint | Dict[str, Any]) -> None:
+        """Adds a `HealthDataPoint` or a HealthDataPoint dictionary. Non-numeric points are ignored."""
+
+        if isinstance(point, HealthDataPoint):
+            value = point.numeric_value
+            source = point.source_id or point.source_name
+        else:
+            value = point.get("value")
+            if isinstance(value, dict):
+                value = value.get("numericValue")
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                value = None
+            source = point.get("sourceId") or point.get("sourceName")
+
+        if value is None or value != value:
+            return
+
+        self.stats.add(value)
+        self.digest.add(value)
+        if source:
+            self.sources.add(source)
+
+    def update(self, points: Iterable[HealthDataPoint | Dict[str, Any]]) -> "HealthStatsAccumulator":
+        for point in points:
+            self.add(point)
+        return self
+
+    async def consume(self, points: AsyncIterable[HealthDataPoint | Dict[str, Any]]) -> "HealthStatsAccumulator":
+        """Adds every point of an async iterator such as `Health.iter_health_data`."""
+
+        async for point in points:
+            self.add(point)
+        return self
+
+    def merge(self, other: "HealthStatsAccumulator") -> "HealthStatsAccumulator":
+        self.stats.merge(other.stats)
+        self.digest.merge(other.digest)
+        self.sources.merge(other.sources)
+        return self
+
+    @property
+    def count(self) -> int:
+        return self.stats.count
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.stats.mean if self.stats.count else None
+
+    @property
+    def variance(self) -> Optional[float]:
+        return self.stats.variance
+
+    @property
+    def stddev(self) -> Optional[float]:
+        return self.stats.stddev
+
+    @property
+    def min(self) -> Optional[float]:
+        return self.stats.min
+
+    @property
+    def max(self) -> Optional[float]:
+        return self.stats.max
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.digest.quantile(q)
+
+    @property
+    def distinct_sources(self) -> int:
+        return self.sources.count()
+
+    def __repr__(self):
+        return f"HealthStatsAccumulator(count={self.count}, mean={self.mean}, stddev={self.stddev}, min={self.min}, max={self.max})"
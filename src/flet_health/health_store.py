@@ -0,0 +1,336 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Any, List, Dict, Iterable, Tuple, TYPE_CHECKING
+from flet_health.health_data_types import HealthDataTypeAndroid, HealthDataTypeIOS, HealthWorkoutActivityType
+from flet_health.health_data_point import HealthDataPoint, parse_timestamp_ms
+from flet_health.health_codec import dumps, loads, decode_points
+from flet_health.health_planner import HealthQueryPlanner
+
+if TYPE_CHECKING:
+    from flet_health.flet_health import Health
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS health_points (
+    uuid TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    date_from INTEGER NOT NULL,
+    date_to INTEGER NOT NULL,
+    value REAL,
+    unit TEXT,
+    source_name TEXT,
+    recording_method TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS health_points_type_date_from ON health_points (type, date_from);
+CREATE TABLE IF NOT EXISTS health_sync_state (
+    type TEXT PRIMARY KEY,
+    high_water INTEGER NOT NULL
+);
+"""
+
+_AGGREGATIONS = {"sum": "SUM", "mean": "AVG", "min": "MIN", "max": "MAX", "count": "COUNT"}
+
+
+def _to_ms(value: Optional[datetime]) -> Optional[int]:
+    return int(value.timestamp() * 1000) if value is not None else None
+
+
+def _row(point: Dict[str, Any]) -> tuple:
+    value = point.get("value")
+    if isinstance(value, dict):
+        value = value.get("numericValue")
+    if not isinstance(value, (int, float)):
+        value = None
+
+    data_type = point.get("type")
+    date_from = parse_timestamp_ms(point.get("dateFrom")) or 0
+    date_to = parse_timestamp_ms(point.get("dateTo")) or date_from
+    # Points without uuid are keyed by their content so re-syncing them does not duplicate rows.
+    uuid = point.get("uuid") or f"{data_type}:{date_from}:{date_to}:{point.get('sourceId')}:{value}"
+
+    return (
+        uuid,
+        data_type,
+        date_from,
+        date_to,
+        value,
+        point.get("unit"),
+        point.get("sourceName"),
+        point.get("recordingMethod"),
+        dumps(point),
+    )
+
+
+class HealthStore:
+    """
+    A local SQLite mirror of health data fetched through a `Health` control.
+
+    `sync()` pulls, for each type, only the data newer than the last synced high-water mark
+    (minus `overlap`, to pick up late-arriving samples) and upserts it by uuid. The range is read
+    in windows of `chunk` and stored window by window, so an interrupted sync keeps its progress.
+    Range queries, counts and aggregates then run against the local database without a native
+    round-trip.
+
+    Usage:
+        store = HealthStore(health, os.path.join(os.getenv("FLET_APP_STORAGE_DATA"), "health.db"))
+        await store.sync_async([HealthDataTypeAndroid.WEIGHT])
+        average = store.aggregate([HealthDataTypeAndroid.WEIGHT], start, end, how="mean")
+    """
+
+    def __init__(
+            self,
+            health: "Health",
+            path: str,
+            history: timedelta = timedelta(days=30),
+            overlap: timedelta = timedelta(hours=1),
+            chunk: Optional[timedelta] = timedelta(days=1),
+    ):
+        """
+        :param health: The `Health` control used to fetch data.
+        :param path: Path of the SQLite database file (":memory:" for a temporary store).
+        :param history: How far back the first sync of a type goes.
+        :param overlap: How much of the already synced range is fetched again on each sync.
+        :param chunk: Size of the windows a sync is read in. If None, each window is sized by the
+            control's `query_planner` (a `HealthQueryPlanner` is created if the control has none).
+        """
+
+        if chunk is not None and chunk <= timedelta(0):
+            raise ValueError("The 'chunk' argument must be a positive timedelta.")
+
+        self.health = health
+        self.path = path
+        self.history = history
+        self.overlap = overlap
+        self.chunk = chunk
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "HealthStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def high_water_mark(self, types: HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType) -> Optional[datetime]:
+        """Returns the end of the last synced range for `types`, or None if it was never synced."""
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT high_water FROM health_sync_state WHERE type = ?", (types.value,)
+            ).fetchone()
+
+        return datetime.fromtimestamp(row[0] / 1000) if row else None
+
+    def _sync_windows(self, types: Any, end_time: datetime) -> List[Tuple[datetime, datetime]]:
+        high_water = self.high_water_mark(types)
+        start_time = end_time - self.history if high_water is None else high_water - self.overlap
+
+        if self.chunk is None:
+            if self.health.query_planner is None:
+                self.health.query_planner = HealthQueryPlanner()
+            return self.health.query_planner.plan([types], start_time, end_time)
+
+        windows = []
+        window_start = start_time
+        while window_start < end_time:
+            window_end = min(window_start + self.chunk, end_time)
+            windows.append((window_start, window_end))
+            window_start = window_end
+
+        return windows
+
+    def _store(self, type_value: str, points: List[Dict[str, Any]], high_water: int) -> int:
+        rows = [_row(point) for point in points]
+
+        with self._lock, self._connection:
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO health_points VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            changed = self._connection.total_changes - before
+            # The mark never moves back, e.g. when syncing up to an earlier `end_time`.
+            self._connection.execute(
+                "INSERT INTO health_sync_state (type, high_water) VALUES (?, ?) "
+                "ON CONFLICT (type) DO UPDATE SET high_water = MAX(high_water, excluded.high_water)",
+                (type_value, high_water),
+            )
+
+        return changed
+
+    def sync(
+            self,
+            types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType],
+            end_time: Optional[datetime] = None,
+            wait_timeout: Optional[float] = 25
+    ) -> int:
+        """
+        Fetches the data newer than the high-water mark of each type and stores it locally.
+
+        Each window is stored, and the high-water mark moved past it, only once its read succeeds. A
+        read that fails (native error, `TimeoutError`) stops the sync with that error, keeping the
+        windows stored before it: the next sync starts again from the failed window.
+
+        :param types: A list of HealthDataType enum values to sync.
+        :param end_time: End of the synced range. Defaults to now.
+        :param wait_timeout: Maximum time to wait for each native call.
+
+        :return: The number of rows inserted or updated.
+        """
+
+        end_time = end_time or datetime.now()
+        changed = 0
+
+        for t in types:
+            # Reads of a type the platform does not have would fail every time: it is skipped.
+            if not self.health._supported_types([t.value]):
+                continue
+
+            for window_start, window_end in self._sync_windows(t, end_time):
+                # The public read reports errors as an empty result, which would be stored as an empty window.
+                points = self.health._read_health_data(
+                    [t.value], _to_ms(window_start), _to_ms(window_end), [], wait_timeout
+                )
+                changed += self._store(t.value, points, _to_ms(window_end))
+
+        return changed
+
+    async def sync_async(
+            self,
+            types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType],
+            end_time: Optional[datetime] = None,
+            wait_timeout: Optional[float] = 25
+    ) -> int:
+        """
+        Fetches the data newer than the high-water mark of each type and stores it locally.
+
+        Each window is stored, and the high-water mark moved past it, only once its read succeeds. A
+        read that fails (native error, `TimeoutError`) stops the sync with that error, keeping the
+        windows stored before it: the next sync starts again from the failed window.
+
+        :param types: A list of HealthDataType enum values to sync.
+        :param end_time: End of the synced range. Defaults to now.
+        :param wait_timeout: Maximum time to wait for each native call.
+
+        :return: The number of rows inserted or updated.
+        """
+
+        end_time = end_time or datetime.now()
+        changed = 0
+
+        for t in types:
+            # Reads of a type the platform does not have would fail every time: it is skipped.
+            if not self.health._supported_types([t.value]):
+                continue
+
+            for window_start, window_end in self._sync_windows(t, end_time):
+                # The public read reports errors as an empty result, which would be stored as an empty window.
+                points = await self.health._read_health_data_async(
+                    [t.value], _to_ms(window_start), _to_ms(window_end), [], wait_timeout
+                )
+                changed += self._store(t.value, points, _to_ms(window_end))
+
+        return changed
+
+    @staticmethod
+    def _where(types: Iterable[Any], start_time: Optional[datetime], end_time: Optional[datetime]) -> tuple:
+        values = [t.value for t in types]
+        clauses = [f"type IN ({', '.join('?' * len(values))})"]
+        params: List[Any] = list(values)
+
+        if start_time is not None:
+            clauses.append("date_from >= ?")
+            params.append(_to_ms(start_time))
+
+        if end_time is not None:
+            clauses.append("date_from <= ?")
+            params.append(_to_ms(end_time))
+
+        return " AND ".join(clauses), params
+
+    def query(
+            self,
+            types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType],
+            start_time: Optional[datetime] = None,
+            end_time: Optional[datetime] = None,
+            as_points: bool = False
+    ) -> list[dict] | list[HealthDataPoint]:
+        """
+        Returns the stored points of `types` starting within the given range, ordered by start time.
+
+        :param as_points: If True, returns a list of `HealthDataPoint` instead of dictionaries.
+        """
+
+        where, params = self._where(types, start_time, end_time)
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT payload FROM health_points WHERE {where} ORDER BY date_from", params
+            ).fetchall()
+
+        if as_points:
+            return decode_points("[" + ",".join(row[0] for row in rows) + "]")
+
+        return [loads(row[0]) for row in rows]
+
+    def count(
+            self,
+            types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType],
+            start_time: Optional[datetime] = None,
+            end_time: Optional[datetime] = None
+    ) -> int:
+        """Returns the number of stored points of `types` starting within the given range."""
+
+        where, params = self._where(types, start_time, end_time)
+
+        with self._lock:
+            row = self._connection.execute(f"SELECT COUNT(*) FROM health_points WHERE {where}", params).fetchone()
+
+        return row[0]
+
+    def aggregate(
+            self,
+            types: List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType],
+            start_time: Optional[datetime] = None,
+            end_time: Optional[datetime] = None,
+            how: str = "sum"
+    ) -> Optional[float]:
+        """
+        Aggregates the numeric values of the stored points of `types` starting within the given range.
+
+        :param how: One of 'sum', 'mean', 'min', 'max' or 'count' (of numeric values).
+
+        :return: The aggregated value, or None if there is no numeric data.
+        """
+
+        if how not in _AGGREGATIONS:
+            raise ValueError(f"The 'how' argument must be one of {tuple(_AGGREGATIONS)}.")
+
+        where, params = self._where(types, start_time, end_time)
+
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {_AGGREGATIONS[how]}(value) FROM health_points WHERE {where}", params
+            ).fetchone()
+
+        return row[0]
+
+    def clear(self, types: Optional[List[HealthDataTypeAndroid | HealthDataTypeIOS | HealthWorkoutActivityType]] = None) -> None:
+        """Removes the stored points and sync state of `types`, or of every type if None."""
+
+        with self._lock, self._connection:
+            if types is None:
+                self._connection.execute("DELETE FROM health_points")
+                self._connection.execute("DELETE FROM health_sync_state")
+                return
+
+            values = [t.value for t in types]
+            marks = ", ".join("?" * len(values))
+            self._connection.execute(f"DELETE FROM health_points WHERE type IN ({marks})", values)
+            self._connection.execute(f"DELETE FROM health_sync_state WHERE type IN ({marks})", values)
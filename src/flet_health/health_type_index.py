@@ -0,0 +1,153 @@
+from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Any, List, Mapping, Iterable, Callable
+from flet_health.health_data_types import (
+    HealthDataTypeAndroid,
+    HealthDataTypeIOS,
+    HealthWorkoutActivityType,
+    RecordingMethod,
+    DataAccess,
+)
+
+
+# Wire values of the enum members accepted by each argument. Lookups replace the per-element
+# `isinstance` checks: anything that is not a key (strings included) is rejected.
+TYPE_VALUES: Mapping[Enum, str] = MappingProxyType({
+    member: member.value
+    for enum in (HealthDataTypeAndroid, HealthDataTypeIOS, HealthWorkoutActivityType)
+    for member in enum
+})
+# Types that can be written as a generic value (`write_health_data`).
+DATA_TYPE_VALUES: Mapping[Enum, str] = MappingProxyType({
+    member: member.value
+    for enum in (HealthDataTypeAndroid, HealthDataTypeIOS)
+    for member in enum
+})
+RECORDING_METHOD_VALUES: Mapping[Enum, str] = MappingProxyType({member: member.value for member in RecordingMethod})
+DATA_ACCESS_VALUES: Mapping[Enum, Any] = MappingProxyType({member: member.value for member in DataAccess})
+
+
+def wire_value(table: Mapping[Enum, Any], member: Any) -> Optional[Any]:
+    """Returns the wire value of `member` in `table`, or None if it is not accepted."""
+
+    try:
+        return table.get(member)
+    except TypeError:  # unhashable
+        return None
+
+
+def _encoder(table: Mapping[Enum, Any], message: str) -> Callable[[Iterable[Any]], List[Any]]:
+    """
+    Returns a function validating a list of enum members against `table` and converting it to
+    their wire values. Results are memoized per tuple of members, so the lists a polling loop
+    sends again and again are only checked once.
+    """
+
+    @lru_cache(maxsize=256)
+    def encode_members(members: tuple) -> tuple:
+        try:
+            return tuple([table[member] for member in members])
+        except (KeyError, TypeError):
+            raise ValueError(message) from None
+
+    def encode(members: Iterable[Any]) -> List[Any]:
+        try:
+            return list(encode_members(tuple(members)))
+        except TypeError:  # not iterable, or unhashable elements
+            raise ValueError(message) from None
+
+    encode.cache_info = encode_members.cache_info
+    encode.cache_clear = encode_members.cache_clear
+    return encode
+
+
+encode_types = _encoder(
+    TYPE_VALUES,
+    "All elements of 'types' must be instances of 'HealthDataTypeAndroid, HealthDataTypeIOS or HealthWorkoutActivityType'.",
+)
+encode_recording_methods = _encoder(
+    RECORDING_METHOD_VALUES,
+    "The 'recording_method' argument must be an instance of 'RecordingMethod'.",
+)
+encode_data_access = _encoder(
+    DATA_ACCESS_VALUES,
+    "All elements of 'data_access' must be instances of 'DataAccess'.",
+)
+
+
+# Platform enum of each `page.platform` value.
+PLATFORM_TYPES: Mapping[str, type] = MappingProxyType({
+    "android": HealthDataTypeAndroid,
+    "ios": HealthDataTypeIOS,
+})
+
+# Platform-neutral names of the measurements each platform exposes under a different type.
+NEUTRAL_TYPES: Mapping[str, Mapping[str, Enum]] = MappingProxyType({
+    "HEART_RATE_VARIABILITY": MappingProxyType({
+        "android": HealthDataTypeAndroid.HEART_RATE_VARIABILITY_RMSSD,
+        "ios": HealthDataTypeIOS.HEART_RATE_VARIABILITY_SDNN,
+    }),
+    "DISTANCE": MappingProxyType({
+        "android": HealthDataTypeAndroid.DISTANCE_DELTA,
+        "ios": HealthDataTypeIOS.DISTANCE_WALKING_RUNNING,
+    }),
+})
+
+# Type name (or neutral name) -> platform -> member of that platform's enum.
+_TYPE_INDEX: Mapping[str, Mapping[str, Enum]] = MappingProxyType({
+    **{
+        name: MappingProxyType({
+            platform: enum[name]
+            for platform, enum in PLATFORM_TYPES.items()
+            if name in enum.__members__
+        })
+        for enum in PLATFORM_TYPES.values()
+        for name in enum.__members__
+    },
+    **NEUTRAL_TYPES,
+})
+
+# Wire values each platform accepts in reads and permission requests.
+SUPPORTED_VALUES: Mapping[str, frozenset] = MappingProxyType({
+    platform: frozenset([member.value for member in enum] + [member.value for member in HealthWorkoutActivityType])
+    for platform, enum in PLATFORM_TYPES.items()
+})
+
+
+def resolve_type(types: Any, platform: str) -> Optional[Enum]:
+    """
+    Maps a platform-neutral type to the member of the platform's enum.
+
+    :param types: A type name ("STEPS"), a neutral name from `NEUTRAL_TYPES` ("HEART_RATE_VARIABILITY"),
+        or a `HealthDataTypeAndroid` / `HealthDataTypeIOS` member, resolved by name.
+        `HealthWorkoutActivityType` members are returned as is.
+    :param platform: `page.platform.value`. Platforms other than "android" and "ios" (desktop, web) resolve
+        to the Android types, as the plugin does for any platform that is not iOS.
+    :return: The `HealthDataTypeAndroid` or `HealthDataTypeIOS` member, or None if the platform has no such type.
+    """
+
+    if platform not in PLATFORM_TYPES:
+        platform = "android"
+
+    if isinstance(types, HealthWorkoutActivityType):
+        return types
+
+    if isinstance(types, str):
+        name = types
+    elif wire_value(DATA_TYPE_VALUES, types) is not None:
+        name = types.name
+    else:
+        raise ValueError("The 'types' argument must be a type name or a member of 'HealthDataTypeAndroid' or 'HealthDataTypeIOS'.")
+
+    return _TYPE_INDEX.get(name, {}).get(platform)
+
+
+def supported_values(types_str: List[str], platform: Optional[str]) -> List[str]:
+    """Drops the wire values the platform does not support. Values are kept as is on other platforms."""
+
+    supported = SUPPORTED_VALUES.get(platform)
+    if supported is None:
+        return types_str
+
+    return [t for t in types_str if t in supported]
@@ -0,0 +1,129 @@
+import sys
+import zlib
+import base64
+import struct
+from array import array
+from typing import Any, List, Dict, Iterable
+from flet_health.health_data_types import HealthDataTypeIOS
+from flet_health.health_data_point import _parse_type, _UNITS
+from flet_health.health_series import HealthSeries
+from flet_health.health_codec import dumps, loads
+
+
+# Columnar payload layout (all integers little-endian), base64-encoded for the bridge:
+#
+#   magic   b"FHC1"
+#   flags   uint8, bit 0 set when the body is zlib-compressed
+#   body    uint32 header length | header JSON | date_from int64[n] | date_to int64[n]
+#           | value float64[n] | type_codes uint32[n] | unit_codes uint32[n] | source_codes uint32[n]
+#           | uuids as UTF-8, separated by "\n" (empty for a point without uuid)
+#
+# The header holds the row count and the categories the codes index into:
+#   {"count": n, "types": [...], "platforms": [...], "units": [...], "sources": [...]}
+# where platforms[i] is the sourcePlatform of types[i]. Non-numeric values are sent as NaN.
+
+COLUMNAR = "columnar"
+WIRE_FORMATS = ("json", COLUMNAR)
+
+_MAGIC = b"FHC1"
+_MAGIC_BASE64 = base64.b64encode(_MAGIC + b"\x00\x00").decode()[:5]  # the first 4 bytes only
+_FLAG_ZLIB = 1
+_COLUMNS = (("date_from", "q"), ("date_to", "q"), ("value", "d"), ("type_codes", "I"), ("unit_codes", "I"), ("source_codes", "I"))
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def is_columnar(payload: Any) -> bool:
+    """Returns True if `payload` is a columnar payload rather than JSON text."""
+
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        return bytes(payload[:4]) == _MAGIC
+
+    return isinstance(payload, str) and payload.startswith(_MAGIC_BASE64)
+
+
+def encode_columnar(data: HealthSeries | Iterable[Dict[str, Any]], compress: bool = True) -> str:
+    """
+    Encodes HealthDataPoint dictionaries (JSON format) or a `HealthSeries` as a columnar payload.
+
+    This mirrors what the native side sends when a read is made with `wire_format="columnar"`.
+
+    :param compress: If True, the body is zlib-compressed.
+    :return: The base64-encoded payload.
+    """
+
+    series = data if isinstance(data, HealthSeries) else HealthSeries.from_json(data)
+
+    header = dumps(
+        {
+            "count": len(series),
+            "types": [getattr(t, "value", t) for t in series.types],
+            "platforms": ["appleHealth" if isinstance(t, HealthDataTypeIOS) else "googleHealthConnect" for t in series.types],
+            "units": [getattr(u, "value", u) for u in series.units],
+            "sources": series.sources,
+        }
+    ).encode()
+
+    parts = [struct.pack("<I", len(header)), header]
+
+    for name, typecode in _COLUMNS:
+        column = getattr(series, name)
+        if _BIG_ENDIAN:
+            column = array(typecode, column)
+            column.byteswap()
+        parts.append(column.tobytes())
+
+    parts.append("\n".join(uuid or "" for uuid in series.uuids).encode())
+
+    body = b"".join(parts)
+    flags = 0
+
+    if compress:
+        body = zlib.compress(body)
+        flags |= _FLAG_ZLIB
+
+    return base64.b64encode(_MAGIC + bytes((flags,)) + body).decode()
+
+
+def decode_columnar(payload: str | bytes) -> HealthSeries:
+    """
+    Decodes a columnar payload into a `HealthSeries`, copying each column straight from the
+    buffer into its typed array without building any per-point object.
+
+    :raises ValueError: If `payload` is not a valid columnar payload.
+    """
+
+    raw = base64.b64decode(payload) if isinstance(payload, str) else bytes(payload)
+
+    if raw[:4] != _MAGIC:
+        raise ValueError("Not a columnar health data payload.")
+
+    body = raw[5:]
+    if raw[4] & _FLAG_ZLIB:
+        body = zlib.decompress(body)
+
+    view = memoryview(body)
+    (header_length,) = struct.unpack_from("<I", view, 0)
+    offset = 4 + header_length
+    header = loads(bytes(view[4:offset]))
+    count = header["count"]
+
+    columns = {}
+    for name, typecode in _COLUMNS:
+        column = array(typecode)
+        size = column.itemsize * count
+        column.frombytes(view[offset:offset + size])
+        if _BIG_ENDIAN:
+            column.byteswap()
+        columns[name] = column
+        offset += size
+
+    uuids: List[Any] = bytes(view[offset:]).decode().split("\n") if count else []
+    platforms = header.get("platforms") or [None] * len(header["types"])
+
+    return HealthSeries(
+        types=[_parse_type(t, p) for t, p in zip(header["types"], platforms)],
+        units=[_UNITS.get(u, u) for u in header["units"]],
+        sources=header["sources"],
+        uuids=[uuid or None for uuid in uuids],
+        **columns,
+    )
@@ -0,0 +1,322 @@
+import os
+import threading
+from time import monotonic
+from typing import Optional, Any, List, Dict, Callable, TYPE_CHECKING
+from flet_health.health_batch import HealthBatchCall, _batch_call
+from flet_health.health_codec import dumps, loads
+
+if TYPE_CHECKING:
+    from flet_health.flet_health import Health
+
+
+class _PendingWrite:
+    __slots__ = ("id", "method_name", "arguments", "call", "attempts")
+
+    def __init__(self, id: int, method_name: str, arguments: Optional[Dict[str, str]], call: Optional[HealthBatchCall] = None):
+        self.id = id
+        self.method_name = method_name
+        self.arguments = arguments
+        self.call = call
+        self.attempts = 0
+
+
+class HealthWriteQueue:
+    """
+    A write-behind queue for the `write_*` / `delete*` methods of a `Health` control.
+
+    Writes are acknowledged immediately: they are appended to a journal file and sent later,
+    coalesced into a single `invoke_batch` native call (sent one at a time by native sides without
+    it), when `max_batch` writes are pending or `flush_interval` seconds have passed. Entries are
+    removed from the journal only after the native side answered, so writes left in the journal
+    by a crash are replayed the next time a queue is opened on the same file.
+
+    Usage:
+        queue = HealthWriteQueue(health, os.path.join(os.getenv("FLET_APP_STORAGE_DATA"), "writes.jsonl"))
+        queue.write_health_data(value=90, types=HealthDataTypeAndroid.WEIGHT, start_time=now, end_time=now)
+        ...
+        queue.close()
+
+    Writes that reach the native side are not retried, even if the native side reports a failure;
+    use `on_result` to be notified of them. Transport errors (timeouts, no page) are retried, with
+    the wait between attempts doubling up to `max_backoff`; after `max_attempts` failed attempts a
+    write is dropped and reported to `on_result` with the error.
+    """
+
+    def __init__(
+            self,
+            health: "Health",
+            journal_path: str,
+            max_batch: int = 50,
+            flush_interval: float = 2.0,
+            wait_timeout: Optional[float] = 25,
+            fsync: bool = True,
+            max_attempts: Optional[int] = None,
+            max_backoff: float = 60.0,
+            on_result: Optional[Callable[[str, Optional[Dict[str, str]], Any, Optional[str]], None]] = None,
+            autostart: bool = True,
+    ):
+        """
+        :param health: The `Health` control used to send the writes.
+        :param journal_path: Path of the append-only journal file.
+        :param max_batch: Number of pending writes that triggers a flush, and maximum writes per native call.
+        :param flush_interval: Maximum time in seconds a write stays pending.
+        :param wait_timeout: Maximum time to wait for each batched native call.
+        :param fsync: If True, every journal append is synced to disk before the write is acknowledged.
+            This makes each queued write wait for the disk; set it to False to trade durability for latency.
+        :param max_attempts: Number of failed deliveries after which a write is dropped. Retried forever if None.
+        :param max_backoff: Maximum time in seconds between two delivery attempts after failures.
+        :param on_result: Called with (method_name, arguments, value, error) for every write sent.
+        :param autostart: If True, the background flusher thread is started immediately.
+        """
+
+        if max_batch < 1:
+            raise ValueError("The 'max_batch' argument must be at least 1.")
+
+        if max_attempts is not None and max_attempts < 1:
+            raise ValueError("The 'max_attempts' argument must be at least 1.")
+
+        self.health = health
+        self.journal_path = journal_path
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.wait_timeout = wait_timeout
+        self.fsync = fsync
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self.on_result = on_result
+
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._pending: List[_PendingWrite] = []
+        self._next_id = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._journal = None
+
+        self._replay_journal()
+
+        if autostart:
+            self.start()
+
+    def _replay_journal(self) -> None:
+        entries: Dict[int, _PendingWrite] = {}
+
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = loads(line)
+                    except Exception:
+                        # A torn last line from a crash while appending.
+                        continue
+
+                    entries[record["id"]] = _PendingWrite(record["id"], record["method_name"], record["arguments"])
+
+        self._pending = sorted(entries.values(), key=lambda w: w.id)
+        self._next_id = self._pending[-1].id + 1 if self._pending else 0
+        self._compact()
+
+    def _compact(self) -> None:
+        # Rewrites the journal down to the writes that are still pending. The new file replaces the
+        # old one atomically, so a crash while compacting leaves one of them complete.
+        if self._journal is not None:
+            self._journal.close()
+
+        path = self.journal_path + ".tmp"
+        with open(path, "w", encoding="utf-8") as f:
+            for write in self._pending:
+                f.write(dumps({"id": write.id, "method_name": write.method_name, "arguments": write.arguments}) + "\n")
+            self._sync(f)
+        os.replace(path, self.journal_path)
+
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def _sync(self, f) -> None:
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._journal.write(dumps(record) + "\n")
+        self._sync(self._journal)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        method_name = name[:-len("_async")] if name.endswith("_async") else name
+
+        if not method_name.startswith(("write_", "delete")):
+            raise AttributeError(f"'HealthWriteQueue' only queues the write_* and delete* methods, not '{name}'.")
+
+        method = getattr(self.health, method_name)
+
+        def enqueue(*args, **kwargs) -> bool:
+            call = HealthBatchCall(method, args, kwargs)
+            token = _batch_call.set(call)
+
+            try:
+                method(*args, **kwargs)
+            finally:
+                _batch_call.reset(token)
+
+            if call.method_name is None:
+                return True
+
+            self._enqueue(call.method_name, call.arguments, call)
+            return True
+
+        return enqueue
+
+    def enqueue(self, method_name: str, arguments: Optional[Dict[str, str]] = None) -> None:
+        """Queues a raw native call, with the arguments as they would be given to `invoke_method`."""
+
+        self._enqueue(method_name, arguments, None)
+
+    def _enqueue(self, method_name: str, arguments: Optional[Dict[str, str]], call: Optional[HealthBatchCall]) -> None:
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The write queue is closed.")
+
+            write = _PendingWrite(self._next_id, method_name, arguments, call)
+            self._next_id += 1
+            self._append({"id": write.id, "method_name": method_name, "arguments": arguments})
+            self._pending.append(write)
+
+            if len(self._pending) >= self.max_batch:
+                self._condition.notify()
+
+    @property
+    def pending(self) -> int:
+        """Number of writes not yet confirmed by the native side."""
+
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        Sends the pending writes now, in batches of at most `max_batch`.
+
+        :return: The number of writes sent.
+        :raises Exception: If a batch could not be delivered; the writes stay pending.
+        """
+
+        sent = 0
+
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    writes = self._pending[:self.max_batch]
+
+                if not writes:
+                    return sent
+
+                try:
+                    results = self.health.invoke_batch(
+                        [(w.method_name, w.arguments) for w in writes],
+                        wait_timeout=self.wait_timeout,
+                    )
+                except Exception as error:
+                    self._drop_expired(writes, error)
+                    raise
+
+                self._remove(writes)
+                sent += len(writes)
+                self._deliver(writes, results)
+
+    def _remove(self, writes: List[_PendingWrite]) -> None:
+        ids = {w.id for w in writes}
+
+        with self._lock:
+            self._pending = [w for w in self._pending if w.id not in ids]
+            self._compact()
+
+    def _drop_expired(self, writes: List[_PendingWrite], error: Exception) -> None:
+        for write in writes:
+            write.attempts += 1
+
+        if self.max_attempts is None:
+            return
+
+        expired = [w for w in writes if w.attempts >= self.max_attempts]
+        if expired:
+            self._remove(expired)
+            message = f"Dropped after {self.max_attempts} failed attempts: {error}"
+            self._deliver(expired, [(None, message)] * len(expired))
+
+    def _deliver(self, writes: List[_PendingWrite], results: List[tuple]) -> None:
+        for i, write in enumerate(writes):
+            result, error = results[i] if i < len(results) else (None, "No result for this write.")
+
+            if write.call is not None:
+                # Runs the original method again against the native result, which also
+                # invalidates the query cache for the written types.
+                write.call._resolve(result, error)
+                value, error = write.call.value, write.call.error
+            else:
+                self.health._invalidate_query_cache()
+                value = result
+
+            if self.on_result is not None:
+                self.on_result(write.method_name, write.arguments, value, error)
+
+    def start(self) -> None:
+        """Starts the background thread that flushes on the size and time thresholds."""
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="flet-health-write-queue", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        failures = 0
+
+        while True:
+            with self._condition:
+                if not self._closed and len(self._pending) < self.max_batch:
+                    self._condition.wait(self.flush_interval)
+                if self._closed:
+                    return
+
+            try:
+                self.flush()
+                failures = 0
+            except Exception as error:
+                failures += 1
+                backoff = min(self.flush_interval * 2 ** failures, self.max_backoff)
+                print(f"Error in HealthWriteQueue flush: {error}. Retrying in {backoff:.1f}s.")
+
+                # New writes do not shorten the backoff, only closing the queue does.
+                retry_at = monotonic() + backoff
+                with self._condition:
+                    while not self._closed and monotonic() < retry_at:
+                        self._condition.wait(retry_at - monotonic())
+
+    def close(self, flush: bool = True) -> None:
+        """
+        Stops the background thread and, if `flush` is True, sends the pending writes.
+        Writes that could not be sent stay in the journal and are replayed by the next queue.
+        """
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+
+        try:
+            if flush:
+                self.flush()
+        finally:
+            with self._lock:
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+
+    def __enter__(self) -> "HealthWriteQueue":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()